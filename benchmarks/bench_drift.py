@@ -0,0 +1,64 @@
+# Benchmark: wall time and memory of the drift detection backends of DataValidation.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_drift --rows 1000000 --backends native evidently
+#
+# Memory is the peak of the Python/NumPy allocations traced (tracemalloc) while the drift report is built.
+
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--backends", nargs="+", choices=["native", "evidently"], default=["native", "evidently"])
+    args = parser.parse_args()
+
+    from benchmarks.sqlite_standin import make_hotel_booking_frame
+    from src.data.data_validation import DataValidation
+    from src.core.entities.config_entity import DataValidationConfig
+    from src.core.entities.artifact_entity import DataIngestionArtifact
+    from src.core.utils.dtype_utils import apply_schema_dtypes
+    from src.core.utils.train_test_split_utils import train_test_split_for_data_validation
+    from src.core.constants.common_constant import VALIDATION_REPORT_SPLIT_RATIO
+
+    print(f"Generating {args.rows} rows...")
+    data_validation = DataValidation(DataIngestionArtifact(data_file_path=""), DataValidationConfig())
+    schema_config = data_validation._schema_config
+
+    dataframe = make_hotel_booking_frame(args.rows).drop(columns=schema_config["sensitive_columns"])
+    dataframe = apply_schema_dtypes(dataframe, schema_config, stage="bench_drift")
+    reference_df, current_df = train_test_split_for_data_validation(dataframe=dataframe,
+                                                                    test_size=VALIDATION_REPORT_SPLIT_RATIO)
+
+    report_dir = tempfile.mkdtemp()
+    print(f"{'backend':<12}{'wall time (s)':>16}{'peak memory (MB)':>20}{'drifted':>12}")
+    for backend in args.backends:
+        data_validation.data_validation_config.drift_backend = backend
+        data_validation.data_validation_config.validation_report_file_path = os.path.join(report_dir, f"{backend}.yaml")
+        data_validation.data_validation_config.drift_table_file_path = os.path.join(report_dir, f"{backend}.jsonl")
+        data_validation.data_validation_config.drift_summary_file_path = os.path.join(report_dir, f"{backend}.json")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            drift_status = data_validation.detect_dataset_drift(reference_df, current_df)
+        except Exception as e:
+            tracemalloc.stop()
+            print(f"{backend:<12}{'failed: ' + str(e).splitlines()[-1][-80:]:>48}")
+            continue
+        wall_time = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{backend:<12}{wall_time:>16.2f}{peak / 2**20:>20.1f}{str(drift_status):>12}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Benchmark: categorical encoding of the preprocessing stage, lookup-table encoders against the previous functions
+# (label encoding through apply(MONTH_ORDER.index) and one-hot encoding through pd.get_dummies).
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_encoding --rows 10000000
+#     python -m benchmarks.bench_encoding --rows 10000000 --object    # plain string columns instead of 'category'
+#
+# Both sides encode the label and one-hot columns of schema.yaml; their outputs are checked to be equal.
+
+import time
+import argparse
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--object", action="store_true", help="encode object (string) columns instead of 'category'")
+    args = parser.parse_args()
+
+    import numpy as np
+    import pandas as pd
+
+    from src.core.utils.encoding_utils import (label_encode,
+                                               onehot_encode)
+    from src.core.constants.common_constant import (HOTEL_MAPPING,
+                                                    MONTH_ORDER)
+
+    vocabularies = {
+        "meal": ["BB", "FB", "HB", "SC", "Undefined"],
+        "market_segment": ["Complementary", "Corporate", "Direct", "Groups", "Offline TA/TO", "Online TA"],
+        "distribution_channel": ["Corporate", "Direct", "GDS", "TA/TO"],
+        "reserved_room_type": list("ABCDEFGH"),
+        "deposit_type": ["No Deposit", "Non Refund", "Refundable"],
+        "customer_type": ["Contract", "Group", "Transient", "Transient-Party"],
+    }
+    label_vocabularies = {"hotel": list(HOTEL_MAPPING), "arrival_date_month": MONTH_ORDER}
+
+    print(f"Generating {args.rows} rows ({'object' if args.object else 'category'} columns)...")
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame({column: pd.Categorical.from_codes(rng.integers(0, len(vocabulary), args.rows), vocabulary)
+                              for column, vocabulary in {**label_vocabularies, **vocabularies}.items()})
+    if args.object:
+        dataframe = dataframe.astype(object)
+
+    month_mapping = {month: code for code, month in enumerate(MONTH_ORDER, start=1)}
+
+    def previous_functions(data: pd.DataFrame) -> pd.DataFrame:
+        data = data.copy()
+        data["hotel"] = data["hotel"].astype(object).map(HOTEL_MAPPING)
+        data["arrival_date_month"] = data["arrival_date_month"].astype(object).apply(lambda x: MONTH_ORDER.index(x) + 1)
+        return pd.get_dummies(data, columns=list(vocabularies), drop_first=True)
+
+    def lookup_encoders(data: pd.DataFrame) -> pd.DataFrame:
+        encoded = {"hotel": label_encode(data["hotel"], HOTEL_MAPPING),
+                   "arrival_date_month": label_encode(data["arrival_date_month"], month_mapping)}
+        for column, vocabulary in vocabularies.items():
+            encoded.update(zip([f"{column}_{category}" for category in vocabulary[1:]],
+                               onehot_encode(data[column], vocabulary).T))
+        return pd.DataFrame(encoded, index=data.index)
+
+    results = {}
+    print(f"{'encoder':<20}{'wall time (s)':>16}")
+    for name, function in (("previous functions", previous_functions), ("lookup encoders", lookup_encoders)):
+        start = time.perf_counter()
+        results[name] = function(dataframe)
+        print(f"{name:<20}{time.perf_counter() - start:>16.2f}")
+
+    pd.testing.assert_frame_equal(results["previous functions"], results["lookup encoders"])
+    print("Outputs are equal.")
+
+
+
+if __name__ == "__main__":
+    main()
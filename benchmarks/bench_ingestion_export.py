@@ -0,0 +1,94 @@
+# Benchmark: full-table export vs chunked server-side-cursor export in DataIngestion, with the chunks
+# written sequentially ('streaming') or through the threaded fetch/sanitise/write pipeline ('pipelined').
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_ingestion_export --rows 500000 --chunk-size 50000
+#
+# Every mode runs in a fresh interpreter so the reported peak RSS belongs to that mode only.
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+import psutil
+
+
+MODES = ("full", "streaming", "pipelined")
+
+
+def run_mode(db_path: str, output_dir: str, mode: str, chunk_size: int) -> dict:
+    """
+    Runs DataIngestion once against the SQLite stand-in and returns wall time and peak RSS.
+    """
+    from benchmarks.sqlite_standin import use_standin_database
+    from src.data.data_ingestion import DataIngestion
+    from src.core.entities.config_entity import DataIngestionConfig
+    from src.core.constants.data_constant import (DATA_INGESTION_RAW_FILE,
+                                                  DATA_INGESTION_DATA_FILE)
+
+    use_standin_database(db_path)
+    config = DataIngestionConfig(raw_file_path=os.path.join(output_dir, DATA_INGESTION_RAW_FILE),
+                                 data_file_path=os.path.join(output_dir, DATA_INGESTION_DATA_FILE),
+                                 watermark_file_path=os.path.join(output_dir, "watermark.json"),
+                                 fingerprint_file_path=os.path.join(output_dir, "source_fingerprint.json"),
+                                 streaming_export=mode != "full",
+                                 pipelined_export=mode == "pipelined",
+                                 chunk_size=chunk_size)
+
+    start = time.perf_counter()
+    DataIngestion(data_ingestion_config=config).initiate_data_ingestion()
+    wall_time = time.perf_counter() - start
+
+    memory_info = psutil.Process().memory_info()
+    # peak_wset on Windows, ru_maxrss (KiB) on Unix
+    if hasattr(memory_info, "peak_wset"):
+        peak_rss = memory_info.peak_wset
+    else:
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    return {"wall_time_s": round(wall_time, 2), "peak_rss_mb": round(peak_rss / 2**20, 1)}
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process: run a single mode and report back as JSON
+    if args.mode:
+        result = run_mode(args.db, args.output_dir, args.mode, args.chunk_size)
+        print(json.dumps(result))
+        return
+
+    from benchmarks.sqlite_standin import create_standin_database
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "hotel_booking.db")
+        print(f"Creating SQLite stand-in with {args.rows} rows...")
+        create_standin_database(db_path, args.rows)
+
+        print(f"{'mode':<12}{'wall time (s)':>16}{'peak RSS (MB)':>16}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_ingestion_export", "--mode", mode,
+                 "--db", db_path, "--output-dir", os.path.join(tmp_dir, mode),
+                 "--chunk-size", str(args.chunk_size)],
+                check=True, capture_output=True, text=True,
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            print(f"{mode:<12}{result['wall_time_s']:>16}{result['peak_rss_mb']:>16}")
+
+
+
+if __name__ == "__main__":
+    main()
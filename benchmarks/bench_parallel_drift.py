@@ -0,0 +1,52 @@
+# Benchmark: speedup of the process-pool column drift tests against the number of worker processes.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_parallel_drift --rows 1000000 --workers 1 2 4 8
+#
+# Every parallel run is checked to give exactly the serial result.
+
+import os
+import time
+import argparse
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    from benchmarks.sqlite_standin import make_hotel_booking_frame
+    from src.core.utils.yaml_utils import read_yaml
+    from src.core.utils.dtype_utils import apply_schema_dtypes
+    from src.core.utils.drift_utils import (detect_dataset_drift,
+                                            detect_dataset_drift_parallel)
+    from src.core.utils.train_test_split_utils import train_test_split_for_data_validation
+    from src.core.constants.common_constant import (SCHEMA_FILE_PATH,
+                                                    VALIDATION_REPORT_SPLIT_RATIO)
+
+    print(f"Generating {args.rows} rows ({os.cpu_count()} CPU cores)...")
+    schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+    dataframe = make_hotel_booking_frame(args.rows).drop(columns=schema_config["sensitive_columns"])
+    dataframe = apply_schema_dtypes(dataframe, schema_config, stage="bench_parallel_drift")
+    reference_df, current_df = train_test_split_for_data_validation(dataframe=dataframe,
+                                                                    test_size=VALIDATION_REPORT_SPLIT_RATIO)
+
+    start = time.perf_counter()
+    serial_report = detect_dataset_drift(reference_df, current_df, schema_config)
+    serial_time = time.perf_counter() - start
+
+    print(f"{'workers':<10}{'wall time (s)':>16}{'speedup':>10}{'same result':>14}")
+    print(f"{'serial':<10}{serial_time:>16.2f}{1.0:>10.2f}{'-':>14}")
+    for n_jobs in args.workers:
+        start = time.perf_counter()
+        parallel_report = detect_dataset_drift_parallel(reference_df, current_df, schema_config, n_jobs=n_jobs)
+        wall_time = time.perf_counter() - start
+
+        print(f"{n_jobs:<10}{wall_time:>16.2f}{serial_time / wall_time:>10.2f}{str(parallel_report == serial_report):>14}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Benchmark: throughput of the range-partitioned parallel export for an increasing number of partitions.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.bench_partitioned_export --rows 500000 --partitions 1 2 4 8
+
+import os
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--partition-column", default="reservation_status_date")
+    args = parser.parse_args()
+
+    from benchmarks.sqlite_standin import (create_standin_database,
+                                           use_standin_database)
+    from src.configs.mysql_connection import HotelBookingData
+    from src.core.constants.common_constant import DATASET_NAME
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "hotel_booking.db")
+        print(f"Creating SQLite stand-in with {args.rows} rows...")
+        create_standin_database(db_path, args.rows)
+
+        # Size the pool for the largest degree of parallelism
+        use_standin_database(db_path, pool_size=max(args.partitions), max_overflow=0)
+        hotel_booking_data = HotelBookingData()
+
+        print(f"{'partitions':<12}{'wall time (s)':>16}{'rows/s':>14}{'speedup':>10}")
+        baseline = None
+        for n_partitions in args.partitions:
+            start = time.perf_counter()
+            partitions = hotel_booking_data.export_data_in_partitions(dataset_name=DATASET_NAME,
+                                                                      partition_column=args.partition_column,
+                                                                      n_partitions=n_partitions)
+            dataframe = pd.concat(list(partitions), ignore_index=True)
+            wall_time = time.perf_counter() - start
+
+            assert len(dataframe) == args.rows, f"expected {args.rows} rows, got {len(dataframe)}"
+            baseline = baseline or wall_time
+            print(f"{n_partitions:<12}{wall_time:>16.2f}{len(dataframe) / wall_time:>14.0f}{baseline / wall_time:>10.2f}")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/sqlite_standin.py provides a local SQLite stand-in for the projects_db.hotel_booking MySQL table
+
+import os
+
+# MySQLConnect refuses to start without an engine URL; the stand-in engine replaces it below
+os.environ.setdefault("MYSQL_ENGINE_URL", "sqlite://")
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event
+
+from src.configs.mysql_connection import MySQLConnect
+
+from src.core.constants.common_constant import (DATABASE_NAME,
+                                                DATASET_NAME,
+                                                MONTH_ORDER)
+
+
+
+def make_hotel_booking_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates a synthetic DataFrame with the columns of the hotel_booking table (see settings/schema.yaml).
+
+    :param n_rows: Number of rows to generate.
+    :param seed: Seed of the random generator.
+    :return: pd.DataFrame shaped like the hotel_booking table.
+    """
+    rng = np.random.default_rng(seed)
+    choice = lambda values: rng.choice(values, size=n_rows)
+
+    return pd.DataFrame({
+        "hotel": choice(["Resort Hotel", "City Hotel"]),
+        "is_canceled": rng.integers(0, 2, n_rows),
+        "lead_time": rng.integers(0, 700, n_rows),
+        "arrival_date_year": rng.integers(2015, 2018, n_rows),
+        "arrival_date_month": choice(MONTH_ORDER),
+        "arrival_date_week_number": rng.integers(1, 54, n_rows),
+        "arrival_date_day_of_month": rng.integers(1, 32, n_rows),
+        "stays_in_weekend_nights": rng.integers(0, 10, n_rows),
+        "stays_in_week_nights": rng.integers(0, 30, n_rows),
+        "adults": rng.integers(0, 5, n_rows),
+        "children": np.where(rng.random(n_rows) < 0.01, np.nan, rng.integers(0, 4, n_rows)),
+        "babies": rng.integers(0, 3, n_rows),
+        "meal": choice(["BB", "FB", "HB", "SC", "Undefined"]),
+        "country": choice(["PRT", "GBR", "FRA", "ESP", "DEU", "ITA", "IRL", "BEL", "BRA", "NLD"]),
+        "market_segment": choice(["Direct", "Corporate", "Online TA", "Offline TA/TO", "Complementary", "Groups"]),
+        "distribution_channel": choice(["Direct", "Corporate", "TA/TO", "GDS"]),
+        "is_repeated_guest": rng.integers(0, 2, n_rows),
+        "previous_cancellations": rng.integers(0, 5, n_rows),
+        "previous_bookings_not_canceled": rng.integers(0, 10, n_rows),
+        "reserved_room_type": choice(list("ABCDEFGH")),
+        "assigned_room_type": choice(list("ABCDEFGHIK")),
+        "booking_changes": rng.integers(0, 5, n_rows),
+        "deposit_type": choice(["No Deposit", "Refundable", "Non Refund"]),
+        "agent": np.where(rng.random(n_rows) < 0.1, np.nan, rng.integers(1, 500, n_rows)),
+        "company": np.where(rng.random(n_rows) < 0.9, np.nan, rng.integers(1, 500, n_rows)),
+        "days_in_waiting_list": rng.integers(0, 100, n_rows),
+        "customer_type": choice(["Transient", "Contract", "Transient-Party", "Group"]),
+        "adr": rng.normal(100, 40, n_rows).round(2),
+        "required_car_parking_spaces": rng.integers(0, 2, n_rows),
+        "total_of_special_requests": rng.integers(0, 5, n_rows),
+        "reservation_status": choice(["Check-Out", "Canceled", "No-Show"]),
+        "reservation_status_date": (pd.Timestamp("2015-01-01") 
+                                    + pd.to_timedelta(np.sort(rng.integers(0, 1000, n_rows)), unit="D")).strftime("%Y-%m-%d"),
+        "name": [f"Guest {i}" for i in range(n_rows)],
+        "email": [f"guest{i}@example.com" for i in range(n_rows)],
+        "phone-number": [f"555-{i:07d}" for i in range(n_rows)],
+        "credit_card": [f"************{i % 10000:04d}" for i in range(n_rows)],
+    })
+
+
+
+def create_standin_database(db_path: str, n_rows: int, batch_size: int = 100_000) -> None:
+    """
+    Creates (or replaces) the hotel_booking table inside a SQLite database file.
+
+    :param db_path: Path of the SQLite database file.
+    :param n_rows: Number of rows to insert.
+    :param batch_size: Number of rows generated and inserted per batch.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    with engine.begin() as connection:
+        for start in range(0, n_rows, batch_size):
+            frame = make_hotel_booking_frame(min(batch_size, n_rows - start), seed=start)
+            frame.to_sql(DATASET_NAME, connection, if_exists="replace" if start == 0 else "append", index=False)
+
+    engine.dispose()
+
+
+
+def use_standin_database(db_path: str, **engine_kwargs) -> None:
+    """
+    Points MySQLConnect at the SQLite stand-in. The file is attached as DATABASE_NAME on every pooled
+    connection, so the "<database>.<table>" queries issued by HotelBookingData work unchanged.
+
+    :param db_path: Path of the SQLite database file created by create_standin_database.
+    :param engine_kwargs: Pool settings and extra keyword arguments forwarded to MySQLConnect.build_engine.
+    """
+    engine = MySQLConnect.build_engine(f"sqlite:///{db_path}", **engine_kwargs)
+
+    @event.listens_for(engine, "connect")
+    def attach_database(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_path}' AS {DATABASE_NAME}")
+
+    MySQLConnect.engine = engine
@@ -1,6 +1,7 @@
 # this script is used to run the pipelines from src/pipeline/*
 
 import sys
+import argparse
 
 from src.core.exception import HotelBookingException
 
@@ -10,9 +11,16 @@ from src.pipelines.run_pipe import run_pipe
 # run the pipeline
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Run the Hotel Booking Cancellation pipeline.")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Re-ingest the whole MySQL table instead of only the rows past the stored high-water mark.")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="Hand the data from stage to stage in memory, the artifact files are written in the background.")
+    args = parser.parse_args()
+
     try:
         
-        run_pipe()
+        run_pipe(full_refresh=args.full_refresh, in_memory_handoff=args.in_memory)
 
     except HotelBookingException as e:
         print(f"Error occured while running pipeline from main.py: {str(e)}")
@@ -1,14 +1,29 @@
 # MySQL database connection script
 import sys
 
+from numbers import Number
+import numpy as np
 import pandas as pd
-from typing import Optional
-from sqlalchemy import create_engine
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import create_engine, text
+from sqlalchemy.sql.elements import TextClause
 
 from src.core.exception import HotelBookingException
+from src.core.utils.dtype_utils import apply_schema_dtypes
+from src.configs.pool_metrics import (InstrumentedQueuePool,
+                                      PoolMetrics)
 
 from src.core.constants.common_constant import (MYSQL_ENGINE_URL,
+                                                MYSQL_POOL_SIZE,
+                                                MYSQL_MAX_OVERFLOW,
+                                                MYSQL_POOL_TIMEOUT,
+                                                MYSQL_POOL_RECYCLE,
+                                                MYSQL_POOL_PRE_PING,
                                                 DATABASE_NAME)
+from src.core.constants.data_constant import (DATA_INGESTION_CHUNK_SIZE,
+                                              DATA_INGESTION_N_PARTITIONS)
 
 
 
@@ -32,7 +47,7 @@ class MySQLConnect:
             
             if MySQLConnect.engine is None:
                 # Initialize the SQLAlchemy engine
-                MySQLConnect.engine = create_engine(mysql_engine_url)
+                MySQLConnect.engine = MySQLConnect.build_engine(mysql_engine_url)
             
             self.engine = MySQLConnect.engine
         
@@ -40,6 +55,72 @@ class MySQLConnect:
             raise HotelBookingException(f"MySQL connection error: {e}", sys)
 
 
+    @staticmethod
+    def build_engine(engine_url: str,
+                     pool_size: int = MYSQL_POOL_SIZE,
+                     max_overflow: int = MYSQL_MAX_OVERFLOW,
+                     pool_timeout: float = MYSQL_POOL_TIMEOUT,
+                     pool_recycle: int = MYSQL_POOL_RECYCLE,
+                     pool_pre_ping: bool = MYSQL_POOL_PRE_PING,
+                     **engine_kwargs):
+        """
+        Creates a SQLAlchemy engine backed by an instrumented connection pool.
+
+        :param engine_url: SQLAlchemy engine URL.
+        :param pool_size: Number of connections kept open in the pool.
+        :param max_overflow: Number of extra connections allowed above pool_size.
+        :param pool_timeout: Seconds to wait for a connection before raising a timeout.
+        :param pool_recycle: Seconds after which a connection is replaced (-1 disables recycling).
+        :param pool_pre_ping: Test connections for liveness on checkout.
+        :param engine_kwargs: Extra keyword arguments forwarded to create_engine.
+        :return: SQLAlchemy engine, its pool metrics are available as engine.pool.metrics.
+        """
+        try:
+            engine = create_engine(engine_url,
+                                   poolclass=InstrumentedQueuePool,
+                                   pool_size=pool_size,
+                                   max_overflow=max_overflow,
+                                   pool_timeout=pool_timeout,
+                                   pool_recycle=pool_recycle,
+                                   pool_pre_ping=pool_pre_ping,
+                                   **engine_kwargs)
+            engine.pool.metrics = PoolMetrics(pool_size=pool_size, max_overflow=max_overflow)
+
+            return engine
+        
+        except Exception as e:
+            raise HotelBookingException(f"MySQL engine creation error: {e}", sys)
+
+
+    @property
+    def pool_metrics(self) -> Optional[PoolMetrics]:
+        """
+        Metrics of the engine's connection pool (None for engines not created by build_engine).
+        """
+        return getattr(self.engine.pool, "metrics", None)
+
+
+    @property
+    def pool_capacity(self) -> Optional[int]:
+        """
+        Maximum number of concurrently checked out connections (pool size plus overflow).
+        """
+        metrics = self.pool_metrics
+        return metrics.pool_size + metrics.max_overflow if metrics else None
+
+
+    def add_metrics_hook(self, hook: Callable[[str, Dict], None]) -> None:
+        """
+        Registers hook(event, snapshot), called after every pool checkout, checkin and timeout.
+
+        :param hook: Callable receiving the event name and a pool metrics snapshot.
+        """
+        if self.pool_metrics is None:
+            raise HotelBookingException("The MySQL engine has no pool metrics, create it with MySQLConnect.build_engine.", sys)
+
+        self.pool_metrics.add_hook(hook)
+
+
 
 class HotelBookingData:
     """
@@ -59,28 +140,288 @@ class HotelBookingData:
         except Exception as e:
             raise HotelBookingException(e, sys)
 
-    def export_data_as_dataframe(self, dataset_name: str, database_name: Optional[str] = None) -> pd.DataFrame:
+    def build_select_query(self, 
+                           dataset_name: str, 
+                           database_name: Optional[str] = None,
+                           columns: Optional[List[str]] = None,
+                           watermark_column: Optional[str] = None,
+                           watermark: Optional[Any] = None,
+                           partition: Optional[Tuple[str, Any, Any]] = None) -> Tuple[TextClause, dict]:
         """
-        Exports the entire table as a pandas DataFrame.
+        Builds the SELECT statement used by the export methods.
         
         :param dataset_name: Name of the dataset to export.
         :param database_name: Name of the database (optional, defaults to the connection's database).
-        :return: pd.DataFrame containing table data.
+        :param columns: Columns to select (optional, defaults to all columns).
+        :param watermark_column: Column holding the high-water mark (optional).
+        :param watermark: Only rows with watermark_column greater than or equal to this value are selected (optional).
+        :param partition: (column, lower, upper) range to select, lower inclusive and upper exclusive (optional).
+                          A None lower bound also selects NULLs, a None upper bound is unbounded.
+        :return: Tuple of the SQL query and its bind parameters.
         """
         try:
             # Use the default database if none is provided
             database_name = database_name or DATABASE_NAME
+
+            # Quote identifiers, some column names contain characters such as '-' (e.g. phone-number)
+            quote = self.mysql_connect.engine.dialect.identifier_preparer.quote
+            select_list = ", ".join(quote(column) for column in columns) if columns else "*"
             
             # Construct the SQL query
-            query = f"SELECT * FROM {database_name}.{dataset_name}"
+            query = f"SELECT {select_list} FROM {database_name}.{dataset_name}"
+            conditions, params = [], {}
+
+            # Incremental export: fetch the rows from the high-water mark on. The mark itself is included,
+            # rows added later with the same (e.g. date granular) value would be lost otherwise; the caller
+            # drops the boundary rows it ingested before
+            if watermark_column and watermark is not None:
+                conditions.append(f"{quote(watermark_column)} >= :watermark")
+                params["watermark"] = watermark
+
+            # Partitioned export: only fetch rows inside the [lower, upper) range
+            if partition is not None:
+                partition_column, lower, upper = partition
+                if lower is None and upper is not None:
+                    conditions.append(f"({quote(partition_column)} IS NULL OR {quote(partition_column)} < :upper)")
+                    params["upper"] = upper
+                elif lower is not None:
+                    conditions.append(f"{quote(partition_column)} >= :lower")
+                    params["lower"] = lower
+                    if upper is not None:
+                        conditions.append(f"{quote(partition_column)} < :upper")
+                        params["upper"] = upper
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+
+            return text(query), params
+        
+        except Exception as e:
+            raise HotelBookingException(e, sys)
+
+
+
+    def export_data_as_dataframe(self, 
+                                 dataset_name: str, 
+                                 database_name: Optional[str] = None,
+                                 columns: Optional[List[str]] = None,
+                                 watermark_column: Optional[str] = None,
+                                 watermark: Optional[Any] = None,
+                                 partition: Optional[Tuple[str, Any, Any]] = None,
+                                 schema_config: Optional[dict] = None) -> pd.DataFrame:
+        """
+        Exports the entire table as a pandas DataFrame.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param columns: Columns to export (optional, defaults to all columns).
+        :param watermark_column: Column holding the high-water mark (optional).
+        :param watermark: Only export rows with watermark_column greater than or equal to this value (optional).
+        :param partition: (column, lower, upper) range to export, see build_select_query (optional).
+        :param schema_config: Content of schema.yaml, if given its column types are applied as compact dtypes (optional).
+        :return: pd.DataFrame containing table data.
+        """
+        try:
+            query, params = self.build_select_query(dataset_name, database_name, columns, 
+                                                    watermark_column, watermark, partition)
 
             # Fetch data using SQLAlchemy
             with self.mysql_connect.engine.connect() as connection:
-                df = pd.read_sql(query, connection)
+                df = pd.read_sql(query, connection, params=params)
 
             # Replace placeholder values (e.g., "na") with NaN
             df.replace({"na": pd.NA}, inplace=True)
+
+            if schema_config is not None:
+                df = apply_schema_dtypes(df, schema_config, stage=f"export {dataset_name}")
             
             return df
         except Exception as e:
             raise HotelBookingException(e, sys)
+
+
+
+    def export_data_in_chunks(self, 
+                              dataset_name: str, 
+                              database_name: Optional[str] = None,
+                              chunk_size: int = DATA_INGESTION_CHUNK_SIZE,
+                              columns: Optional[List[str]] = None,
+                              watermark_column: Optional[str] = None,
+                              watermark: Optional[Any] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams the table as pandas DataFrame chunks through an unbuffered server-side cursor,
+        so only one chunk of rows is held in memory at a time.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param chunk_size: Number of rows in each yielded DataFrame.
+        :param columns: Columns to export (optional, defaults to all columns).
+        :param watermark_column: Column holding the high-water mark (optional).
+        :param watermark: Only export rows with watermark_column greater than or equal to this value (optional).
+        :return: Iterator of pd.DataFrame chunks containing table data.
+        """
+        try:
+            query, params = self.build_select_query(dataset_name, database_name, columns, watermark_column, watermark)
+
+            # stream_results switches the driver to a server-side (unbuffered) cursor
+            with self.mysql_connect.engine.connect() as connection:
+                connection = connection.execution_options(stream_results=True, 
+                                                          max_row_buffer=chunk_size)
+
+                for chunk in pd.read_sql(query, connection, params=params, chunksize=chunk_size):
+                    # Replace placeholder values (e.g., "na") with NaN
+                    chunk.replace({"na": pd.NA}, inplace=True)
+
+                    yield chunk
+
+        except Exception as e:
+            raise HotelBookingException(e, sys)
+
+
+
+    def get_table_fingerprint(self,
+                              dataset_name: str,
+                              database_name: Optional[str] = None,
+                              watermark_column: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns a cheap fingerprint of the table content, used to detect that nothing changed since the
+        previous export: CHECKSUM TABLE on MySQL, otherwise the row count plus the maximum of the watermark column.
+        
+        :param dataset_name: Name of the dataset to fingerprint.
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Column holding the high-water mark, e.g. a last update timestamp (optional).
+        :return: JSON serialisable dictionary that changes whenever the table content changes.
+        """
+        try:
+            database_name = database_name or DATABASE_NAME
+            table_name = f"{database_name}.{dataset_name}"
+
+            with self.mysql_connect.engine.connect() as connection:
+                if self.mysql_connect.engine.dialect.name == "mysql":
+                    _, checksum = connection.execute(text(f"CHECKSUM TABLE {table_name}")).one()
+                    if checksum is not None:
+                        return {"checksum": int(checksum)}
+
+                query = f"SELECT COUNT(*) FROM {table_name}"
+                if watermark_column:
+                    quoted_column = self.mysql_connect.engine.dialect.identifier_preparer.quote(watermark_column)
+                    query = f"SELECT COUNT(*), MAX({quoted_column}) FROM {table_name}"
+
+                row = connection.execute(text(query)).one()
+
+            fingerprint = {"row_count": int(row[0])}
+            if watermark_column:
+                fingerprint["max_watermark"] = None if row[1] is None else str(row[1])
+            return fingerprint
+        
+        except Exception as e:
+            raise HotelBookingException(e, sys)
+
+
+
+    def get_partition_bounds(self,
+                             dataset_name: str,
+                             partition_column: str,
+                             n_partitions: int,
+                             database_name: Optional[str] = None,
+                             watermark_column: Optional[str] = None,
+                             watermark: Optional[Any] = None) -> List[Tuple[str, Any, Any]]:
+        """
+        Splits the value range of a numeric or date column into consecutive [lower, upper) partitions.
+        The first partition is open below (and holds NULLs), the last one is open above, so every row
+        falls into exactly one partition.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param partition_column: Numeric or date column used to split the table.
+        :param n_partitions: Number of partitions (fewer are returned if the column range is too narrow).
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param watermark_column: Column holding the high-water mark (optional).
+        :param watermark: Only consider rows with watermark_column greater than or equal to this value (optional).
+        :return: List of (column, lower, upper) partitions in ascending order.
+        """
+        try:
+            database_name = database_name or DATABASE_NAME
+            quoted_column = self.mysql_connect.engine.dialect.identifier_preparer.quote(partition_column)
+
+            query = f"SELECT MIN({quoted_column}), MAX({quoted_column}) FROM {database_name}.{dataset_name}"
+            params = {}
+            if watermark_column and watermark is not None:
+                quoted_watermark_column = self.mysql_connect.engine.dialect.identifier_preparer.quote(watermark_column)
+                query += f" WHERE {quoted_watermark_column} >= :watermark"
+                params["watermark"] = watermark
+
+            with self.mysql_connect.engine.connect() as connection:
+                min_value, max_value = connection.execute(text(query), params).one()
+
+            if min_value is None or n_partitions <= 1:
+                return [(partition_column, None, None)]
+
+            # Inner boundaries, evenly spaced over the numeric or date range of the column
+            if isinstance(min_value, Number):
+                boundaries = np.linspace(min_value, max_value, n_partitions + 1)[1:-1].tolist()
+            else:
+                min_date, max_date = pd.Timestamp(min_value), pd.Timestamp(max_value)
+                boundaries = pd.date_range(min_date, max_date, periods=n_partitions + 1)[1:-1]
+                boundaries = boundaries.floor("D").strftime("%Y-%m-%d").tolist()
+            boundaries = sorted(set(boundaries))
+
+            lowers = [None] + boundaries
+            uppers = boundaries + [None]
+            return [(partition_column, lower, upper) for lower, upper in zip(lowers, uppers)]
+        
+        except Exception as e:
+            raise HotelBookingException(e, sys)
+
+
+
+    def export_data_in_partitions(self,
+                                  dataset_name: str,
+                                  partition_column: str,
+                                  n_partitions: int = DATA_INGESTION_N_PARTITIONS,
+                                  max_workers: Optional[int] = None,
+                                  database_name: Optional[str] = None,
+                                  columns: Optional[List[str]] = None,
+                                  watermark_column: Optional[str] = None,
+                                  watermark: Optional[Any] = None) -> Iterator[pd.DataFrame]:
+        """
+        Exports the table as range partitions of partition_column, read concurrently over pooled
+        connections by a thread pool and yielded in ascending partition order. At most max_workers
+        partitions are in flight (and held in memory) at a time; max_workers should not exceed the
+        connection pool size plus its overflow.
+        
+        :param dataset_name: Name of the dataset to export.
+        :param partition_column: Numeric or date column used to split the table.
+        :param n_partitions: Number of range partitions.
+        :param max_workers: Number of partitions read concurrently (optional, defaults to n_partitions).
+        :param database_name: Name of the database (optional, defaults to the connection's database).
+        :param columns: Columns to export (optional, defaults to all columns).
+        :param watermark_column: Column holding the high-water mark (optional).
+        :param watermark: Only export rows with watermark_column greater than or equal to this value (optional).
+        :return: Iterator of pd.DataFrame partitions in deterministic (ascending range) order.
+        """
+        try:
+            partitions = self.get_partition_bounds(dataset_name, partition_column, n_partitions, 
+                                                   database_name, watermark_column, watermark)
+            max_workers = max_workers or len(partitions)
+
+            # More workers than pooled connections would only queue up on (and time out in) the pool
+            pool_capacity = self.mysql_connect.pool_capacity
+            if pool_capacity is not None:
+                max_workers = min(max_workers, pool_capacity)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = deque()
+
+                for partition in partitions:
+                    futures.append(executor.submit(self.export_data_as_dataframe, dataset_name, database_name, 
+                                                   columns, watermark_column, watermark, partition))
+
+                    # Keep the window of in-flight partitions bounded, hand them out in order
+                    if len(futures) >= max_workers:
+                        yield futures.popleft().result()
+
+                while futures:
+                    yield futures.popleft().result()
+
+        except Exception as e:
+            raise HotelBookingException(e, sys)
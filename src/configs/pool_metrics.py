@@ -0,0 +1,163 @@
+# Connection pool instrumentation for the SQLAlchemy engine used by MySQLConnect
+
+import time
+import threading
+
+from typing import Callable, Dict, List
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.core.logger import logging
+
+
+
+class PoolMetrics:
+    """
+    Class Name :   PoolMetrics
+    Description :   Thread-safe counters describing connection pool usage: checkout latency, how often
+                    checkouts found every pooled connection busy (saturation) and how often they had to
+                    wait because the pool and its overflow were exhausted. Registered hooks are called
+                    with the event name and a metrics snapshot after every checkout, checkin and timeout.
+
+    Output      :   Pool metrics snapshot (dict)
+    On Failure  :   Raises an exception
+    """
+
+    def __init__(self, pool_size: int, max_overflow: int) -> None:
+        """
+        :param pool_size: Number of connections kept open in the pool.
+        :param max_overflow: Number of extra connections allowed above pool_size.
+        """
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.hooks: List[Callable[[str, Dict], None]] = []
+        self._lock = threading.Lock()
+        self.reset()
+
+
+    def reset(self) -> None:
+        """
+        Resets all counters (registered hooks are kept).
+        """
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.saturated_checkouts = 0        # every pooled connection was busy, overflow was used
+            self.exhausted_checkouts = 0        # pool and overflow were busy, the checkout had to wait
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.total_checkout_time = 0.0
+            self.max_checkout_time = 0.0
+
+
+    def add_hook(self, hook: Callable[[str, Dict], None]) -> None:
+        """
+        Registers a callable hook(event, snapshot), e.g. to publish metrics to a monitoring backend.
+        """
+        self.hooks.append(hook)
+
+
+    def record_checkout(self, checkout_time: float, busy_connections: int) -> None:
+        """
+        :param checkout_time: Seconds spent waiting for the connection.
+        :param busy_connections: Connections already checked out when the checkout started.
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out = busy_connections + 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.total_checkout_time += checkout_time
+            self.max_checkout_time = max(self.max_checkout_time, checkout_time)
+            if busy_connections >= self.pool_size:
+                self.saturated_checkouts += 1
+            if busy_connections >= self.pool_size + self.max_overflow:
+                self.exhausted_checkouts += 1
+        self._notify("checkout")
+
+
+    def record_checkin(self, busy_connections: int) -> None:
+        """
+        :param busy_connections: Connections still checked out after the checkin.
+        """
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = busy_connections
+        self._notify("checkin")
+
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        self._notify("timeout")
+
+
+    def snapshot(self) -> Dict:
+        """
+        :return: Dictionary with the current counters and derived latency / saturation ratios.
+        """
+        with self._lock:
+            checkouts = max(self.checkouts, 1)
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturated_checkouts": self.saturated_checkouts,
+                "exhausted_checkouts": self.exhausted_checkouts,
+                "saturation_ratio": self.saturated_checkouts / checkouts,
+                "avg_checkout_ms": 1000 * self.total_checkout_time / checkouts,
+                "max_checkout_ms": 1000 * self.max_checkout_time,
+            }
+
+
+    def _notify(self, event: str) -> None:
+        if not self.hooks:
+            return
+
+        snapshot = self.snapshot()
+        for hook in self.hooks:
+            # A failing metrics hook must never break database access
+            try:
+                hook(event, snapshot)
+            except Exception as e:
+                logging.error(f"Error in pool metrics hook {hook}: {str(e)}")
+
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    Class Name :   InstrumentedQueuePool
+    Description :   QueuePool that records checkout latency, saturation and timeouts into its PoolMetrics.
+                    The metrics object is attached after the engine is created (engine.pool.metrics) and
+                    carried over when the pool is recreated (e.g. on engine.dispose()).
+    """
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        if self.metrics is None:
+            return super()._do_get()
+
+        busy_connections = self.checkedout()
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+
+        self.metrics.record_checkout(time.perf_counter() - start, busy_connections)
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        if self.metrics is not None:
+            self.metrics.record_checkin(self.checkedout())
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -21,4 +21,11 @@ MONTH_ORDER: list =['January', 'February', 'March', 'April', 'May', 'June',
 # MySQL constants
 MYSQL_ENGINE_URL = os.getenv('MYSQL_ENGINE_URL')
 DATABASE_NAME: str = 'projects_db'
-DATASET_NAME: str = 'hotel_booking'
\ No newline at end of file
+DATASET_NAME: str = 'hotel_booking'
+
+# MySQL connection pool constants (overridable through environment variables)
+MYSQL_POOL_SIZE: int = int(os.getenv('MYSQL_POOL_SIZE', 5))
+MYSQL_MAX_OVERFLOW: int = int(os.getenv('MYSQL_MAX_OVERFLOW', 10))
+MYSQL_POOL_TIMEOUT: float = float(os.getenv('MYSQL_POOL_TIMEOUT', 30))
+MYSQL_POOL_RECYCLE: int = int(os.getenv('MYSQL_POOL_RECYCLE', 3600))
+MYSQL_POOL_PRE_PING: bool = os.getenv('MYSQL_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
\ No newline at end of file
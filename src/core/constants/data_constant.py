@@ -1,16 +1,58 @@
 # src/constants/data_constant.py is used to store data scripts related constant values 
 
+import os
+
+# Data artifact format constants ('csv' is kept as the legacy format, and is the one incremental runs append to in place)
+DATA_ARTIFACT_FORMATS: tuple = ('csv', 'parquet', 'feather')
+DATA_ARTIFACT_FORMAT: str = os.getenv('DATA_ARTIFACT_FORMAT', 'parquet')
+
+# Data type constants
+CATEGORY_MAX_UNIQUE_RATIO: float = 0.5          # string columns with fewer unique values (share of rows) become 'category'
+
 # Data Ingestion constants
-DATA_INGESTION_RAW_FILE: str = 'raw.csv'
-DATA_INGESTION_DATA_FILE: str = 'data.csv'
+DATA_INGESTION_RAW_FILE: str = f'raw.{DATA_ARTIFACT_FORMAT}'
+DATA_INGESTION_DATA_FILE: str = f'data.{DATA_ARTIFACT_FORMAT}'
+DATA_INGESTION_CHUNK_SIZE: int = 50_000
+DATA_INGESTION_WATERMARK_FILE: str = 'watermark.json'
+DATA_INGESTION_WATERMARK_COLUMN: str = 'reservation_status_date'
+DATA_INGESTION_FINGERPRINT_FILE: str = 'source_fingerprint.json'
+DATA_INGESTION_PARTITION_COLUMN: str = 'reservation_status_date'
+DATA_INGESTION_N_PARTITIONS: int = 1
+DATA_INGESTION_QUEUE_SIZE: int = 2
 
 # Data Validation constants
-DATA_VALIDATION_REPORT: str = 'drift_report.yaml'
+DATA_VALIDATION_REPORT: str = 'drift_report.yaml'        # full (verbose) drift report, only written when enabled
+DATA_VALIDATION_REPORT_FORMAT: str = os.getenv('DATA_VALIDATION_REPORT_FORMAT', 'jsonl')  # per-column drift table: 'jsonl' or 'parquet'
+DATA_VALIDATION_DRIFT_TABLE: str = f'drift_report.{DATA_VALIDATION_REPORT_FORMAT}'
+DATA_VALIDATION_DRIFT_SUMMARY: str = 'drift_summary.json'
+DATA_VALIDATION_DRIFT_BACKEND: str = 'native'            # 'native' (NumPy/SciPy) or 'evidently' (optional dependency)
+DATA_VALIDATION_CATEGORICAL_STATTEST: str = 'chi2'       # 'chi2' or 'psi' for categorical and boolean columns
+DRIFT_STATTEST_THRESHOLD: float = 0.05                   # p-value below which a KS / chi-square test reports drift
+DRIFT_PSI_THRESHOLD: float = 0.2                         # PSI above which a column has drifted
+DRIFT_SHARE: float = 0.5                                 # share of drifted columns from which the dataset has drifted
+DATA_VALIDATION_CHUNK_SIZE: int = 100_000                # rows per chunk in streaming validation
+DATA_VALIDATION_SKETCH_BINS: int = 2048                  # maximum histogram bins of a numerical column sketch
+DATA_VALIDATION_SPLIT_SEED: int = 42                     # seed of the reference/current row split
+DATA_VALIDATION_REFERENCE_PROFILE_FILE: str = 'reference_profile.json'
+DATA_VALIDATION_N_JOBS: int = 1                          # drift test worker processes, != 1 runs them in parallel (0 for one per core)
+DATA_VALIDATION_SAMPLE_CONFIDENCE: float = 0.95         # confidence level of the sampling mode bounds
+DATA_VALIDATION_SAMPLE_TOLERANCE: float = 0.01          # largest CDF error of each sample, sets the sample size
+DATA_VALIDATION_QUALITY_REPORT: str = 'data_quality_report.json'
+DATA_VALIDATION_RULE_SAMPLES: int = 5                    # row positions kept per violated data quality rule
+DATA_VALIDATION_NULL_TOKENS: tuple = ('', 'nan', 'none', 'null')  # strings read as missing values (case-insensitive)
 
 # Data Preprocessing constants
-DATA_PREPROCESSING_DATA_FILE: str = 'processed.csv'
+DATA_PREPROCESSING_DATA_FILE: str = f'processed.{DATA_ARTIFACT_FORMAT}'
 DATA_PREPROCESSING_OBJECT_FILE: str = 'preprocessor.pkl'
+DATA_PREPROCESSING_CHUNK_SIZE: int = 100_000             # rows per chunk in chunked preprocessing
+DATA_PREPROCESSING_EVAL_ENGINE: str = 'numexpr'           # engine of the noise rule conditions, 'python' if numexpr is missing
+DATA_PREPROCESSING_CACHE_MAX_BYTES: int = int(os.getenv('DATA_PREPROCESSING_CACHE_MAX_BYTES', 2 * 2**30))  # LRU eviction above this size
+DATA_PREPROCESSING_SCHEMA_SECTIONS: tuple = ('features', 'drop_columns', 'noise_rules', 'transformation')  # schema.yaml sections in the cache key
 
 # Data Split constants
-DATA_SPLIT_TRAIN_FILE: str = "train.csv"
-DATA_SPLIT_TEST_FILE: str = "test.csv"
\ No newline at end of file
+DATA_SPLIT_TRAIN_FILE: str = f"train.{DATA_ARTIFACT_FORMAT}"
+DATA_SPLIT_TEST_FILE: str = f"test.{DATA_ARTIFACT_FORMAT}"
+DATA_SPLIT_INDEX_FILE: str = "{scheme}_{subset}_index.npy"  # row indices into the processed dataset, per split scheme and subset
+DATA_SPLIT_SCHEMES: tuple = ('random', 'stratified', 'temporal')
+DATA_SPLIT_SCHEME: str = 'random'                        # scheme read by the model stages in the index split mode
+DATA_SPLIT_RANDOM_STATE: int = 12
\ No newline at end of file
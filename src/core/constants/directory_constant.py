@@ -5,6 +5,7 @@ ARTIFACTS_DIR: str = 'artifacts'
 DATA_DIR: str = 'data'
 REPORTS_DIR: str = 'reports'
 OBJECTS_DIR: str = 'objects'
+CACHE_DIR: str = 'cache'
 
 # Sub-Data Directory constants
 RAW_DATA_DIR: str = 'raw'
@@ -20,4 +21,9 @@ EVALUATION_REPORT_DIR: str = 'evaluation'
 
 # Sub-Objects Directory constants
 PREPROCESSED_OBJECT_DIR: str = 'preprocessor'
-MODEL_OBJECT_DIR: str = 'model'
\ No newline at end of file
+MODEL_OBJECT_DIR: str = 'model'
+REFERENCE_PROFILE_DIR: str = 'reference_profile'
+
+# Sub-Cache Directory constants
+PREPROCESSING_CACHE_DIR: str = 'preprocessing'
+TUNING_CACHE_DIR: str = 'tuning'
@@ -2,6 +2,9 @@
 MODEL_TRAINER_MODEL_OBJECT_NAME: str = "model.pkl"
 MODEL_TRAINER_BEST_MODEL_PARAMS_NAME: str = "params.json"
 MODEL_TRAINER_BEST_MODEL_METRICS_NAME: str = "metrics.json"
+MODEL_TRAINER_FOLD_PLAN_NAME: str = "fold_plan.npz"          # stratified CV fold indices of the tuning data
+MODEL_TRAINER_TUNING_DATA_NAME: str = "tuning_data.npy"      # tuning matrix, memory-mapped read-only by the searches
+MODEL_TRAINER_TUNING_RANDOM_STATE: int = 42
 
 # Model Evaluation related constants
 MODEL_EVALUATION_REPORT_FILE_NAME: str = "report.json"
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from typing import Any, Optional
+from dataclasses import dataclass, field
 
 
 
@@ -6,6 +7,7 @@ from dataclasses import dataclass
 @dataclass
 class DataIngestionArtifact:
     data_file_path: str
+    dataframe: Optional[Any] = field(default=None, repr=False, compare=False)          # in-memory handoff: the ingested data
 
 
 # Data Validation Artifact
@@ -14,6 +16,7 @@ class DataValidationArtifact:
     validation_status: bool
     message: str
     validation_report_file_path: str
+    dataframe: Optional[Any] = field(default=None, repr=False, compare=False)          # in-memory handoff: the validated data
 
 
 # Data Preprocessing Artifact
@@ -21,13 +24,17 @@ class DataValidationArtifact:
 class DataPreprocessingArtifact:
     processed_data_file_path: str                # file path to preprocessed data
     preprocessed_object_file_path: str           # file path to preprocessing.pkl
+    data: Optional[Any] = field(default=None, repr=False, compare=False)               # in-memory handoff: DataFrame
 
 
 # Data Split Artifact
 @dataclass
 class DataSplitArtifact:
-    train_data_file_path: str
+    train_data_file_path: str                    # split data file, or row index file (.npy) in the index split mode
     test_data_file_path: str
+    data_file_path: Optional[str] = None         # index split: the processed dataset the row indices point into
+    train_data: Optional[Any] = field(default=None, repr=False, compare=False)         # in-memory handoff: DataFrame
+    test_data: Optional[Any] = field(default=None, repr=False, compare=False)
 
 
 # Model Trainer Artifact
@@ -1,5 +1,6 @@
 import os
 
+from typing import Optional
 from from_root import from_root
 from dataclasses import dataclass
 
@@ -16,6 +17,20 @@ class DataIngestionConfig:
     interim_data_dir = os.path.join(from_root(),ARTIFACTS_DIR, DATA_DIR, INTERIM_DATA_DIR)
     raw_file_path: str = os.path.join(raw_data_dir, DATA_INGESTION_RAW_FILE) 
     data_file_path: str = os.path.join(interim_data_dir, DATA_INGESTION_DATA_FILE)
+    streaming_export: bool = True                       # stream the table in chunks instead of one full read
+    chunk_size: int = DATA_INGESTION_CHUNK_SIZE         # rows per chunk when streaming_export is enabled
+    pipelined_export: bool = True                       # overlap fetch, sanitising and both writes in threads
+    queue_size: int = DATA_INGESTION_QUEUE_SIZE         # chunks buffered between two pipelined stages
+    watermark_file_path: str = os.path.join(interim_data_dir, DATA_INGESTION_WATERMARK_FILE)
+    watermark_column: str = DATA_INGESTION_WATERMARK_COLUMN  # rows updated in place need a last update column here, or full_refresh
+    incremental: bool = True                            # only fetch rows past the persisted high-water mark
+    full_refresh: bool = False                          # ignore the high-water mark and reload the whole table
+    skip_if_unchanged: bool = True                      # skip the export when the source fingerprint did not change
+    fingerprint_file_path: str = os.path.join(interim_data_dir, DATA_INGESTION_FINGERPRINT_FILE)
+    partition_column: str = DATA_INGESTION_PARTITION_COLUMN
+    n_partitions: int = DATA_INGESTION_N_PARTITIONS     # > 1 reads range partitions of partition_column in parallel
+    max_workers: Optional[int] = None                   # partitions read concurrently, defaults to n_partitions
+    in_memory_handoff: bool = False                     # attach the ingested DataFrame to the artifact (full, non-streaming exports)
 
 
 # Data Validation Configuration
@@ -23,6 +38,31 @@ class DataIngestionConfig:
 class DataValidationConfig:
     validation_report_dir = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, VALIDATION_REPORT_DIR)
     validation_report_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_REPORT)
+    drift_table_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_DRIFT_TABLE)
+    drift_summary_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_DRIFT_SUMMARY)
+    save_full_report: bool = False                                   # also dump the full drift report as YAML
+    quality_report_file_path: str = os.path.join(validation_report_dir, DATA_VALIDATION_QUALITY_REPORT)
+    rule_samples: int = DATA_VALIDATION_RULE_SAMPLES                 # row positions kept per violated data quality rule
+    drift_backend: str = DATA_VALIDATION_DRIFT_BACKEND               # 'native' or 'evidently', not used with a reference profile
+    categorical_stattest: str = DATA_VALIDATION_CATEGORICAL_STATTEST # native backend: 'chi2' or 'psi'
+    stattest_threshold: float = DRIFT_STATTEST_THRESHOLD
+    psi_threshold: float = DRIFT_PSI_THRESHOLD
+    drift_share: float = DRIFT_SHARE
+    n_jobs: int = DATA_VALIDATION_N_JOBS                             # native backend: worker processes of the column tests, not used with a reference profile
+    streaming_validation: bool = False                               # one chunked pass building mergeable sketches
+    chunk_size: int = DATA_VALIDATION_CHUNK_SIZE                     # rows per chunk when streaming_validation is enabled
+    sketch_bins: int = DATA_VALIDATION_SKETCH_BINS
+    split_seed: int = DATA_VALIDATION_SPLIT_SEED
+    sampling_validation: bool = False                                # one pass drawing fixed-size samples, drift tests on the samples
+    sample_size: Optional[int] = None                                # rows per sample, None derives it from confidence and tolerance
+    sample_confidence: float = DATA_VALIDATION_SAMPLE_CONFIDENCE
+    sample_tolerance: float = DATA_VALIDATION_SAMPLE_TOLERANCE
+    sample_strata_column: Optional[str] = None                       # stratify the samples on this column (proportional allocation)
+    reference_profile_dir = os.path.join(from_root(), ARTIFACTS_DIR, OBJECTS_DIR, REFERENCE_PROFILE_DIR)
+    reference_profile_file_path: str = os.path.join(reference_profile_dir, DATA_VALIDATION_REFERENCE_PROFILE_FILE)
+    use_reference_profile: bool = True                               # compare new rows with the stored reference profile (not with sampling_validation),
+                                                                     # takes precedence over drift_backend and n_jobs: the profile sketches are tested natively
+    in_memory_handoff: bool = False                                  # attach the validated DataFrame to the artifact (in-memory validation)
 
 
 # Data Preprocessing Configuration
@@ -32,13 +72,24 @@ class DataPreprocessingConfig:
     preprocessed_object_dir: str = os.path.join(from_root(), ARTIFACTS_DIR, OBJECTS_DIR, PREPROCESSED_OBJECT_DIR)
     processed_data_file_path: str = os.path.join(processed_data_dir, DATA_PREPROCESSING_DATA_FILE)
     preprocessed_object_file_path: str = os.path.join(preprocessed_object_dir, DATA_PREPROCESSING_OBJECT_FILE)
+    chunked_preprocessing: bool = False                 # two streaming passes (fit statistics, then transform) instead of one full read
+    chunk_size: int = DATA_PREPROCESSING_CHUNK_SIZE     # rows per chunk when chunked_preprocessing is enabled
+    cache_dir: str = os.path.join(from_root(), ARTIFACTS_DIR, CACHE_DIR, PREPROCESSING_CACHE_DIR)
+    use_cache: bool = True                              # reuse the outputs of a previous run with the same data, schema and code
+    cache_max_bytes: int = DATA_PREPROCESSING_CACHE_MAX_BYTES
+    in_memory_handoff: bool = False                     # attach the processed data to the artifact, files are written in the background
 
 
 # Data Split Configuration
+@dataclass
 class DataSplitConfig:
     splitted_data_dir: str = os.path.join(from_root(), ARTIFACTS_DIR, DATA_DIR, SPLITTED_DATA_DIR)
     train_data_file_path: str = os.path.join(splitted_data_dir, DATA_SPLIT_TRAIN_FILE)
     test_data_file_path: str = os.path.join(splitted_data_dir, DATA_SPLIT_TEST_FILE)
+    in_memory_handoff: bool = False                     # attach the train / test data to the artifact, files are written in the background
+    index_split: bool = False                           # save row indices (.npy) into the processed dataset instead of train / test copies
+    split_schemes: tuple = DATA_SPLIT_SCHEMES           # index split: schemes whose indices are saved side by side
+    split_scheme: str = DATA_SPLIT_SCHEME               # index split: scheme the model stages read
 
 
 # Model Trainer Configuration
@@ -49,6 +100,11 @@ class ModelTrainerConfig:
     best_model_metrics_file_path: str = os.path.join(best_model_metrics_dir, MODEL_TRAINER_BEST_MODEL_METRICS_NAME)
     best_model_params_dir: str = os.path.join(from_root(), ARTIFACTS_DIR, REPORTS_DIR, BEST_MODEL_PARAMS_DIR)
     best_model_params_file_path: str = os.path.join(best_model_params_dir, MODEL_TRAINER_BEST_MODEL_PARAMS_NAME)
+    tuning_cache_dir: str = os.path.join(from_root(), ARTIFACTS_DIR, CACHE_DIR, TUNING_CACHE_DIR)
+    fold_plan_file_path: str = os.path.join(tuning_cache_dir, MODEL_TRAINER_FOLD_PLAN_NAME)
+    tuning_data_file_path: str = os.path.join(tuning_cache_dir, MODEL_TRAINER_TUNING_DATA_NAME)
+    tuning_random_state: int = MODEL_TRAINER_TUNING_RANDOM_STATE   # fixed tuning subset, so the fold plan is reused across runs
+    shared_tuning_data: bool = True                      # one read-only memmap of the dense tuning matrix for every search
 
 
 # Model Evaluation Configuration
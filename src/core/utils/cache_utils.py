@@ -0,0 +1,212 @@
+# This script provides a content-addressed, size-bounded cache for the output files of pipeline stages.
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import inspect
+
+from typing import Iterable, Optional
+
+from src.core.exception import HotelBookingException
+
+
+
+# Name of the file that describes a cache entry
+CACHE_MANIFEST_FILE: str = 'manifest.json'
+
+# Bytes read at a time when hashing a file
+HASH_BLOCK_SIZE: int = 1 << 20
+
+
+
+# Function for the content hash of a file
+@staticmethod
+def file_fingerprint(file_path: str) -> str:
+    """
+    Return the SHA-256 hash of the content of a file, read block by block.
+
+    Parameters:
+    file_path (str): The file to hash.
+
+    Returns:
+    str: The hexadecimal digest.
+
+    Raises:
+    HotelBookingException: If the file cannot be read.
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in file_fingerprint for {file_path}: {str(e)}", sys) from e
+
+
+# Function for the version hash of the code of a stage
+@staticmethod
+def code_fingerprint(objects: Iterable) -> str:
+    """
+    Return the SHA-256 hash of the source files defining the given modules, classes or functions, so a
+    cache key changes with the code that produces the cached files.
+
+    Parameters:
+    objects (Iterable): Modules, classes or functions whose source files are hashed.
+
+    Returns:
+    str: The hexadecimal digest.
+    """
+    try:
+        digest = hashlib.sha256()
+        for source_file in sorted({inspect.getsourcefile(obj) for obj in objects}):
+            digest.update(os.path.basename(source_file).encode())
+            digest.update(bytes.fromhex(file_fingerprint(source_file)))
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in code_fingerprint: {str(e)}", sys) from e
+
+
+# Function for the cache key of a set of inputs
+@staticmethod
+def cache_key(*parts) -> str:
+    """
+    Return the SHA-256 hash of the JSON serialised parts (fingerprints, configuration sections, versions).
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+
+# Class for caching the output files of a stage
+class ArtifactCache:
+    """
+    Content-addressed cache of the output files of a stage: every entry is a directory named after its key,
+    holding copies of the files and a manifest. Entries are evicted least recently used first once the
+    cache is larger than max_bytes (the entry just stored is always kept). Files are copied in and out of
+    the cache, so later writes to the artifact files never change an entry.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+
+    def get(self, key: str, file_paths: dict) -> bool:
+        """
+        Restore the files of an entry to the given paths.
+
+        Parameters:
+        key (str): The cache key.
+        file_paths (dict): File name of the entry -> path to restore it to.
+
+        Returns:
+        bool: True on a cache hit (every file restored), False otherwise.
+        """
+        try:
+            manifest_path = os.path.join(self._entry_dir(key), CACHE_MANIFEST_FILE)
+            if not os.path.exists(manifest_path):
+                return False
+
+            with open(manifest_path, "r") as manifest_file:
+                manifest = json.load(manifest_file)
+            if set(file_paths) - set(manifest["files"]):
+                return False
+
+            for name, file_path in file_paths.items():
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                shutil.copyfile(os.path.join(self._entry_dir(key), name), file_path)
+
+            # The manifest modification time is the last use of the entry
+            os.utime(manifest_path)
+            return True
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in ArtifactCache.get for {key}: {str(e)}", sys) from e
+
+
+    def put(self, key: str, file_paths: dict) -> None:
+        """
+        Store copies of the files under the key, then evict entries until the cache fits in max_bytes.
+
+        Parameters:
+        key (str): The cache key.
+        file_paths (dict): File name of the entry -> path of the file to store.
+        """
+        try:
+            entry_dir = self._entry_dir(key)
+            staging_dir = f"{entry_dir}.{os.getpid()}.tmp"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            os.makedirs(staging_dir)
+
+            for name, file_path in file_paths.items():
+                shutil.copyfile(file_path, os.path.join(staging_dir, name))
+
+            manifest = {"key": key, "created": time.time(),
+                        "files": {name: os.path.getsize(file_path) for name, file_path in file_paths.items()}}
+            with open(os.path.join(staging_dir, CACHE_MANIFEST_FILE), "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=4)
+
+            # The entry appears complete or not at all
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging_dir, entry_dir)
+
+            self.evict(keep=key)
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in ArtifactCache.put for {key}: {str(e)}", sys) from e
+
+
+    def entries(self) -> list:
+        """
+        Return the (last use time, size in bytes, key) of every complete entry, least recently used first.
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+
+        for key in os.listdir(self.cache_dir):
+            manifest_path = os.path.join(self._entry_dir(key), CACHE_MANIFEST_FILE)
+            if os.path.exists(manifest_path):
+                size = sum(os.path.getsize(os.path.join(self._entry_dir(key), name)) for name in os.listdir(self._entry_dir(key)))
+                entries.append((os.path.getmtime(manifest_path), size, key))
+
+        return sorted(entries)
+
+
+    def evict(self, keep: Optional[str] = None) -> list:
+        """
+        Remove the least recently used entries until the cache fits in max_bytes.
+
+        Parameters:
+        keep (str, optional): A key that is never evicted (the entry just stored).
+
+        Returns:
+        list: The evicted keys.
+        """
+        try:
+            entries = self.entries()
+            total_bytes = sum(size for _, size, _ in entries)
+            evicted = []
+
+            for _, size, key in entries:
+                if total_bytes <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                total_bytes -= size
+                evicted.append(key)
+
+            return evicted
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in ArtifactCache.evict: {str(e)}", sys) from e
@@ -0,0 +1,184 @@
+# This script provides precomputed cross-validation fold plans and shared read-only tuning matrices for the
+# hyperparameter searches of the model trainer.
+
+import os
+import sys
+import hashlib
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from src.core.exception import HotelBookingException
+
+
+
+# Function for the content hash of a feature matrix and its target
+@staticmethod
+def data_fingerprint(X: Any, y: pd.Series) -> str:
+    """
+    Return the SHA-256 hash of the values of the features (DataFrame or array) and the target,
+    so a fold plan is reused only for the very same rows in the very same order.
+
+    Parameters:
+    X (DataFrame or ndarray): The features.
+    y (Series): The target.
+
+    Returns:
+    str: The hexadecimal digest.
+    """
+    try:
+        digest = hashlib.sha256()
+
+        if isinstance(X, pd.DataFrame):
+            digest.update(",".join(map(str, X.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+        else:
+            digest.update(np.asarray(X.shape).tobytes())
+            digest.update(np.ascontiguousarray(X).tobytes())
+
+        digest.update(pd.util.hash_pandas_object(pd.Series(np.asarray(y)), index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in data_fingerprint: {str(e)}", sys) from e
+
+
+# Function for computing stratified fold indices
+@staticmethod
+def make_fold_plan(y: pd.Series, n_splits: int) -> list:
+    """
+    Return the (train indices, test indices) pairs of a stratified K-fold split of the rows, the folds
+    GridSearchCV makes itself for a classifier with an integer cv (StratifiedKFold, no shuffling).
+
+    Parameters:
+    y (Series): The target.
+    n_splits (int): The number of folds.
+
+    Returns:
+    list: The (train, test) int64 index arrays of every fold.
+    """
+    try:
+        folds = StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), np.asarray(y))
+        return [(train.astype(np.int64), test.astype(np.int64)) for train, test in folds]
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in make_fold_plan: {str(e)}", sys) from e
+
+
+# Function for the persisted fold plan of a dataset
+@staticmethod
+def get_fold_plan(X: Any, y: pd.Series, n_splits: int, file_path: str) -> tuple:
+    """
+    Return the fold plan of the data, read from file_path when it was computed for the same data fingerprint
+    and number of folds, computed and saved otherwise. The plan is passed to every search as its cv iterable,
+    so all models are scored on the same folds, run after run.
+
+    Parameters:
+    X (DataFrame or ndarray): The features.
+    y (Series): The target.
+    n_splits (int): The number of folds.
+    file_path (str): The .npz file of the plan.
+
+    Returns:
+    tuple: The fold plan (list of (train, test) index arrays) and whether it was read from file_path.
+    """
+    try:
+        fingerprint = data_fingerprint(X, y)
+
+        plan = load_fold_plan(file_path, fingerprint, n_splits)
+        if plan is not None:
+            return plan, True
+
+        plan = make_fold_plan(y, n_splits)
+        save_fold_plan(file_path, plan, fingerprint)
+        return plan, False
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in get_fold_plan: {str(e)}", sys) from e
+
+
+# Function for saving a fold plan
+@staticmethod
+def save_fold_plan(file_path: str, plan: list, fingerprint: str) -> None:
+    """
+    Save a fold plan and the fingerprint of its data as an .npz file (train_<i> and test_<i> arrays).
+
+    Parameters:
+    file_path (str): The .npz file to write.
+    plan (list): The (train, test) index arrays of every fold.
+    fingerprint (str): The data fingerprint of the plan.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        arrays = {"fingerprint": np.asarray(fingerprint), "n_splits": np.asarray(len(plan))}
+        for i, (train, test) in enumerate(plan):
+            arrays[f"train_{i}"], arrays[f"test_{i}"] = train, test
+
+        # Written whole, then renamed, a reader never sees a partial plan
+        with open(f"{file_path}.tmp", "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(f"{file_path}.tmp", file_path)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in save_fold_plan for {file_path}: {str(e)}", sys) from e
+
+
+# Function for loading a fold plan
+@staticmethod
+def load_fold_plan(file_path: str, fingerprint: str, n_splits: int) -> Optional[list]:
+    """
+    Read a fold plan saved by save_fold_plan.
+
+    Parameters:
+    file_path (str): The .npz file to read.
+    fingerprint (str): The data fingerprint the plan must have been computed for.
+    n_splits (int): The number of folds the plan must have.
+
+    Returns:
+    list, optional: The (train, test) index arrays of every fold, None if there is no plan for this data.
+    """
+    try:
+        if not os.path.exists(file_path):
+            return None
+
+        with np.load(file_path) as arrays:
+            if str(arrays["fingerprint"]) != fingerprint or int(arrays["n_splits"]) != n_splits:
+                return None
+            return [(arrays[f"train_{i}"], arrays[f"test_{i}"]) for i in range(n_splits)]
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in load_fold_plan for {file_path}: {str(e)}", sys) from e
+
+
+# Function for sharing a dense feature matrix between processes
+@staticmethod
+def create_shared_matrix(X: pd.DataFrame, file_path: str, dtype: type = np.float32) -> np.memmap:
+    """
+    Write the features as one .npy file and map it back read-only. The joblib workers of every search get
+    the memory map by reference instead of a pickled copy of the data, so one copy of the matrix is shared
+    by all of them. float32 is the dtype the tree models of model.yaml convert their input to.
+
+    Parameters:
+    X (DataFrame): The features.
+    file_path (str): The .npy file to write.
+    dtype (type): The dtype of the matrix.
+
+    Returns:
+    memmap: The read-only features, in the column order of X.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # A new file replaces the old one, memory maps of a previous run keep reading the old file
+        with open(f"{file_path}.tmp", "wb") as file:
+            np.save(file, X.to_numpy(dtype=dtype))
+        os.replace(f"{file_path}.tmp", file_path)
+
+        return np.load(file_path, mmap_mode="r")
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in create_shared_matrix for {file_path}: {str(e)}", sys) from e
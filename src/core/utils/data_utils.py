@@ -1,31 +1,76 @@
-# This script provides utility methods for reading and writing data/csv files.
+# This script provides utility methods for reading and writing data files (csv, parquet, feather).
 
 import os
 import sys
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from typing import Iterator, Optional
 
 from src.core.exception import HotelBookingException
+from src.core.utils.dtype_utils import apply_schema_dtypes
 
+from src.core.constants.data_constant import DATA_ARTIFACT_FORMATS
+
+
+
+# Function for getting the format of a data file
+@staticmethod
+def get_data_format(file_path: str) -> str:
+    """
+    Return the format of a data file, which every artifact records through its file extension.
+
+    Parameters:
+    file_path (str): The path of the data file.
+
+    Returns:
+    str: One of 'csv', 'parquet' or 'feather'.
+
+    Raises:
+    HotelBookingException: If the extension is not a supported data format.
+    """
+    try:
+        extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+        data_format = {"pq": "parquet", "arrow": "feather"}.get(extension, extension)
+
+        if data_format not in DATA_ARTIFACT_FORMATS:
+            raise ValueError(f"Unsupported data format '{extension}', expected one of {DATA_ARTIFACT_FORMATS}")
+        return data_format
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in get_data_format for {file_path}: {str(e)}", sys) from e
 
 
 # Function for Reading data from a file
 @staticmethod
-def read_data(file_path: str) -> pd.DataFrame:
+def read_data(file_path: str, schema_config: Optional[dict] = None) -> pd.DataFrame:
     """
-    Read data from a CSV file and return it as a DataFrame.
+    Read data from a CSV, Parquet or Feather file (picked by the file extension) and return it as a DataFrame.
 
     Parameters:
-    file_path (str): The path to the YAML file to be read.
+    file_path (str): The path to the data file to be read.
+    schema_config (dict, optional): Content of schema.yaml, if given its column types are applied as compact dtypes.
 
     Returns:
-    DataFrame: A DataFrame containing the data from the CSV file.
+    DataFrame: A DataFrame containing the data from the file.
 
     Raises:
-    HotelBookingException: If an error occurs while reading the YAML file.
+    HotelBookingException: If an error occurs while reading the data file.
     """
     try:
-        dataframe = pd.read_csv(file_path)
+        data_format = get_data_format(file_path)
+
+        if data_format == "parquet":
+            dataframe = pd.read_parquet(file_path)
+        elif data_format == "feather":
+            dataframe = pd.read_feather(file_path)
+        else:
+            dataframe = pd.read_csv(file_path)
+
+        if schema_config is not None:
+            dataframe = apply_schema_dtypes(dataframe, schema_config, stage=f"read_data {os.path.basename(file_path)}")
        
         return dataframe
     
@@ -33,14 +78,102 @@ def read_data(file_path: str) -> pd.DataFrame:
         raise HotelBookingException(f"Error reading data from {file_path}: {str(e)}", sys) from e
 
 
+# Function for reading data from a file chunk by chunk
+@staticmethod
+def read_data_in_chunks(file_path: str, chunk_size: int, start_row: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV, Parquet or Feather file chunk by chunk, so that only one chunk is held in memory at a time.
+
+    Parameters:
+    file_path (str): The path to the data file to be read.
+    chunk_size (int): Maximum number of rows per chunk.
+    start_row (int): Number of leading rows to skip, whole Parquet row groups / Feather batches are skipped without decoding.
+
+    Returns:
+    Iterator[DataFrame]: The chunks of the file, in order.
+
+    Raises:
+    HotelBookingException: If an error occurs while reading the data file.
+    """
+    try:
+        data_format = get_data_format(file_path)
+
+        if data_format == "parquet":
+            parquet_file = pq.ParquetFile(file_path)
+            row_groups, skip = [], start_row
+            for i in range(parquet_file.num_row_groups):
+                num_rows = parquet_file.metadata.row_group(i).num_rows
+                if not row_groups and skip >= num_rows:
+                    skip -= num_rows
+                else:
+                    row_groups.append(i)
+
+            if row_groups:
+                for batch in parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups):
+                    if skip >= batch.num_rows:
+                        skip -= batch.num_rows
+                        continue
+                    yield batch.slice(skip).to_pandas()
+                    skip = 0
+
+        elif data_format == "feather":
+            with pa.memory_map(file_path) as source:
+                reader = pa.ipc.open_file(source)
+                skip = start_row
+                for i in range(reader.num_record_batches):
+                    batch = reader.get_batch(i)
+                    if skip >= batch.num_rows:
+                        skip -= batch.num_rows
+                        continue
+                    for start in range(skip, batch.num_rows, chunk_size):
+                        yield batch.slice(start, chunk_size).to_pandas()
+                    skip = 0
+
+        else:
+            yield from pd.read_csv(file_path, chunksize=chunk_size, skiprows=range(1, start_row + 1))
+
+    except Exception as e:
+        raise HotelBookingException(f"Error reading data in chunks from {file_path}: {str(e)}", sys) from e
+
+
+# Function for counting the rows of a data file
+@staticmethod
+def get_data_row_count(file_path: str) -> int:
+    """
+    Return the number of rows of a CSV, Parquet or Feather file (from the file metadata for the columnar formats).
+
+    Parameters:
+    file_path (str): The path to the data file.
+
+    Returns:
+    int: Number of rows of the file.
+
+    Raises:
+    HotelBookingException: If an error occurs while reading the data file.
+    """
+    try:
+        data_format = get_data_format(file_path)
+
+        if data_format == "parquet":
+            return pq.ParquetFile(file_path).metadata.num_rows
+
+        if data_format == "feather":
+            return ds.dataset(file_path, format="feather").count_rows()
+
+        return sum(len(chunk) for chunk in pd.read_csv(file_path, usecols=[0], chunksize=1_000_000))
+
+    except Exception as e:
+        raise HotelBookingException(f"Error counting the rows of {file_path}: {str(e)}", sys) from e
+
+
 # Function for saving data to a file
 @staticmethod
 def save_data(dataframe: pd.DataFrame, file_path: str) -> None:
     """
-    Save the given DataFrame to a CSV file at the specified file path.
+    Save the given DataFrame at the specified file path, in the format of its extension (csv, parquet, feather).
 
     Parameters:
-    DataFrame: A DataFrame containing the data from the CSV file.
+    DataFrame: A DataFrame containing the data to be saved.
     file_path: The file path where the DataFrame will be saved.
 
     Raises:
@@ -51,8 +184,178 @@ def save_data(dataframe: pd.DataFrame, file_path: str) -> None:
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        # Save the DataFrame to a CSV file
-        dataframe.to_csv(file_path, index=False, header=True)
+        data_format = get_data_format(file_path)
+
+        if data_format == "parquet":
+            dataframe.to_parquet(file_path, index=False)
+        elif data_format == "feather":
+            # Feather only stores a default index
+            dataframe.reset_index(drop=True).to_feather(file_path)
+        else:
+            dataframe.to_csv(file_path, index=False, header=True)
+    
+    except Exception as e:
+        raise HotelBookingException(f"Error saving data to {file_path}: {str(e)}", sys) from e
+
+
+# Class for writing a data file chunk by chunk
+class DataWriter:
+    """
+    Write a DataFrame to a data file chunk by chunk, in the format of the file extension.
+
+    CSV chunks are appended to the file directly. Parquet and Feather files are written through a single
+    pyarrow writer, using the schema of the first chunk, later chunks are cast to it. With append=True the
+    rows of an existing Parquet/Feather file are streamed into the new file first (both formats are immutable),
+    under a schema widened to fit the existing and the appended rows: memory stays bounded, but every append
+    rewrites the whole file. CSV is the format to use for files appended to often (e.g. by incremental runs).
+
+    Usage:
+        with DataWriter(file_path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, file_path: str, append: bool = False):
+        self.file_path = file_path
+        self.append = append
+        self.data_format = get_data_format(file_path)
+        self.n_rows = 0
+
+        self._writer = None
+        self._schema = None
+        self._previous_file_path = None
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        if self.data_format != "csv":
+            if append and os.path.exists(file_path):
+                # Keep the existing rows aside, they are re-written before the first new chunk
+                self._previous_file_path = f"{file_path}.previous"
+                os.replace(file_path, self._previous_file_path)
+        elif not append and os.path.exists(file_path):
+            os.remove(file_path)
+
+
+    def __enter__(self) -> "DataWriter":
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+    @staticmethod
+    def _plain_schema(schema: pa.Schema, typed_nulls: bool = True) -> pa.Schema:
+        # Categories differ between chunks and all-null chunks have no type, so both are stored as plain values
+        fields = []
+        for field in schema.remove_metadata():
+            if pa.types.is_dictionary(field.type):
+                field = field.with_type(field.type.value_type)
+            elif typed_nulls and pa.types.is_null(field.type):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return pa.schema(fields)
+
+
+    def _open(self, table: pa.Table) -> None:
+        schema = self._plain_schema(table.schema, typed_nulls=self._previous_file_path is None)
+
+        if self._previous_file_path is not None:
+            if self.data_format == "parquet":
+                previous_schema = pq.read_schema(self._previous_file_path)
+            else:
+                with pa.memory_map(self._previous_file_path) as source:
+                    previous_schema = pa.ipc.open_file(source).schema
+            # Widen the types so both the existing and the appended rows fit (e.g. int64 + float64 -> float64)
+            previous_schema = self._plain_schema(previous_schema)
+            schema = self._plain_schema(pa.unify_schemas([previous_schema, pa.schema([schema.field(name) for name in previous_schema.names])],
+                                                         promote_options="permissive"))
+
+        self._schema = schema
+        if self.data_format == "parquet":
+            self._writer = pq.ParquetWriter(self.file_path, schema)
+        else:
+            self._writer = pa.ipc.new_file(self.file_path, schema)
+
+        if self._previous_file_path is not None:
+            self._write_previous()
+
+
+    def _write_previous(self) -> None:
+        if self.data_format == "parquet":
+            for batch in pq.ParquetFile(self._previous_file_path).iter_batches():
+                self._writer.write_table(pa.Table.from_batches([batch]).cast(self._schema))
+        else:
+            with pa.memory_map(self._previous_file_path) as source:
+                previous_file = pa.ipc.open_file(source)
+                for i in range(previous_file.num_record_batches):
+                    self._writer.write_table(pa.Table.from_batches([previous_file.get_batch(i)]).cast(self._schema))
+
+        os.remove(self._previous_file_path)
+        self._previous_file_path = None
+
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        """
+        Write one chunk of rows to the data file.
+
+        Parameters:
+        dataframe (DataFrame): The chunk to be written.
+
+        Raises:
+        HotelBookingException: If an error occurs while writing the chunk.
+        """
+        try:
+            if self.data_format == "csv":
+                write_header = not os.path.exists(self.file_path)
+                dataframe.to_csv(self.file_path, mode="a", index=False, header=write_header)
+            else:
+                table = pa.Table.from_pandas(dataframe, preserve_index=False)
+                if self._writer is None:
+                    self._open(table)
+
+                self._writer.write_table(table.select(self._schema.names).cast(self._schema))
+
+            self.n_rows += len(dataframe)
+
+        except Exception as e:
+            raise HotelBookingException(f"Error writing data to {self.file_path}: {str(e)}", sys) from e
+
+
+    def close(self) -> None:
+        """
+        Close the underlying writer, an existing file that nothing was appended to is kept as it was.
+        """
+        try:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+            if self._previous_file_path is not None:
+                os.replace(self._previous_file_path, self.file_path)
+                self._previous_file_path = None
+
+        except Exception as e:
+            raise HotelBookingException(f"Error closing data file {self.file_path}: {str(e)}", sys) from e
+
+
+# Function for appending data to a file
+@staticmethod
+def append_data(dataframe: pd.DataFrame, file_path: str) -> None:
+    """
+    Append the given DataFrame to a data file (csv, parquet, feather), creating the file if it does not exist.
+    Only CSV files are appended to in place, Parquet and Feather files are rewritten (see DataWriter).
+
+    Parameters:
+    DataFrame: A DataFrame (or chunk of a larger dataset) to be appended.
+    file_path: The file path where the DataFrame will be appended.
+
+    Raises:
+    HotelBookingException: If an error occurs while appending to the data file.
+    """
+    try:
+        with DataWriter(file_path, append=True) as writer:
+            writer.write(dataframe)
     
     except Exception as e:
-        raise HotelBookingException(f"Error saving data to {file_path}: {str(e)}", sys) from e
\ No newline at end of file
+        raise HotelBookingException(f"Error appending data to {file_path}: {str(e)}", sys) from e
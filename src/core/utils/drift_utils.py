@@ -0,0 +1,580 @@
+# This script provides utility methods for detecting data drift between a reference and a current dataset.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from src.core.exception import HotelBookingException
+from src.core.utils.sketch_utils import (counts_from_sketches,
+                                         ks_test_from_sketches)
+
+from src.core.constants.data_constant import (DRIFT_STATTEST_THRESHOLD,
+                                              DRIFT_PSI_THRESHOLD,
+                                              DRIFT_SHARE)
+
+
+
+# Function for the Kolmogorov-Smirnov test of a numerical column
+@staticmethod
+def ks_test(reference: np.ndarray, current: np.ndarray) -> tuple:
+    """
+    Two-sample Kolmogorov-Smirnov test of two numerical samples (missing values are ignored).
+
+    Parameters:
+    reference (ndarray): Values of the reference sample.
+    current (ndarray): Values of the current sample.
+
+    Returns:
+    tuple: (KS statistic, p-value).
+    """
+    try:
+        reference = reference[~np.isnan(reference)]
+        current = current[~np.isnan(current)]
+        if len(reference) == 0 or len(current) == 0:
+            return 0.0, 1.0
+
+        result = stats.ks_2samp(reference, current)
+        return float(result.statistic), float(result.pvalue)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in ks_test: {str(e)}", sys) from e
+
+
+# Function for the chi-square test of a categorical column
+@staticmethod
+def chi_square_test(reference_counts: np.ndarray, current_counts: np.ndarray) -> tuple:
+    """
+    Chi-square test of homogeneity of two frequency tables over the same categories.
+
+    Parameters:
+    reference_counts (ndarray): Count of every category in the reference sample.
+    current_counts (ndarray): Count of every category in the current sample (same order).
+
+    Returns:
+    tuple: (chi-square statistic, p-value).
+    """
+    try:
+        # Categories seen in neither sample carry no information
+        observed = np.vstack([reference_counts, current_counts]).astype(float)
+        observed = observed[:, observed.sum(axis=0) > 0]
+        if observed.shape[1] < 2 or (observed.sum(axis=1) == 0).any():
+            return 0.0, 1.0
+
+        statistic, p_value, _, _ = stats.chi2_contingency(observed, correction=False)
+        return float(statistic), float(p_value)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in chi_square_test: {str(e)}", sys) from e
+
+
+# Function for the population stability index of two frequency tables
+@staticmethod
+def population_stability_index(reference_counts: np.ndarray, current_counts: np.ndarray, eps: float = 1e-4) -> float:
+    """
+    Population Stability Index (PSI) of two frequency tables over the same categories / bins.
+
+    Parameters:
+    reference_counts (ndarray): Count of every category (or bin) in the reference sample.
+    current_counts (ndarray): Count of every category (or bin) in the current sample (same order).
+    eps (float): Floor of the proportions, so empty categories do not produce infinite values.
+
+    Returns:
+    float: The PSI, 0 for identical distributions (> 0.2 is commonly read as a significant shift).
+    """
+    try:
+        reference_share = np.clip(reference_counts / max(reference_counts.sum(), 1), eps, None)
+        current_share = np.clip(current_counts / max(current_counts.sum(), 1), eps, None)
+
+        return float(np.sum((current_share - reference_share) * np.log(current_share / reference_share)))
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in population_stability_index: {str(e)}", sys) from e
+
+
+# Function for encoding the categories of a categorical column
+@staticmethod
+def encode_categories(reference: pd.Series, current: pd.Series) -> tuple:
+    """
+    Encode two samples of a categorical column as integer codes over the (sorted) union of their categories.
+
+    Parameters:
+    reference (Series): The reference sample of the column.
+    current (Series): The current sample of the column.
+
+    Returns:
+    tuple: (reference codes, current codes, number of categories), missing values are coded -1.
+    """
+    try:
+        categories = pd.Index(np.asarray(reference.dropna().unique())).union(pd.Index(np.asarray(current.dropna().unique())))
+        try:
+            categories = categories.sort_values()
+        except TypeError:
+            pass
+
+        return (pd.Categorical(reference, categories=categories).codes,
+                pd.Categorical(current, categories=categories).codes,
+                len(categories))
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in encode_categories: {str(e)}", sys) from e
+
+
+# Function for the frequency table of encoded categories
+@staticmethod
+def count_codes(codes: np.ndarray, n_categories: int) -> np.ndarray:
+    """
+    Count the integer codes of a categorical column (missing values, coded -1, are ignored).
+
+    Parameters:
+    codes (ndarray): Codes of the column, see encode_categories.
+    n_categories (int): Number of categories.
+
+    Returns:
+    ndarray: Count of every category.
+    """
+    return np.bincount(codes[codes >= 0], minlength=n_categories)
+
+
+# Function for the frequency tables of a categorical column
+@staticmethod
+def category_counts(reference: pd.Series, current: pd.Series) -> tuple:
+    """
+    Count the categories of two samples of a column over their union of categories (missing values are ignored).
+
+    Parameters:
+    reference (Series): The reference sample of the column.
+    current (Series): The current sample of the column.
+
+    Returns:
+    tuple: (reference counts, current counts) as aligned ndarrays.
+    """
+    try:
+        reference_codes, current_codes, n_categories = encode_categories(reference, current)
+        return count_codes(reference_codes, n_categories), count_codes(current_codes, n_categories)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in category_counts: {str(e)}", sys) from e
+
+
+# Function for detecting the drift of a single column
+@staticmethod
+def detect_column_drift(reference: pd.Series,
+                        current: pd.Series,
+                        column_type: str,
+                        categorical_stattest: str = "chi2",
+                        stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                        psi_threshold: float = DRIFT_PSI_THRESHOLD) -> dict:
+    """
+    Detect the drift of one column: KS test for numerical columns, chi-square test (p-value below the threshold)
+    or PSI (above the threshold) for categorical and boolean columns.
+
+    Parameters:
+    reference (Series): The reference sample of the column.
+    current (Series): The current sample of the column.
+    column_type (str): The column type from schema.yaml (numerical, categorical, boolean).
+    categorical_stattest (str): 'chi2' or 'psi'.
+    stattest_threshold (float): p-value below which a KS / chi-square test reports drift.
+    psi_threshold (float): PSI above which a column has drifted.
+
+    Returns:
+    dict: column_type, stattest, statistic, p_value (None for PSI), threshold and drift_detected.
+    """
+    try:
+        if column_type == "numerical":
+            return drift_result(column_type, "ks", *ks_test(pd.to_numeric(reference).to_numpy(dtype=float),
+                                                             pd.to_numeric(current).to_numpy(dtype=float)),
+                                 stattest_threshold=stattest_threshold)
+
+        return categorical_drift_result(column_type, *category_counts(reference, current),
+                                        categorical_stattest=categorical_stattest,
+                                        stattest_threshold=stattest_threshold,
+                                        psi_threshold=psi_threshold)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in detect_column_drift for column {reference.name}: {str(e)}", sys) from e
+
+
+# Function for building the drift result of a column from its test statistic
+@staticmethod
+def drift_result(column_type: str, stattest: str, statistic: float, p_value: Optional[float],
+                 stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                 psi_threshold: float = DRIFT_PSI_THRESHOLD) -> dict:
+    """
+    Build the drift result of a column: drift is detected when the p-value (KS, chi-square) is below
+    stattest_threshold, or the PSI is above psi_threshold.
+
+    Returns:
+    dict: column_type, stattest, statistic, p_value (None for PSI), threshold and drift_detected.
+    """
+    if stattest == "psi":
+        threshold, drift_detected = psi_threshold, statistic > psi_threshold
+    else:
+        threshold, drift_detected = stattest_threshold, p_value < stattest_threshold
+
+    return {
+        "column_type": column_type,
+        "stattest": stattest,
+        "statistic": statistic,
+        "p_value": p_value,
+        "threshold": threshold,
+        "drift_detected": bool(drift_detected),
+    }
+
+
+# Function for the drift result of a categorical column from its frequency tables
+@staticmethod
+def categorical_drift_result(column_type: str,
+                             reference_counts: np.ndarray,
+                             current_counts: np.ndarray,
+                             categorical_stattest: str = "chi2",
+                             stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                             psi_threshold: float = DRIFT_PSI_THRESHOLD) -> dict:
+    """
+    Chi-square test or PSI of two aligned frequency tables, see drift_result.
+    """
+    if categorical_stattest == "psi":
+        statistic, p_value = population_stability_index(reference_counts, current_counts), None
+    else:
+        statistic, p_value = chi_square_test(reference_counts, current_counts)
+
+    return drift_result(column_type, categorical_stattest, statistic, p_value,
+                        stattest_threshold=stattest_threshold, psi_threshold=psi_threshold)
+
+
+# Function for getting the columns checked for drift
+@staticmethod
+def get_drift_columns(reference_df: pd.DataFrame, current_df: pd.DataFrame, schema_config: dict) -> dict:
+    """
+    Return the columns of both DataFrames labelled numerical, categorical or boolean in schema.yaml
+    (datetime and sensitive columns are not checked for drift).
+
+    Parameters:
+    reference_df (DataFrame): The reference dataset.
+    current_df (DataFrame): The current dataset.
+    schema_config (dict): The content of schema.yaml.
+
+    Returns:
+    dict: Column name -> column type, in the order of the reference dataset.
+    """
+    features = schema_config.get("features", {})
+
+    return {
+        column: features[column]["type"]
+        for column in reference_df.columns
+        if column in current_df.columns and column in features
+        and features[column].get("type") in ("numerical", "categorical", "boolean")
+    }
+
+
+# Function for summarising the drift of all columns
+@staticmethod
+def summarize_drift(columns: dict, drift_share: float = DRIFT_SHARE) -> dict:
+    """
+    Summarise the per-column drift results into the dataset drift metrics.
+
+    Parameters:
+    columns (dict): Column name -> result of detect_column_drift.
+    drift_share (float): Share of drifted columns from which the whole dataset has drifted.
+
+    Returns:
+    dict: n_features, n_drifted_features, share_drifted_features, drift_share and dataset_drift.
+    """
+    n_features = len(columns)
+    n_drifted_features = sum(result["drift_detected"] for result in columns.values())
+    share_drifted_features = n_drifted_features / n_features if n_features else 0.0
+
+    return {
+        "n_features": n_features,
+        "n_drifted_features": n_drifted_features,
+        "share_drifted_features": share_drifted_features,
+        "drift_share": drift_share,
+        "dataset_drift": bool(n_features and share_drifted_features >= drift_share),
+    }
+
+
+# Function for flattening a drift report into a per-column table
+@staticmethod
+def flatten_drift_report(json_report: dict) -> tuple:
+    """
+    Flatten a drift report (native, or Evidently's, where the columns sit among the metrics) into one row per
+    column (column, column_type, stattest, statistic, p_value, threshold, drift_detected, plus the sampling
+    distance and bounds if the report has a sampling section) and a summary of the scalar metrics.
+
+    Parameters:
+    json_report (dict): The drift report.
+
+    Returns:
+    tuple: (list of per-column rows, summary dictionary).
+
+    Raises:
+    HotelBookingException: If the report has an unknown layout.
+    """
+    try:
+        data_drift = json_report["data_drift"]
+        metrics = data_drift.get("data", data_drift)["metrics"]
+        columns = data_drift.get("columns")
+
+        if columns is None:
+            columns = {}
+            for column, result in metrics.items():
+                if not isinstance(result, dict):
+                    continue
+                stattest = result.get("stattest_name")
+                score_is_p_value = "p_value" in str(stattest)
+                columns[column] = {"column_type": result.get("feature_type"),
+                                   "stattest": stattest,
+                                   "statistic": None if score_is_p_value else result.get("drift_score"),
+                                   "p_value": result.get("drift_score") if score_is_p_value else None,
+                                   "threshold": result.get("stattest_threshold"),
+                                   "drift_detected": result.get("drift_detected")}
+            metrics = {name: value for name, value in metrics.items() if not isinstance(value, dict)}
+
+        sampling = json_report.get("sampling", {})
+        bounds = sampling.get("columns", {})
+        rows = []
+        for column, result in columns.items():
+            row = {"column": column, **result}
+            if column in bounds:
+                row.update({f"distance_{key}" if key != "distance" else key: value
+                            for key, value in bounds[column].items()})
+            rows.append(row)
+
+        summary = dict(metrics)
+        if sampling:
+            summary["sampling"] = {key: value for key, value in sampling.items() if key != "columns"}
+
+        return rows, summary
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in flatten_drift_report: {str(e)}", sys) from e
+
+
+# Function for detecting the drift of a dataset
+@staticmethod
+def detect_dataset_drift(reference_df: pd.DataFrame,
+                         current_df: pd.DataFrame,
+                         schema_config: dict,
+                         categorical_stattest: str = "chi2",
+                         stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                         psi_threshold: float = DRIFT_PSI_THRESHOLD,
+                         drift_share: float = DRIFT_SHARE,
+                         columns: Optional[dict] = None) -> dict:
+    """
+    Detect the drift of every schema.yaml labelled column and of the whole dataset.
+
+    Parameters:
+    reference_df (DataFrame): The reference dataset.
+    current_df (DataFrame): The current dataset.
+    schema_config (dict): The content of schema.yaml.
+    categorical_stattest (str): 'chi2' or 'psi' for categorical and boolean columns.
+    stattest_threshold (float): p-value below which a KS / chi-square test reports drift.
+    psi_threshold (float): PSI above which a column has drifted.
+    drift_share (float): Share of drifted columns from which the whole dataset has drifted.
+    columns (dict, optional): Column name -> column type to check, defaults to get_drift_columns.
+
+    Returns:
+    dict: {"data_drift": {"metrics": summary, "columns": per-column results}}.
+
+    Raises:
+    HotelBookingException: If an error occurs while detecting the drift.
+    """
+    try:
+        if categorical_stattest not in ("chi2", "psi"):
+            raise ValueError(f"Unknown categorical stattest '{categorical_stattest}', expected 'chi2' or 'psi'")
+
+        columns = columns if columns is not None else get_drift_columns(reference_df, current_df, schema_config)
+
+        column_results = {
+            column: detect_column_drift(reference_df[column], current_df[column], column_type,
+                                        categorical_stattest=categorical_stattest,
+                                        stattest_threshold=stattest_threshold,
+                                        psi_threshold=psi_threshold)
+            for column, column_type in columns.items()
+        }
+
+        return {"data_drift": {"metrics": summarize_drift(column_results, drift_share), "columns": column_results}}
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in detect_dataset_drift: {str(e)}", sys) from e
+
+
+# Function for detecting the drift of a dataset from per-column sketches
+@staticmethod
+def detect_dataset_drift_from_sketches(reference_sketches: dict,
+                                       current_sketches: dict,
+                                       columns: dict,
+                                       categorical_stattest: str = "chi2",
+                                       stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                                       psi_threshold: float = DRIFT_PSI_THRESHOLD,
+                                       drift_share: float = DRIFT_SHARE) -> dict:
+    """
+    Detect the drift of every column and of the whole dataset from the sketches built in one streaming pass
+    (see sketch_utils): KS test on the histograms of numerical columns, chi-square test or PSI on the
+    frequency tables of categorical and boolean columns.
+
+    Parameters:
+    reference_sketches (dict): Column name -> sketch of the reference sample.
+    current_sketches (dict): Column name -> sketch of the current sample.
+    columns (dict): Column name -> column type from schema.yaml.
+    categorical_stattest (str): 'chi2' or 'psi' for categorical and boolean columns.
+    stattest_threshold (float): p-value below which a KS / chi-square test reports drift.
+    psi_threshold (float): PSI above which a column has drifted.
+    drift_share (float): Share of drifted columns from which the whole dataset has drifted.
+
+    Returns:
+    dict: {"data_drift": {"metrics": summary, "columns": per-column results}}, as detect_dataset_drift.
+
+    Raises:
+    HotelBookingException: If an error occurs while detecting the drift.
+    """
+    try:
+        if categorical_stattest not in ("chi2", "psi"):
+            raise ValueError(f"Unknown categorical stattest '{categorical_stattest}', expected 'chi2' or 'psi'")
+
+        column_results = {}
+        for column, column_type in columns.items():
+            reference_sketch, current_sketch = reference_sketches[column], current_sketches[column]
+
+            if column_type == "numerical":
+                column_results[column] = drift_result(column_type, "ks",
+                                                      *ks_test_from_sketches(reference_sketch, current_sketch),
+                                                      stattest_threshold=stattest_threshold)
+            else:
+                column_results[column] = categorical_drift_result(column_type,
+                                                                  *counts_from_sketches(reference_sketch, current_sketch),
+                                                                  categorical_stattest=categorical_stattest,
+                                                                  stattest_threshold=stattest_threshold,
+                                                                  psi_threshold=psi_threshold)
+
+        return {"data_drift": {"metrics": summarize_drift(column_results, drift_share), "columns": column_results}}
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in detect_dataset_drift_from_sketches: {str(e)}", sys) from e
+
+
+# Shared memory arrays attached by a drift worker process: key -> (SharedMemory, ndarray view)
+_WORKER_ARRAYS: dict = {}
+
+
+def _attach_shared_arrays(specs: dict) -> None:
+    # Initializer of the drift worker processes: map the column matrices of the parent without copying them
+    for key, (name, shape, dtype) in specs.items():
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers attached blocks again, with the resource tracker the workers share with the
+            # parent: the registration is a no-op there and the parent still unlinks (and unregisters) the block
+            shm = shared_memory.SharedMemory(name=name)
+        _WORKER_ARRAYS[key] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf, order="F"))
+
+
+def _column_drift_worker(task: tuple) -> tuple:
+    # Drift test of one column, read from the shared column matrices
+    column, column_type, index, n_categories, options = task
+
+    if column_type == "numerical":
+        reference, current = _WORKER_ARRAYS["reference_numerical"][1], _WORKER_ARRAYS["current_numerical"][1]
+        return column, drift_result(column_type, "ks", *ks_test(reference[:, index], current[:, index]),
+                                    stattest_threshold=options["stattest_threshold"])
+
+    reference, current = _WORKER_ARRAYS["reference_codes"][1], _WORKER_ARRAYS["current_codes"][1]
+    return column, categorical_drift_result(column_type,
+                                            count_codes(reference[:, index], n_categories),
+                                            count_codes(current[:, index], n_categories),
+                                            **options)
+
+
+# Function for detecting the drift of a dataset with a process pool
+@staticmethod
+def detect_dataset_drift_parallel(reference_df: pd.DataFrame,
+                                  current_df: pd.DataFrame,
+                                  schema_config: dict,
+                                  n_jobs: Optional[int] = None,
+                                  categorical_stattest: str = "chi2",
+                                  stattest_threshold: float = DRIFT_STATTEST_THRESHOLD,
+                                  psi_threshold: float = DRIFT_PSI_THRESHOLD,
+                                  drift_share: float = DRIFT_SHARE,
+                                  columns: Optional[dict] = None) -> dict:
+    """
+    Same as detect_dataset_drift, with the column tests fanned out over a process pool. The columns are copied
+    once into shared memory matrices (numerical values as float64, categories as int32 codes) that the workers
+    map instead of receiving pickled copies. Every worker runs the same test functions on the same arrays as
+    the serial path, so the result matches it exactly.
+
+    Parameters:
+    reference_df (DataFrame): The reference dataset.
+    current_df (DataFrame): The current dataset.
+    schema_config (dict): The content of schema.yaml.
+    n_jobs (int, optional): Number of worker processes, None or <= 0 for one per CPU core.
+    categorical_stattest (str): 'chi2' or 'psi' for categorical and boolean columns.
+    stattest_threshold (float): p-value below which a KS / chi-square test reports drift.
+    psi_threshold (float): PSI above which a column has drifted.
+    drift_share (float): Share of drifted columns from which the whole dataset has drifted.
+    columns (dict, optional): Column name -> column type to check, defaults to get_drift_columns.
+
+    Returns:
+    dict: {"data_drift": {"metrics": summary, "columns": per-column results}}.
+
+    Raises:
+    HotelBookingException: If an error occurs while detecting the drift.
+    """
+    blocks = []
+    try:
+        if categorical_stattest not in ("chi2", "psi"):
+            raise ValueError(f"Unknown categorical stattest '{categorical_stattest}', expected 'chi2' or 'psi'")
+
+        columns = columns if columns is not None else get_drift_columns(reference_df, current_df, schema_config)
+        n_jobs = n_jobs if n_jobs and n_jobs > 0 else os.cpu_count()
+
+        numerical_columns = [column for column, column_type in columns.items() if column_type == "numerical"]
+        categorical_columns = [column for column, column_type in columns.items() if column_type != "numerical"]
+
+        # One column-major (Fortran order) matrix per sample and kind, so every column is a contiguous slice
+        specs, arrays = {}, {}
+        for key, n_rows, n_columns, dtype in (("reference_numerical", len(reference_df), len(numerical_columns), np.float64),
+                                              ("current_numerical", len(current_df), len(numerical_columns), np.float64),
+                                              ("reference_codes", len(reference_df), len(categorical_columns), np.int32),
+                                              ("current_codes", len(current_df), len(categorical_columns), np.int32)):
+            shape = (n_rows, n_columns)
+            shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+            blocks.append(shm)
+            specs[key] = (shm.name, shape, np.dtype(dtype).str)
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order="F")
+
+        options = {"categorical_stattest": categorical_stattest,
+                   "stattest_threshold": stattest_threshold,
+                   "psi_threshold": psi_threshold}
+        tasks = []
+
+        for index, column in enumerate(numerical_columns):
+            arrays["reference_numerical"][:, index] = pd.to_numeric(reference_df[column]).to_numpy(dtype=float)
+            arrays["current_numerical"][:, index] = pd.to_numeric(current_df[column]).to_numpy(dtype=float)
+            tasks.append((column, "numerical", index, 0, {"stattest_threshold": stattest_threshold}))
+
+        for index, column in enumerate(categorical_columns):
+            reference_codes, current_codes, n_categories = encode_categories(reference_df[column], current_df[column])
+            arrays["reference_codes"][:, index] = reference_codes
+            arrays["current_codes"][:, index] = current_codes
+            tasks.append((column, columns[column], index, n_categories, options))
+
+        with ProcessPoolExecutor(max_workers=min(n_jobs, max(len(tasks), 1)),
+                                 initializer=_attach_shared_arrays, initargs=(specs,)) as executor:
+            results = dict(executor.map(_column_drift_worker, tasks))
+
+        column_results = {column: results[column] for column in columns}
+        return {"data_drift": {"metrics": summarize_drift(column_results, drift_share), "columns": column_results}}
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in detect_dataset_drift_parallel: {str(e)}", sys) from e
+
+    finally:
+        arrays = None
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
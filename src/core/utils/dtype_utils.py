@@ -0,0 +1,144 @@
+# This script provides utility methods for applying the compact, schema.yaml driven dtypes to DataFrames.
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.core.logger import logging
+from src.core.exception import HotelBookingException
+
+from src.core.constants.data_constant import CATEGORY_MAX_UNIQUE_RATIO
+
+
+
+# Function for getting the memory usage of a DataFrame
+@staticmethod
+def get_memory_usage(dataframe: pd.DataFrame) -> float:
+    """
+    Return the deep memory usage of the DataFrame in megabytes.
+
+    Parameters:
+    dataframe (DataFrame): The DataFrame to measure.
+
+    Returns:
+    float: Memory usage in MB (including the content of object columns).
+    """
+    try:
+        return dataframe.memory_usage(deep=True).sum() / 2**20
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in get_memory_usage: {str(e)}", sys) from e
+
+
+# Function for converting a single column to its compact dtype
+@staticmethod
+def to_compact_dtype(series: pd.Series, column_type: str, max_category_ratio: float = CATEGORY_MAX_UNIQUE_RATIO) -> pd.Series:
+    """
+    Convert a Series to the most compact dtype matching its schema.yaml type.
+
+    - categorical: 'category' for low-cardinality string columns
+    - numerical:   smallest fitting integer width for integral columns without missing values
+    - boolean:     'bool' for 0/1 flags without missing values
+    - datetime:    'datetime64[ns]'
+
+    Parameters:
+    series (Series): The column to convert.
+    column_type (str): The column type from schema.yaml (numerical, categorical, boolean, datetime).
+    max_category_ratio (float): Maximum share of unique values for a string column to become 'category'.
+
+    Returns:
+    Series: The converted column (unchanged if the type does not apply).
+    """
+    try:
+        if column_type == "categorical":
+            if (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) \
+                    and series.nunique(dropna=True) <= max_category_ratio * max(len(series), 1):
+                return series.astype("category")
+
+        elif column_type == "numerical":
+            if pd.api.types.is_bool_dtype(series) or series.hasnans:
+                return series
+            if pd.api.types.is_integer_dtype(series) \
+                    or (pd.api.types.is_float_dtype(series) and np.array_equal(series, np.round(series))):
+                return pd.to_numeric(series, downcast="integer")
+
+        elif column_type == "boolean":
+            if not series.hasnans and series.isin([0, 1]).all():
+                return series.astype(bool)
+
+        elif column_type == "datetime":
+            return pd.to_datetime(series, errors="coerce")
+
+        return series
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in to_compact_dtype for column {series.name}: {str(e)}", sys) from e
+
+
+# Function for applying the schema.yaml column types to a DataFrame
+@staticmethod
+def apply_schema_dtypes(dataframe: pd.DataFrame, schema_config: dict, stage: str = "") -> pd.DataFrame:
+    """
+    Apply compact dtypes to every DataFrame column labelled in the 'features' section of schema.yaml
+    and log the memory saved.
+
+    Parameters:
+    dataframe (DataFrame): The DataFrame to convert.
+    schema_config (dict): The content of schema.yaml.
+    stage (str): Name of the pipeline stage, used in the memory report.
+
+    Returns:
+    DataFrame: The DataFrame with compact dtypes.
+    """
+    try:
+        memory_before = get_memory_usage(dataframe)
+
+        features = schema_config.get("features", {})
+        converted_columns = {
+            column: to_compact_dtype(dataframe[column], features[column].get("type"))
+            for column in dataframe.columns if column in features
+        }
+        dataframe = dataframe.assign(**converted_columns)
+
+        memory_after = get_memory_usage(dataframe)
+        saved = memory_before - memory_after
+        logging.info(f"[{stage or 'dtypes'}] Compact dtypes applied: {memory_before:.2f} MB -> {memory_after:.2f} MB "
+                     f"(saved {saved:.2f} MB, {100 * saved / max(memory_before, 1e-9):.1f}%)")
+
+        return dataframe
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in apply_schema_dtypes: {str(e)}", sys) from e
+
+
+# Function for giving every chunk of a streamed table the same dtypes
+@staticmethod
+def coerce_stable_dtypes(dataframe: pd.DataFrame, schema_config: dict) -> pd.DataFrame:
+    """
+    Convert the schema.yaml labelled columns to dtypes that do not depend on the values of a chunk
+    (numerical/boolean -> float64, datetime -> datetime64[ns]), so that the chunks of one table share a
+    single schema when they are written to a columnar file. Compact dtypes are applied when the file is read.
+
+    Parameters:
+    dataframe (DataFrame): The chunk to convert.
+    schema_config (dict): The content of schema.yaml.
+
+    Returns:
+    DataFrame: The chunk with stable dtypes.
+    """
+    try:
+        features = schema_config.get("features", {})
+        converted_columns = {}
+
+        for column in dataframe.columns:
+            column_type = features.get(column, {}).get("type")
+            if column_type in ("numerical", "boolean"):
+                converted_columns[column] = pd.to_numeric(dataframe[column], errors="coerce").astype("float64")
+            elif column_type == "datetime":
+                converted_columns[column] = pd.to_datetime(dataframe[column], errors="coerce")
+
+        return dataframe.assign(**converted_columns)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in coerce_stable_dtypes: {str(e)}", sys) from e
@@ -0,0 +1,95 @@
+# This script provides vectorised categorical encoders driven by precomputed category lookup tables.
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.core.exception import HotelBookingException
+
+
+
+# Function for encoding values as the codes of a fixed vocabulary
+@staticmethod
+def encode_codes(values: pd.Series, categories: list) -> np.ndarray:
+    """
+    Return the position of every value in the vocabulary (-1 for missing or unknown values). Only the distinct
+    values are looked up in the vocabulary, the rows are then recoded with a take on their codes (the codes of
+    the compact 'category' dtype, or of pd.factorize for other columns).
+
+    Parameters:
+    values (Series): The column to encode.
+    categories (list): The vocabulary, in code order.
+
+    Returns:
+    ndarray: The codes, as int64.
+    """
+    try:
+        vocabulary = pd.Index(categories)
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            row_codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            row_codes, uniques = pd.factorize(values)
+
+        # Code -1 (missing) takes the -1 appended at the end of the recoding table
+        recode = np.append(vocabulary.get_indexer(uniques), -1)
+        return recode.take(row_codes).astype(np.int64)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in encode_codes for column {values.name}: {str(e)}", sys) from e
+
+
+# Function for label encoding a column with a lookup table
+@staticmethod
+def label_encode(values: pd.Series, mapping: dict) -> pd.Series:
+    """
+    Replace every value by its code in mapping (category -> code), through a take on the lookup table of
+    the codes. Missing and unknown values become NaN (the column is then float).
+
+    Parameters:
+    values (Series): The column to encode.
+    mapping (dict): The label mapping, category -> integer code.
+
+    Returns:
+    Series: The encoded column, with the index of values.
+    """
+    try:
+        codes = encode_codes(values, list(mapping))
+        table = np.fromiter(mapping.values(), dtype=np.int64, count=len(mapping))
+
+        if (codes < 0).any():
+            # Code -1 takes the NaN appended at the end of the table
+            table = np.append(table.astype(float), np.nan)
+
+        return pd.Series(table.take(codes), index=values.index, name=values.name)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in label_encode for column {values.name}: {str(e)}", sys) from e
+
+
+# Function for one-hot encoding a column with a fixed vocabulary
+@staticmethod
+def onehot_encode(values: pd.Series, categories: list, drop_first: bool = True) -> np.ndarray:
+    """
+    One-hot encode a column over a fixed vocabulary: the indicator rows are taken from an identity table
+    (with an all-zero last row for missing and unknown values), so the layout never depends on the data.
+
+    Parameters:
+    values (Series): The column to encode.
+    categories (list): The vocabulary, in column order.
+    drop_first (bool): Drop the indicator column of the first category.
+
+    Returns:
+    ndarray: Boolean (n_rows, n_categories) array, minus the first column when drop_first.
+    """
+    try:
+        codes = encode_codes(values, categories)
+        table = np.vstack([np.eye(len(categories), dtype=bool), np.zeros((1, len(categories)), dtype=bool)])
+        if drop_first:
+            table = table[:, 1:]
+
+        return table.take(codes, axis=0)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in onehot_encode for column {values.name}: {str(e)}", sys) from e
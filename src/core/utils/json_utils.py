@@ -64,3 +64,32 @@ def write_json(file_path: str, data, replace: bool = False) -> None:
     
     except Exception as e:
         raise HotelBookingException(e, sys) from e
+
+
+# Function to write JSON Lines file to provided path
+@staticmethod
+def write_jsonl(file_path: str, records: list, replace: bool = False) -> None:
+    """
+    Write a list of flat dictionaries to a JSON Lines file (one JSON object per line).
+    
+    Parameters:
+    file_path (str): The path to the JSON Lines file to be written.
+    records (list): The dictionaries to be written, one per line.
+    replace (bool, optional): If True, overwrite the file if it already exists. Defaults to False.
+    
+    Raises:
+    HotelBookingException: If an error occurs while writing the JSON Lines file.
+    """
+    try:
+        if replace:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+        with open(file_path, "w") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+    
+    except Exception as e:
+        raise HotelBookingException(e, sys) from e
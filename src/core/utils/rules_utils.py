@@ -0,0 +1,317 @@
+# This script provides the schema.yaml driven data quality rules engine of the data validation stage.
+
+import sys
+
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+from src.core.exception import HotelBookingException
+
+from src.core.constants.data_constant import (DATA_VALIDATION_NULL_TOKENS,
+                                              DATA_VALIDATION_RULE_SAMPLES)
+
+
+
+# Rules of a column, with their defaults
+RULE_DEFAULTS: dict = {"dtype": None, "min": None, "max": None, "allowed": None,
+                       "nullable": False, "unique": False, "required": True}
+
+# Column types a dtype rule can check
+RULE_DTYPES: tuple = ("numerical", "categorical", "boolean", "datetime")
+
+# Actions of a noise rule
+NOISE_RULE_ACTIONS: tuple = ("drop", "replace_median")
+
+
+
+# Function for compiling the validation rules of schema.yaml
+@staticmethod
+def compile_validation_rules(schema_config: dict) -> dict:
+    """
+    Build the full rule set of every column: the type of each non-sensitive feature is its dtype rule, and
+    the entries of the validation_rules section override the defaults (required, not nullable, not unique).
+    The drop_columns are never exported by data ingestion, so they are not required (their rules still apply
+    when a column is present, e.g. the watermark column of incremental ingestion).
+
+    Parameters:
+    schema_config (dict): The content of schema.yaml.
+
+    Returns:
+    dict: Column name -> rules dictionary (see RULE_DEFAULTS).
+
+    Raises:
+    HotelBookingException: If a rule is unknown or has an invalid value.
+    """
+    try:
+        sensitive_columns = set(schema_config.get("sensitive_columns", []))
+        drop_columns = set(schema_config.get("drop_columns", []))
+        validation_rules = schema_config.get("validation_rules") or {}
+
+        rules = {column: {**RULE_DEFAULTS, "dtype": feature.get("type"), "required": column not in drop_columns}
+                 for column, feature in schema_config.get("features", {}).items() if column not in sensitive_columns}
+
+        for column, column_rules in validation_rules.items():
+            unknown_rules = set(column_rules) - set(RULE_DEFAULTS)
+            if unknown_rules:
+                raise ValueError(f"Unknown validation rules {sorted(unknown_rules)} for column '{column}'")
+            rules[column] = {**rules.get(column, RULE_DEFAULTS), **column_rules}
+
+        for column, column_rules in rules.items():
+            if column_rules["dtype"] not in RULE_DTYPES + (None,):
+                raise ValueError(f"Unknown dtype '{column_rules['dtype']}' for column '{column}'")
+
+        return rules
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in compile_validation_rules: {str(e)}", sys) from e
+
+
+# Function for normalising the values compared with an allowed rule
+@staticmethod
+def category_keys(values: pd.Series) -> pd.Series:
+    """
+    Key the values by their string value, numbers without a fractional part as integers, so the allowed
+    categories of schema.yaml match whatever dtype the column was read with (True, 1, 1.0 and '1' are all '1').
+    """
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        numbers = values.astype(float)
+        is_integer = np.isfinite(numbers) & (numbers == np.round(numbers))
+        keys = numbers.astype(str)
+        keys[is_integer] = numbers[is_integer].astype(np.int64).astype(str)
+        return keys
+    return values.astype(str)
+
+
+# Function for finding the strings read as missing values
+@staticmethod
+def is_null_token_value(values: pd.Series) -> pd.Series:
+    """
+    Return True for the values that are one of DATA_VALIDATION_NULL_TOKENS (e.g. 'nan' or 'NULL' written
+    as text by the source database), compared case-insensitively.
+    """
+    return values.astype(str).str.strip().str.lower().isin(DATA_VALIDATION_NULL_TOKENS)
+
+
+# Class for checking the data quality rules over the chunks of a dataset
+class ValidationRules:
+    """
+    Evaluates the data quality rules of every column, one vectorised pass per chunk: the violations of each
+    (column, rule) are counted and the first row positions are kept as samples. Missing columns are
+    reported by check_columns. Uniqueness is checked across chunks (the values seen are kept).
+    """
+
+    def __init__(self, rules: dict, max_samples: int = DATA_VALIDATION_RULE_SAMPLES):
+        self.rules = rules
+        self.max_samples = max_samples
+        self.n_rows = 0
+        self.missing_columns = []
+        self.violations = {}                    # (column, rule) -> violation count
+        self.samples = {}                       # (column, rule) -> first violating row positions
+        self._seen_values = {}                  # column -> values seen so far, for the unique rule
+
+
+    def _add_violations(self, column: str, rule: str, mask: np.ndarray, start_row: int) -> None:
+        count = int(mask.sum())
+        if count == 0:
+            return
+        key = (column, rule)
+        self.violations[key] = self.violations.get(key, 0) + count
+        samples = self.samples.setdefault(key, [])
+        if len(samples) < self.max_samples:
+            samples.extend((np.flatnonzero(mask)[:self.max_samples - len(samples)] + start_row).tolist())
+
+
+    def check_columns(self, columns: Iterable[str]) -> list:
+        """
+        Check that every required column is present.
+
+        Parameters:
+        columns (Iterable[str]): The columns of the dataset.
+
+        Returns:
+        list: The missing required columns.
+        """
+        columns = set(columns)
+        self.missing_columns = [column for column, column_rules in self.rules.items()
+                                if column_rules["required"] and column not in columns]
+        return self.missing_columns
+
+
+    def update(self, chunk: pd.DataFrame, start_row: int = 0) -> "ValidationRules":
+        """
+        Evaluate every rule on one chunk.
+
+        Parameters:
+        chunk (DataFrame): The rows of the chunk.
+        start_row (int): Position of the first row of the chunk in the dataset.
+
+        Returns:
+        ValidationRules: The rules engine itself.
+        """
+        try:
+            for column, column_rules in self.rules.items():
+                if column not in chunk.columns:
+                    continue
+
+                values = chunk[column]
+                missing = values.isna().to_numpy().copy()
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    is_null_token = is_null_token_value(values.cat.categories.to_series()).to_numpy()
+                    codes = values.cat.codes.to_numpy()
+                    missing |= (codes >= 0) & is_null_token[np.maximum(codes, 0)]
+                elif values.dtype == object:
+                    missing |= is_null_token_value(values).to_numpy()
+                present = ~missing
+
+                if not column_rules["nullable"]:
+                    self._add_violations(column, "nullable", missing, start_row)
+
+                dtype = column_rules["dtype"]
+                numbers = None
+                if dtype in ("numerical", "boolean") or column_rules["min"] is not None or column_rules["max"] is not None:
+                    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+                        numbers = values.to_numpy(dtype=float, na_value=np.nan)
+                    else:
+                        numbers = pd.to_numeric(values.astype(object).where(present), errors="coerce").to_numpy(dtype=float)
+                    not_numeric = present & np.isnan(numbers)
+                    if dtype == "boolean":
+                        not_numeric |= present & ~np.isin(numbers, (0.0, 1.0))
+                    if dtype in ("numerical", "boolean"):
+                        self._add_violations(column, "dtype", not_numeric, start_row)
+
+                elif dtype == "datetime" and not pd.api.types.is_datetime64_any_dtype(values):
+                    dates = pd.to_datetime(values.where(present), errors="coerce")
+                    self._add_violations(column, "dtype", present & dates.isna().to_numpy(), start_row)
+
+                with np.errstate(invalid="ignore"):
+                    if column_rules["min"] is not None:
+                        self._add_violations(column, "min", numbers < column_rules["min"], start_row)
+                    if column_rules["max"] is not None:
+                        self._add_violations(column, "max", numbers > column_rules["max"], start_row)
+
+                if column_rules["allowed"] is not None:
+                    allowed = category_keys(pd.Series(column_rules["allowed"]))
+                    if isinstance(values.dtype, pd.CategoricalDtype):
+                        # Only the categories are keyed, the rows are compared through their codes
+                        is_allowed = category_keys(values.cat.categories.to_series()).isin(allowed).to_numpy()
+                        codes = values.cat.codes.to_numpy()
+                        not_allowed = present & ~is_allowed[np.maximum(codes, 0)]
+                    else:
+                        not_allowed = present & ~category_keys(values).isin(allowed).to_numpy()
+                    self._add_violations(column, "allowed", not_allowed, start_row)
+
+                if column_rules["unique"]:
+                    present_values = values[present]
+                    seen = self._seen_values.get(column, pd.Index([]))
+                    duplicated = present_values.duplicated().to_numpy() | present_values.isin(seen).to_numpy()
+                    mask = np.zeros(len(values), dtype=bool)
+                    mask[np.flatnonzero(present)[duplicated]] = True
+                    self._add_violations(column, "unique", mask, start_row)
+                    self._seen_values[column] = seen.append(pd.Index(present_values.unique()))
+
+            self.n_rows += len(chunk)
+            return self
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in ValidationRules.update: {str(e)}", sys) from e
+
+
+    @property
+    def status(self) -> bool:
+        return not self.missing_columns and not self.violations
+
+
+    def report(self) -> dict:
+        """
+        Return the data quality report: rows checked, missing columns and, per violated rule, the number of
+        violations and the first violating row positions.
+        """
+        return {
+            "status": self.status,
+            "n_rows": self.n_rows,
+            "missing_columns": self.missing_columns,
+            "violations": [{"column": column, "rule": rule, "value": self.rules[column][rule],
+                            "count": count, "sample_rows": self.samples[(column, rule)]}
+                           for (column, rule), count in self.violations.items()],
+        }
+
+
+
+# Function for compiling the noise rules of schema.yaml
+@staticmethod
+def compile_noise_rules(schema_config: dict) -> dict:
+    """
+    Read the noise_rules section: every rule has a condition (a DataFrame.eval expression on the columns)
+    and an action, 'drop' (remove the matching rows) or 'replace_median' (replace the matching values of
+    its column, the rule name unless a column is given, with the median of the other values).
+
+    Parameters:
+    schema_config (dict): The content of schema.yaml.
+
+    Returns:
+    dict: Rule name -> {"column", "condition", "action"}, in schema order.
+
+    Raises:
+    HotelBookingException: If a rule has no condition or an unknown action.
+    """
+    try:
+        rules = {}
+        for name, rule in (schema_config.get("noise_rules") or {}).items():
+            if not rule.get("condition"):
+                raise ValueError(f"Noise rule '{name}' has no condition")
+            if rule.get("action") not in NOISE_RULE_ACTIONS:
+                raise ValueError(f"Unknown action '{rule.get('action')}' of noise rule '{name}', expected one of {NOISE_RULE_ACTIONS}")
+            rules[name] = {"column": rule.get("column", name), "condition": str(rule["condition"]), "action": rule["action"]}
+
+        return rules
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in compile_noise_rules: {str(e)}", sys) from e
+
+
+# Function for choosing the engine of DataFrame.eval
+@staticmethod
+def resolve_eval_engine(engine: str) -> str:
+    """
+    Return engine, or 'python' when it is 'numexpr' and numexpr is not installed.
+    """
+    if engine == "numexpr":
+        try:
+            import numexpr  # noqa: F401
+        except ImportError:
+            return "python"
+    return engine
+
+
+# Function for evaluating the noise rules on a DataFrame
+@staticmethod
+def evaluate_noise_rules(dataframe: pd.DataFrame, rules: dict, engine: str = "python") -> tuple:
+    """
+    Evaluate the condition of every noise rule, and OR the conditions of the drop rules into one row mask
+    (in place, so only one mask is allocated for all of them).
+
+    Parameters:
+    dataframe (DataFrame): The data to check.
+    rules (dict): The compiled noise rules (see compile_noise_rules).
+    engine (str): Engine of DataFrame.eval, 'numexpr' or 'python'.
+
+    Returns:
+    tuple: The rule name -> boolean match array of every rule, and the combined drop mask.
+
+    Raises:
+    HotelBookingException: If a condition cannot be evaluated.
+    """
+    try:
+        masks = {}
+        drop_mask = np.zeros(len(dataframe), dtype=bool)
+
+        for name, rule in rules.items():
+            masks[name] = np.asarray(dataframe.eval(rule["condition"], engine=engine), dtype=bool)
+            if rule["action"] == "drop":
+                np.logical_or(drop_mask, masks[name], out=drop_mask)
+
+        return masks, drop_mask
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in evaluate_noise_rules: {str(e)}", sys) from e
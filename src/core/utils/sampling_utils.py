@@ -0,0 +1,221 @@
+# This script provides utility methods for drawing uniform (or stratified) samples in one streaming pass,
+# and for the error bounds of distribution distances measured on such samples.
+
+import sys
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from src.core.exception import HotelBookingException
+from src.core.utils.drift_utils import (count_codes,
+                                        encode_categories,
+                                        ks_test)
+
+
+
+# Function for the sample size that bounds the CDF error of a sample
+@staticmethod
+def dkw_sample_size(confidence: float, tolerance: float) -> int:
+    """
+    Smallest sample size for which the empirical CDF of a uniform sample is within tolerance of the
+    population CDF everywhere, with the given confidence (Dvoretzky-Kiefer-Wolfowitz inequality):
+    n = ln(2 / alpha) / (2 * tolerance^2), alpha = 1 - confidence.
+
+    Parameters:
+    confidence (float): Confidence level, e.g. 0.95.
+    tolerance (float): Largest CDF error, e.g. 0.01.
+
+    Returns:
+    int: The sample size.
+    """
+    if not (0 < confidence < 1 and tolerance > 0):
+        raise ValueError("confidence must be in (0, 1) and tolerance positive")
+    return int(np.ceil(np.log(2 / (1 - confidence)) / (2 * tolerance ** 2)))
+
+
+# Function for the CDF error bound of a sample
+@staticmethod
+def dkw_epsilon(sample_size: int, confidence: float) -> float:
+    """
+    Largest CDF error of a uniform sample of the given size, with the given confidence (DKW inequality).
+    """
+    return float(np.sqrt(np.log(2 / (1 - confidence)) / (2 * max(sample_size, 1))))
+
+
+# Function for the frequency error bound of a sample
+@staticmethod
+def frequency_epsilon(sample_size: int, n_categories: int, confidence: float) -> float:
+    """
+    Largest total variation error of the category frequencies of a uniform sample of the given size, with
+    the given confidence (Bretagnolle-Huber-Carol inequality: P(L1 error >= l) <= 2^k exp(-n l^2 / 2)).
+    """
+    l1_error = np.sqrt(2 * (n_categories * np.log(2) + np.log(1 / (1 - confidence))) / max(sample_size, 1))
+    return float(min(l1_error / 2, 1.0))
+
+
+# Class for drawing a sample in one streaming pass
+class BottomKSampler:
+    """
+    Uniform sample of fixed size over the chunks of a dataset (bottom-k sampling: every row gets a uniform
+    random key and the rows of the sample_size smallest keys are kept, like a reservoir). Once the sample is
+    full only the rows with a key below the current largest one are added, so most rows of a chunk are
+    dropped without being copied.
+
+    With a strata column, the sample_size smallest keys of every stratum are kept, and sample() allocates the
+    sample to the strata in proportion to their row counts.
+    """
+
+    def __init__(self, sample_size: int, seed: Optional[int] = None, strata_column: Optional[str] = None):
+        self.sample_size = sample_size
+        self.strata_column = strata_column
+        self.rng = np.random.default_rng(seed)
+        self.n_rows = 0
+        self.stratum_counts = pd.Series(dtype=np.int64)
+        self._rows = None
+        self._keys = np.zeros(0)
+
+
+    def _strata(self, rows: pd.DataFrame) -> np.ndarray:
+        return rows[self.strata_column].astype(str).to_numpy()
+
+
+    def update(self, chunk: pd.DataFrame) -> "BottomKSampler":
+        """
+        Add the rows of one chunk to the sample.
+
+        Parameters:
+        chunk (DataFrame): The rows of the chunk.
+
+        Returns:
+        BottomKSampler: The sampler itself.
+        """
+        try:
+            keys = self.rng.random(len(chunk))
+            self.n_rows += len(chunk)
+
+            if self.strata_column is None:
+                if len(self._keys) >= self.sample_size:
+                    candidates = keys < self._keys.max()
+                    chunk, keys = chunk[candidates], keys[candidates]
+            else:
+                strata = self._strata(chunk)
+                self.stratum_counts = self.stratum_counts.add(pd.Series(strata).value_counts(), fill_value=0).astype(np.int64)
+                if self._rows is not None:
+                    # Largest kept key of every full stratum, rows of a stratum with room are always candidates
+                    kept = pd.DataFrame({"stratum": self._strata(self._rows), "key": self._keys}).groupby("stratum")["key"]
+                    thresholds = kept.max().where(kept.size() >= self.sample_size, np.inf)
+                    candidates = keys < pd.Series(strata).map(thresholds).fillna(np.inf).to_numpy()
+                    chunk, keys = chunk[candidates], keys[candidates]
+
+            if len(chunk) == 0:
+                return self
+
+            rows = chunk if self._rows is None else pd.concat([self._rows, chunk], ignore_index=True)
+            keys = np.concatenate([self._keys, keys])
+
+            if self.strata_column is None:
+                keep = np.argpartition(keys, self.sample_size)[:self.sample_size] if len(keys) > self.sample_size else np.arange(len(keys))
+            else:
+                keep = self._smallest_keys_per_stratum(self._strata(rows), keys, self.sample_size)
+
+            self._rows, self._keys = rows.iloc[keep].reset_index(drop=True), keys[keep]
+            return self
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in BottomKSampler.update: {str(e)}", sys) from e
+
+
+    @staticmethod
+    def _smallest_keys_per_stratum(strata: np.ndarray, keys: np.ndarray, sizes) -> np.ndarray:
+        # Positions of the smallest keys of every stratum, sizes is one size or a stratum -> size mapping
+        order = np.lexsort((keys, strata))
+        sorted_strata = strata[order]
+        starts = np.flatnonzero(np.r_[True, sorted_strata[1:] != sorted_strata[:-1]])
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        limit = np.full(len(order), sizes) if np.isscalar(sizes) else pd.Series(sorted_strata).map(sizes).fillna(0).to_numpy()
+        return order[rank < limit]
+
+
+    def sample(self) -> pd.DataFrame:
+        """
+        Return the sample (proportionally allocated to the strata, if any).
+        """
+        try:
+            if self._rows is None:
+                return pd.DataFrame()
+            if self.strata_column is None:
+                return self._rows
+
+            # Largest remainder allocation of min(sample_size, n_rows) rows in proportion to the stratum counts
+            n_sample = min(self.sample_size, self.n_rows)
+            quotas = self.stratum_counts * n_sample / self.n_rows
+            sizes = np.floor(quotas).astype(np.int64)
+            remainders = (quotas - sizes).sort_values(ascending=False)
+            sizes[remainders.index[:n_sample - int(sizes.sum())]] += 1
+
+            keep = self._smallest_keys_per_stratum(self._strata(self._rows), self._keys, sizes)
+            return self._rows.iloc[np.sort(keep)].reset_index(drop=True)
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in BottomKSampler.sample: {str(e)}", sys) from e
+
+
+
+# Function for the distances between two samples and their error bounds
+@staticmethod
+def sample_distance_bounds(reference_df: pd.DataFrame,
+                           current_df: pd.DataFrame,
+                           columns: dict,
+                           confidence: float) -> dict:
+    """
+    Distance between the reference and current distributions of every column, measured on the samples, with
+    the interval that holds the distance of the full populations at the given confidence: the KS distance
+    (largest CDF difference, DKW bound) for numerical columns, the total variation distance of the category
+    frequencies (Bretagnolle-Huber-Carol bound) for categorical and boolean columns. The confidence is
+    split evenly between the two samples.
+
+    Parameters:
+    reference_df (DataFrame): The reference sample.
+    current_df (DataFrame): The current sample.
+    columns (dict): Column name -> column type to measure.
+    confidence (float): Confidence level of the intervals.
+
+    Returns:
+    dict: Column name -> {"metric", "distance", "lower", "upper"}.
+
+    Raises:
+    HotelBookingException: If an error occurs while measuring the distances.
+    """
+    try:
+        sample_confidence = 1 - (1 - confidence) / 2
+        bounds = {}
+
+        for column, column_type in columns.items():
+            reference, current = reference_df[column], current_df[column]
+
+            if column_type == "numerical":
+                reference = pd.to_numeric(reference).to_numpy(dtype=float)
+                current = pd.to_numeric(current).to_numpy(dtype=float)
+                metric, distance = "ks", ks_test(reference, current)[0]
+                error = (dkw_epsilon(int(np.isfinite(reference).sum()), sample_confidence)
+                         + dkw_epsilon(int(np.isfinite(current).sum()), sample_confidence))
+            else:
+                reference_codes, current_codes, n_categories = encode_categories(reference, current)
+                reference_counts = count_codes(reference_codes, n_categories)
+                current_counts = count_codes(current_codes, n_categories)
+                metric = "total_variation"
+                distance = 0.5 * float(np.abs(reference_counts / max(reference_counts.sum(), 1)
+                                              - current_counts / max(current_counts.sum(), 1)).sum())
+                error = (frequency_epsilon(int(reference_counts.sum()), n_categories, sample_confidence)
+                         + frequency_epsilon(int(current_counts.sum()), n_categories, sample_confidence))
+
+            bounds[column] = {"metric": metric,
+                              "distance": float(distance),
+                              "lower": float(max(distance - error, 0.0)),
+                              "upper": float(min(distance + error, 1.0))}
+
+        return bounds
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in sample_distance_bounds: {str(e)}", sys) from e
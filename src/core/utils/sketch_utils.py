@@ -0,0 +1,425 @@
+# This script provides mergeable per-column sketches (histograms and frequency tables) for streaming drift detection.
+
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from src.core.exception import HotelBookingException
+
+from src.core.constants.data_constant import DATA_VALIDATION_SKETCH_BINS
+
+
+
+# Class for sketching a numerical column
+class NumericSketch:
+    """
+    Fixed-width histogram of a numerical column, built in one pass over the chunks of a dataset.
+
+    Bins are aligned on a grid of power-of-two widths (bin i holds [i * width, (i + 1) * width)), so two
+    sketches of the same column can always be merged. When the values span more than max_bins bins, the
+    width is doubled (neighbouring bins merged), which keeps the memory bounded by max_bins whatever the
+    number of rows. Missing values are counted apart.
+    """
+
+    # Smallest first-chunk range, relative to the magnitude of the values (a constant first chunk has no range)
+    MIN_RELATIVE_RANGE: float = 2.0 ** -20
+
+    # Largest grid index, so indices stay exact in float64 and never overflow int64
+    MAX_GRID_INDEX: float = 2.0 ** 52
+
+    def __init__(self, max_bins: int = DATA_VALIDATION_SKETCH_BINS):
+        self.max_bins = max_bins
+        self.width = None                       # bin width, a power of two
+        self.offset = 0                         # grid index of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.n_missing = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sum = 0.0
+
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+
+    def _coarsen(self, width: float) -> None:
+        # Merge neighbouring bins until the bins are `width` wide
+        while self.width < width:
+            first, last = self.offset // 2, (self.offset + len(self.counts) - 1) // 2
+            counts = np.zeros(last - first + 1, dtype=np.int64)
+            np.add.at(counts, (np.arange(self.offset, self.offset + len(self.counts)) // 2) - first, self.counts)
+            self.offset, self.counts, self.width = first, counts, self.width * 2
+
+
+    def _add_counts(self, offset: int, counts: np.ndarray) -> None:
+        # Add counts (on the same grid) starting at grid index offset, widening the histogram if needed
+        if len(self.counts) == 0:
+            self.offset, self.counts = offset, counts.astype(np.int64)
+            return
+
+        first = min(self.offset, offset)
+        last = max(self.offset + len(self.counts), offset + len(counts))
+        merged = np.zeros(last - first, dtype=np.int64)
+        merged[self.offset - first: self.offset - first + len(self.counts)] += self.counts
+        merged[offset - first: offset - first + len(counts)] += counts
+        self.offset, self.counts = first, merged
+
+
+    def _fit_bins(self) -> None:
+        # Keep at most max_bins bins
+        while len(self.counts) > self.max_bins:
+            self._coarsen(self.width * 2)
+
+
+    def update(self, values) -> "NumericSketch":
+        """
+        Add the values of one chunk to the sketch.
+
+        Parameters:
+        values (array-like): Numerical values of the chunk (NaN for missing values).
+
+        Returns:
+        NumericSketch: The sketch itself.
+        """
+        try:
+            values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+            missing = np.isnan(values)
+            self.n_missing += int(missing.sum())
+            values = values[~missing]
+            if len(values) == 0:
+                return self
+
+            self.min, self.max = min(self.min, values.min()), max(self.max, values.max())
+            self.sum += float(values.sum())
+
+            magnitude = max(abs(self.min), abs(self.max))
+            if self.width is None:
+                # Smallest power-of-two width that spans the first chunk with max_bins bins, the range is
+                # floored relative to the magnitude of the values for a constant or near-constant chunk
+                value_range = max(self.max - self.min, max(magnitude, 1.0) * self.MIN_RELATIVE_RANGE)
+                self.width = float(2.0 ** np.ceil(np.log2(value_range / self.max_bins)))
+
+            # Coarsen up front when the new values widen the range beyond max_bins bins (or their grid
+            # indices beyond MAX_GRID_INDEX)
+            while (np.floor(self.max / self.width) - np.floor(self.min / self.width) + 1 > self.max_bins
+                   or magnitude / self.width > self.MAX_GRID_INDEX):
+                if len(self.counts):
+                    self._coarsen(self.width * 2)
+                else:
+                    self.width *= 2
+
+            indices = np.floor(values / self.width).astype(np.int64)
+            offset = int(indices.min())
+            self._add_counts(offset, np.bincount(indices - offset))
+            return self
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in NumericSketch.update: {str(e)}", sys) from e
+
+
+    def merge(self, other: "NumericSketch") -> "NumericSketch":
+        """
+        Merge another sketch of the same column into this one.
+
+        Parameters:
+        other (NumericSketch): The sketch to merge.
+
+        Returns:
+        NumericSketch: The sketch itself.
+        """
+        try:
+            self.n_missing += other.n_missing
+            if other.width is None:
+                return self
+            if self.width is None:
+                self.width, self.offset, self.counts = other.width, other.offset, other.counts.copy()
+            else:
+                other_counts = other.copy()
+                width = max(self.width, other.width)
+                self._coarsen(width)
+                other_counts._coarsen(width)
+                self._add_counts(other_counts.offset, other_counts.counts)
+                self._fit_bins()
+
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+            self.sum += other.sum
+            return self
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in NumericSketch.merge: {str(e)}", sys) from e
+
+
+    def copy(self) -> "NumericSketch":
+        sketch = NumericSketch(self.max_bins)
+        sketch.__dict__.update({**self.__dict__, "counts": self.counts.copy()})
+        return sketch
+
+
+    def summary(self) -> dict:
+        """
+        Return the column summary (count, missing values, mean, min, max) kept by the sketch.
+        """
+        count = self.count
+        return {
+            "count": count,
+            "n_missing": self.n_missing,
+            "mean": self.sum / count if count else None,
+            "min": float(self.min) if count else None,
+            "max": float(self.max) if count else None,
+        }
+
+
+    def to_dict(self) -> dict:
+        """
+        Return the sketch as a JSON serialisable dictionary (see sketch_from_dict).
+        """
+        return {
+            "kind": "numerical",
+            "max_bins": self.max_bins,
+            "width": self.width,
+            "offset": int(self.offset),
+            "counts": self.counts.tolist(),
+            "sum": self.sum,
+            **self.summary(),
+        }
+
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NumericSketch":
+        sketch = cls(data["max_bins"])
+        sketch.width, sketch.offset = data["width"], data["offset"]
+        sketch.counts = np.asarray(data["counts"], dtype=np.int64)
+        sketch.n_missing, sketch.sum = data["n_missing"], data["sum"]
+        if data["min"] is not None:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+
+    def cdf_on_grid(self, width: float, first: int, last: int) -> np.ndarray:
+        """
+        Return the empirical CDF at the right edge of the grid bins first..last of the given width
+        (a power-of-two multiple of the sketch width).
+        """
+        sketch = self.copy()
+        sketch._coarsen(width)
+
+        counts = np.zeros(last - first + 1, dtype=np.int64)
+        if len(sketch.counts):
+            counts[sketch.offset - first: sketch.offset - first + len(sketch.counts)] = sketch.counts
+        return np.cumsum(counts) / max(sketch.count, 1)
+
+
+
+# Class for sketching a categorical column
+class CategoricalSketch:
+    """
+    Frequency table of a categorical (or boolean) column, built in one pass over the chunks of a dataset.
+    Missing values are counted apart.
+    """
+
+    def __init__(self):
+        self.counts = pd.Series(dtype=np.int64)
+        self.n_missing = 0
+
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+
+    def update(self, values) -> "CategoricalSketch":
+        """
+        Add the values of one chunk to the sketch.
+
+        Parameters:
+        values (array-like): Values of the chunk.
+
+        Returns:
+        CategoricalSketch: The sketch itself.
+        """
+        try:
+            values = pd.Series(values)
+            self.n_missing += int(values.isna().sum())
+            chunk_counts = values.value_counts(dropna=True)
+            # Categories are keyed by their string value, so chunks read with different dtypes agree
+            # (True, 1 and 1.0 are all keyed '1')
+            if pd.api.types.is_bool_dtype(chunk_counts.index) or pd.api.types.is_numeric_dtype(chunk_counts.index):
+                chunk_counts.index = [str(int(value)) if float(value).is_integer() else str(value)
+                                      for value in chunk_counts.index]
+            else:
+                chunk_counts.index = chunk_counts.index.astype(str)
+            self.counts = self.counts.add(chunk_counts.groupby(level=0).sum(), fill_value=0).astype(np.int64)
+            return self
+
+        except Exception as e:
+            raise HotelBookingException(f"Error in CategoricalSketch.update: {str(e)}", sys) from e
+
+
+    def merge(self, other: "CategoricalSketch") -> "CategoricalSketch":
+        """
+        Merge another sketch of the same column into this one.
+
+        Parameters:
+        other (CategoricalSketch): The sketch to merge.
+
+        Returns:
+        CategoricalSketch: The sketch itself.
+        """
+        self.counts = self.counts.add(other.counts, fill_value=0).astype(np.int64)
+        self.n_missing += other.n_missing
+        return self
+
+
+    def summary(self) -> dict:
+        """
+        Return the column summary (count, missing values, number of categories) kept by the sketch.
+        """
+        return {"count": self.count, "n_missing": self.n_missing, "n_categories": len(self.counts)}
+
+
+    def to_dict(self) -> dict:
+        """
+        Return the sketch as a JSON serialisable dictionary (see sketch_from_dict).
+        """
+        return {
+            "kind": "categorical",
+            "frequencies": {str(category): int(count) for category, count in self.counts.items()},
+            **self.summary(),
+        }
+
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CategoricalSketch":
+        sketch = cls()
+        sketch.counts = pd.Series(data["frequencies"], dtype=np.int64)
+        sketch.n_missing = data["n_missing"]
+        return sketch
+
+
+
+# Function for the exact median of a column from its value counts
+@staticmethod
+def median_from_counts(counts: pd.Series) -> float:
+    """
+    Median of the values counted in counts (value -> count), the same as Series.median on the values: the
+    middle value, or the mean of the two middle values for an even count. The counts of a column can be
+    accumulated chunk by chunk, so the median needs one streaming pass and memory bounded by the distinct values.
+
+    Parameters:
+    counts (Series): Number of rows of every value.
+
+    Returns:
+    float: The median, NaN when there are no values.
+    """
+    try:
+        counts = counts[counts > 0].sort_index()
+        n_values = int(counts.sum())
+        if n_values == 0:
+            return float("nan")
+
+        cumulative = counts.cumsum().to_numpy()
+        values = counts.index.to_numpy(dtype=float)
+        lower = values[np.searchsorted(cumulative, (n_values - 1) // 2 + 1)]
+        upper = values[np.searchsorted(cumulative, n_values // 2 + 1)]
+        return float((lower + upper) / 2)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in median_from_counts: {str(e)}", sys) from e
+
+
+# Function for creating the sketch of a column
+@staticmethod
+def make_sketch(column_type: str, max_bins: int = DATA_VALIDATION_SKETCH_BINS):
+    """
+    Create an empty sketch for a column of the given schema.yaml type.
+
+    Parameters:
+    column_type (str): numerical, categorical or boolean.
+    max_bins (int): Maximum number of histogram bins of a numerical sketch.
+
+    Returns:
+    NumericSketch | CategoricalSketch: The empty sketch.
+    """
+    return NumericSketch(max_bins) if column_type == "numerical" else CategoricalSketch()
+
+
+# Function for restoring a sketch from its dictionary
+@staticmethod
+def sketch_from_dict(data: dict):
+    """
+    Restore a sketch saved with its to_dict method.
+
+    Parameters:
+    data (dict): The dictionary of the sketch.
+
+    Returns:
+    NumericSketch | CategoricalSketch: The restored sketch.
+    """
+    try:
+        return NumericSketch.from_dict(data) if data["kind"] == "numerical" else CategoricalSketch.from_dict(data)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in sketch_from_dict: {str(e)}", sys) from e
+
+
+# Function for the Kolmogorov-Smirnov statistic of two numerical sketches
+@staticmethod
+def ks_test_from_sketches(reference: NumericSketch, current: NumericSketch) -> tuple:
+    """
+    Two-sample KS test computed from two histograms: the statistic is the largest CDF difference at the
+    bin edges of the coarser histogram, coarsened further when both ranges together span more than twice
+    max_bins bins (exact for values that fall on the grid, e.g. small integers, a lower bound otherwise),
+    the p-value is the asymptotic one of scipy's ks_2samp.
+
+    Parameters:
+    reference (NumericSketch): Sketch of the reference sample.
+    current (NumericSketch): Sketch of the current sample.
+
+    Returns:
+    tuple: (KS statistic, p-value).
+    """
+    try:
+        n_reference, n_current = reference.count, current.count
+        if n_reference == 0 or n_current == 0:
+            return 0.0, 1.0
+
+        # Common grid, coarsened only when the two ranges are apart (overlapping ranges fit in 2 * max_bins bins)
+        width = max(reference.width, current.width)
+        max_bins = 2 * max(reference.max_bins, current.max_bins)
+        while True:
+            first = min(int(np.floor(reference.min / width)), int(np.floor(current.min / width)))
+            last = max(int(np.floor(reference.max / width)), int(np.floor(current.max / width)))
+            if last - first + 1 <= max_bins:
+                break
+            width *= 2
+
+        statistic = float(np.max(np.abs(reference.cdf_on_grid(width, first, last)
+                                        - current.cdf_on_grid(width, first, last))))
+
+        en = n_reference * n_current / (n_reference + n_current)
+        p_value = float(stats.kstwo.sf(statistic, np.round(en)))
+        return statistic, min(max(p_value, 0.0), 1.0)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in ks_test_from_sketches: {str(e)}", sys) from e
+
+
+# Function for the aligned frequency tables of two categorical sketches
+@staticmethod
+def counts_from_sketches(reference: CategoricalSketch, current: CategoricalSketch) -> tuple:
+    """
+    Align the frequency tables of two categorical sketches over their union of categories.
+
+    Parameters:
+    reference (CategoricalSketch): Sketch of the reference sample.
+    current (CategoricalSketch): Sketch of the current sample.
+
+    Returns:
+    tuple: (reference counts, current counts) as aligned ndarrays.
+    """
+    categories = reference.counts.index.union(current.counts.index)
+    return (reference.counts.reindex(categories, fill_value=0).to_numpy(),
+            current.counts.reindex(categories, fill_value=0).to_numpy())
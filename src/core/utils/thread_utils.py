@@ -0,0 +1,174 @@
+# This script provides utility methods for running pipeline stages in threads connected by bounded queues.
+
+import sys
+import queue
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+from src.core.exception import HotelBookingException
+
+
+
+# Marks the end of the items put into a queue
+END_OF_QUEUE = object()
+
+# Seconds between checks of the stop event while blocked on a queue
+QUEUE_POLL_INTERVAL: float = 0.1
+
+
+
+# Function for putting an item into a bounded queue
+@staticmethod
+def put_item(item_queue: queue.Queue, item: Any, stop_event: threading.Event) -> bool:
+    """
+    Put an item into a bounded queue, blocking while it is full (back-pressure on the producer).
+
+    Parameters:
+    item_queue (Queue): The queue to put the item into.
+    item (Any): The item to put.
+    stop_event (Event): Event set when any stage failed, the put is abandoned then.
+
+    Returns:
+    bool: True if the item was put, False if the pipeline was stopped.
+    """
+    while not stop_event.is_set():
+        try:
+            item_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+# Function for iterating over the items of a queue
+@staticmethod
+def iterate_queue(item_queue: queue.Queue, stop_event: threading.Event) -> Iterator[Any]:
+    """
+    Yield the items of a queue until END_OF_QUEUE is received or the pipeline is stopped.
+
+    Parameters:
+    item_queue (Queue): The queue to consume.
+    stop_event (Event): Event set when any stage failed.
+
+    Returns:
+    Iterator: The items of the queue, in order.
+    """
+    while not stop_event.is_set():
+        try:
+            item = item_queue.get(timeout=QUEUE_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+
+        if item is END_OF_QUEUE:
+            return
+        yield item
+
+
+# Class for running one pipeline stage in a thread
+class StageThread(threading.Thread):
+    """
+    Run one stage of a producer/consumer pipeline in a daemon thread. An exception raised by the stage
+    is kept (to be re-raised by the caller through raise_error) and stops the other stages.
+    """
+
+    def __init__(self, name: str, target: Callable[[], None], stop_event: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self._target_function = target
+        self.stop_event = stop_event
+        self.error: Optional[BaseException] = None
+
+
+    def run(self) -> None:
+        try:
+            self._target_function()
+        except BaseException as e:
+            self.error = e
+            self.stop_event.set()
+
+
+    def raise_error(self) -> None:
+        """
+        Re-raise the exception of the stage, if it failed.
+
+        Raises:
+        HotelBookingException: If the stage raised an exception.
+        """
+        if self.error is not None:
+            try:
+                raise self.error
+            except BaseException as e:
+                raise HotelBookingException(f"Error in pipeline stage {self.name}: {str(e)}", sys) from e
+
+
+
+# Class for persisting artifacts in the background
+class BackgroundWriter:
+    """
+    Run write functions (e.g. save_data of a stage output) in one background thread, in submission order,
+    while the pipeline carries on with the data in memory. wait blocks until every write is done and
+    re-raises the first failure.
+
+    Usage:
+        writer = BackgroundWriter()
+        writer.submit(save_data, dataframe, file_path)
+        ...
+        writer.wait()
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background-writer")
+        self._futures: list = []
+        self._lock = threading.Lock()
+
+
+    def submit(self, function: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue a write, it runs after the writes submitted before it.
+
+        Parameters:
+        function (Callable): The write function.
+        *args, **kwargs: Its arguments.
+
+        Returns:
+        Future: The future of the write.
+        """
+        with self._lock:
+            future = self._executor.submit(function, *args, **kwargs)
+            self._futures.append(future)
+            return future
+
+
+    def wait(self) -> int:
+        """
+        Wait for every pending write.
+
+        Returns:
+        int: The number of writes waited for.
+
+        Raises:
+        HotelBookingException: If a write failed.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+
+        errors = [future.exception() for future in futures]
+        errors = [error for error in errors if error is not None]
+        if errors:
+            try:
+                raise errors[0]
+            except BaseException as e:
+                raise HotelBookingException(f"Error in background write ({len(errors)} failed): {str(e)}", sys) from e
+
+        return len(futures)
+
+
+    def close(self) -> None:
+        """
+        Wait for the pending writes and stop the background thread.
+        """
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
@@ -2,10 +2,16 @@
 
 import sys
 
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from src.core.exception import HotelBookingException
+from src.core.utils.data_utils import read_data
+from src.core.constants.data_constant import (DATA_SPLIT_SCHEMES,
+                                              DATA_SPLIT_RANDOM_STATE)
 
 
 
@@ -26,7 +32,7 @@ def split_into_train_test_val(dataframe: pd.DataFrame, test_size: float) -> tupl
         train_data, test_data = train_test_split(
             dataframe, 
             test_size=test_size,  
-            random_state=12, 
+            random_state=DATA_SPLIT_RANDOM_STATE, 
             shuffle=True
         )
 
@@ -36,6 +42,69 @@ def split_into_train_test_val(dataframe: pd.DataFrame, test_size: float) -> tupl
         raise HotelBookingException(f"Error in split_data: {str(e)}", sys) from e
 
 
+# Function for the row indices of a train / test split
+@staticmethod
+def split_indices(n_rows: int, test_size: float, scheme: str, stratify: Optional[np.ndarray] = None) -> tuple:
+    """
+    Method Name :   split_indices
+    Description :   Returns the train and test row indices of a split scheme, so a split is stored as two small
+                    index arrays instead of copies of the data:
+                    random      -> the rows of split_into_train_test_val (same seed, same rows).
+                    stratified  -> a shuffled split keeping the class ratios of stratify in both subsets.
+                    temporal    -> the last test_size share of the rows is the test set, without shuffling (the
+                                   row order is the ingestion order, incremental runs append newer rows).
+
+    Input       :   n_rows          -> The number of rows of the dataset.
+                :   test_size       -> The share of the rows in the test set (0.25).
+                :   scheme          -> One of DATA_SPLIT_SCHEMES.
+                :   stratify        -> The class labels of the rows, required by the stratified scheme.
+
+    Output      :   tuple           -> The train and test row indices (int32 below 2**31 rows, int64 above).
+    """
+    try:
+        if scheme not in DATA_SPLIT_SCHEMES:
+            raise ValueError(f"unknown split scheme '{scheme}', expected one of {DATA_SPLIT_SCHEMES}")
+
+        rows = np.arange(n_rows, dtype=np.int32 if n_rows <= np.iinfo(np.int32).max else np.int64)
+
+        if scheme == "temporal":
+            # Same test set size as train_test_split
+            n_test = int(np.ceil(test_size * n_rows))
+            return rows[:n_rows - n_test], rows[n_rows - n_test:]
+
+        if scheme == "stratified" and stratify is None:
+            raise ValueError("the stratified scheme needs the class labels of the rows")
+
+        train_rows, test_rows = train_test_split(rows,
+                                                 test_size=test_size,
+                                                 random_state=DATA_SPLIT_RANDOM_STATE,
+                                                 shuffle=True,
+                                                 stratify=stratify if scheme == "stratified" else None)
+        return train_rows, test_rows
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in split_indices ({scheme}): {str(e)}", sys) from e
+
+
+# Function for selecting rows of a dataset by position
+@staticmethod
+def take_rows(data: pd.DataFrame, indices: np.ndarray) -> pd.DataFrame:
+    """
+    Method Name :   take_rows
+    Description :   Selects rows by position with one vectorised take (DataFrame.take, the row labels are kept).
+
+    Input       :   data            -> The DataFrame.
+                :   indices         -> The row positions, e.g. a memory-mapped .npy index file.
+
+    Output      :   DataFrame       -> The selected rows.
+    """
+    try:
+        return data.take(np.asarray(indices))
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in take_rows: {str(e)}", sys) from e
+
+
 # Funcion for Separating Target feature from Dataset
 @staticmethod
 def separate_features_and_target(dataframe: pd.DataFrame, target_column: str) -> tuple:
@@ -50,7 +119,7 @@ def separate_features_and_target(dataframe: pd.DataFrame, target_column: str) ->
     """
     try:        
         # Separating independent features (X) and target feature (y)
-        X = dataframe.drop(columns=[target_column], axis=1)
+        X = dataframe.drop(columns=[target_column])
         y = dataframe[target_column]
         
         return X, y
@@ -59,6 +128,61 @@ def separate_features_and_target(dataframe: pd.DataFrame, target_column: str) ->
         raise HotelBookingException(f"Error in separate_features_and_target: {str(e)}", sys) from e
 
 
+# Function for reading the processed dataset the row index files of the index split mode point into
+@staticmethod
+def read_processed_dataset(data_file_path: str) -> pd.DataFrame:
+    """
+    Method Name :   read_processed_dataset
+    Description :   Reads the processed dataset of the index split mode. A stage reading several row index
+                    files reads it once and passes it to read_features_and_target.
+
+    Input       :   data_file_path  -> The processed data file.
+
+    Output      :   DataFrame       -> The processed dataset.
+    """
+    try:
+        return read_data(data_file_path)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in read_processed_dataset: {str(e)}", sys) from e
+
+
+# Function for reading the features and target of a split dataset
+@staticmethod
+def read_features_and_target(file_path: str, target_column: str, data: Optional[pd.DataFrame] = None,
+                             data_file_path: Optional[str] = None, dataset: Optional[pd.DataFrame] = None) -> tuple:
+    """
+    Method Name :   read_features_and_target
+    Description :   Reads a split dataset and separates its features and target. A .npy row index file of the
+                    index split mode is memory mapped and its rows are taken from the processed dataset at data_file_path (or from dataset,
+                    when the caller already read it). The split data handed over in memory by the data split
+                    stage is used instead of the file when given.
+
+    Input       :   file_path       -> The data file (csv, parquet, feather) or .npy row index file to read.
+                :   target_column   -> The name of the target column.
+                :   data            -> Optional split DataFrame in memory.
+                :   data_file_path  -> The processed data file of a .npy row index file.
+                :   dataset         -> Optional processed dataset already read with read_processed_dataset.
+
+    Output      :   tuple           -> A tuple containing the features DataFrame and the target series.
+    """
+    try:
+        if data is None and file_path.endswith(".npy"):
+            if dataset is None:
+                if data_file_path is None:
+                    raise ValueError(f"no processed dataset given for the row index file {file_path}")
+                dataset = read_processed_dataset(data_file_path)
+            data = take_rows(dataset, np.load(file_path, mmap_mode="r"))
+
+        if data is None:
+            data = read_data(file_path)
+
+        return separate_features_and_target(data, target_column)
+
+    except Exception as e:
+        raise HotelBookingException(f"Error in read_features_and_target: {str(e)}", sys) from e
+
+
 @staticmethod
 def train_test_split_for_data_validation(dataframe: pd.DataFrame, test_size: float) -> tuple:
     """
@@ -103,18 +227,20 @@ def train_test_split_for_model_building(dataframe: pd.DataFrame, test_size: floa
 
 
 @staticmethod
-def train_test_split_for_tuning(X_train: pd.DataFrame, y_train: pd.Series, test_size: float) -> tuple:
+def train_test_split_for_tuning(X_train: pd.DataFrame, y_train: pd.Series, test_size: float,
+                                random_state: Optional[int] = None) -> tuple:
     """
     Perform train-test split on the given training data for hyperparameter tuning.
 
     :param X_train: The training features DataFrame.
     :param y_train: The training target Series.
     :param test_size: The proportion of the dataset to include in the test split.
+    :param random_state: Seed of the split, a fixed seed gives the same tuning set (and fold plan) on every run.
     :return: A tuple containing the tuning set features and target.
     """
     try:
         # Perform train-test split for hyperparameter tuning
-        X_tune, _, y_tune, _ = train_test_split(X_train, y_train, test_size=test_size)
+        X_tune, _, y_tune, _ = train_test_split(X_train, y_train, test_size=test_size, random_state=random_state)
         return X_tune, y_tune
     except Exception as e:
         raise HotelBookingException(e, sys) from e
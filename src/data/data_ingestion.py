@@ -1,17 +1,31 @@
 import os
 import sys
+import queue
+import threading
+from collections import Counter
 
+import numpy as np
+import pandas as pd
+from typing import Any, Iterator, List, Optional
 from pandas import DataFrame
 
 from src.core.logger import logging
 from src.core.exception import HotelBookingException
 
-from src.configs.mysql_connection import HotelBookingData
+from src.configs.mysql_connection import (HotelBookingData,
+                                          MySQLConnect)
 from src.core.entities.config_entity import DataIngestionConfig
 from src.core.entities.artifact_entity import DataIngestionArtifact
 
 from src.core.utils.yaml_utils import read_yaml 
-from src.core.utils.data_utils import save_data
+from src.core.utils.json_utils import (read_json, write_json)
+from src.core.utils.dtype_utils import (apply_schema_dtypes,
+                                        coerce_stable_dtypes)
+from src.core.utils.data_utils import (DataWriter, get_data_format, read_data_in_chunks, save_data, append_data)
+from src.core.utils.thread_utils import (END_OF_QUEUE,
+                                         StageThread,
+                                         iterate_queue,
+                                         put_item)
 
 from src.core.constants.common_constant import (DATASET_NAME,
                                                 SCHEMA_FILE_PATH)
@@ -45,11 +59,329 @@ class DataIngestion:
 
 
 
-    def export_data_into_artifact_data(self) -> DataFrame:
+    def get_columns_to_export(self) -> List[str]:
+        """
+        Method Name :   get_columns_to_export
+        Description :   This method builds the SELECT list from schema.yaml: every feature except the
+                        sensitive columns and the leakage drop_columns, so these are never sent over the
+                        wire or written to the raw artifact. The watermark column is kept when incremental
+                        ingestion is enabled, it is dropped later in DataPreprocessing.
+
+        Output      :   List of column names to export.
+        On Failure  :   Write an exception log and then raise an exception
+        """
         try:
-            logging.info("Exporting data from MySQL Database")
+            sensitive_columns = self._schema_config.get("sensitive_columns", [])
+            drop_columns = self._schema_config.get("drop_columns", [])
+            excluded_columns = set(sensitive_columns) | set(drop_columns)
+
+            if self.data_ingestion_config.incremental:
+                excluded_columns.discard(self.data_ingestion_config.watermark_column)
+
+            columns = [column for column in self._schema_config.get("features", {}) if column not in excluded_columns]
+            logging.info(f"Columns to export: {columns}")
+            
+            return columns
+        
+        except Exception as e:
+            logging.error(f"Error in get_columns_to_export: {str(e)}")
+            raise HotelBookingException(f"Error in get_columns_to_export: {str(e)}", sys) from e
+
+
+
+    def read_watermark(self) -> Optional[Any]:
+        """
+        Method Name :   read_watermark
+        Description :   This method returns the persisted high-water mark of the previous ingestion run.
+                        None is returned (forcing a complete reload) when incremental ingestion is disabled,
+                        a full refresh is requested, or the watermark / interim artifacts are missing.
+
+        Output      :   High-water mark value or None.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
+
+            if not config.incremental or config.full_refresh:
+                logging.info("Full refresh requested, ignoring the persisted high-water mark")
+                return None
+
+            artifact_paths = (config.watermark_file_path, config.raw_file_path, config.data_file_path)
+            if not all(os.path.exists(file_path) for file_path in artifact_paths):
+                logging.info("No previous ingestion found, falling back to a full load")
+                return None
+
+            watermark = read_json(config.watermark_file_path)
+            if watermark.get("column") != config.watermark_column:
+                logging.info(f"Persisted watermark column {watermark.get('column')} does not match "
+                             f"{config.watermark_column}, falling back to a full load")
+                return None
+
+            logging.info(f"Loaded high-water mark: {watermark['column']} = {watermark['value']}")
+            return watermark["value"]
+        
+        except Exception as e:
+            logging.error(f"Error in read_watermark: {str(e)}")
+            raise HotelBookingException(f"Error in read_watermark: {str(e)}", sys) from e
+
+
+
+    def get_source_fingerprint(self) -> dict:
+        """
+        Method Name :   get_source_fingerprint
+        Description :   This method fingerprints the source table (CHECKSUM TABLE on MySQL, otherwise row count plus
+                        maximum of the watermark column) together with the exported columns and artifact files,
+                        so a change of the table, of schema.yaml or of the artifact format triggers a new export.
+
+        Output      :   JSON serialisable fingerprint dictionary.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
             hotel_booking_data = HotelBookingData()
-            dataframe = hotel_booking_data.export_data_as_dataframe(dataset_name=self.dataset_name)
+
+            fingerprint = {
+                "source": hotel_booking_data.get_table_fingerprint(dataset_name=self.dataset_name,
+                                                                   watermark_column=config.watermark_column),
+                "columns": self.get_columns_to_export(),
+                "artifacts": [os.path.basename(config.raw_file_path), os.path.basename(config.data_file_path)],
+            }
+            logging.info(f"Source fingerprint: {fingerprint['source']}")
+
+            return fingerprint
+        
+        except Exception as e:
+            logging.error(f"Error in get_source_fingerprint: {str(e)}")
+            raise HotelBookingException(f"Error in get_source_fingerprint: {str(e)}", sys) from e
+
+
+
+    def is_source_unchanged(self, fingerprint: dict) -> bool:
+        """
+        Method Name :   is_source_unchanged
+        Description :   This method compares the fingerprint with the one persisted by the previous ingestion run.
+                        Change detection is bypassed when it is disabled, a full refresh is requested, or the
+                        fingerprint / artifact files are missing.
+
+        Output      :   True if the previous artifacts are still up to date, False otherwise.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
+
+            if not config.skip_if_unchanged or config.full_refresh:
+                return False
+
+            artifact_paths = (config.fingerprint_file_path, config.raw_file_path, config.data_file_path)
+            if not all(os.path.exists(file_path) for file_path in artifact_paths):
+                return False
+
+            return read_json(config.fingerprint_file_path) == fingerprint
+        
+        except Exception as e:
+            logging.error(f"Error in is_source_unchanged: {str(e)}")
+            raise HotelBookingException(f"Error in is_source_unchanged: {str(e)}", sys) from e
+
+
+
+    def get_high_water_mark(self, dataframe: DataFrame, current: Optional[Any] = None) -> Optional[Any]:
+        """
+        Method Name :   get_high_water_mark
+        Description :   This method returns the maximum of the watermark column in the dataframe,
+                        or the current mark if it is higher (or the dataframe holds no values).
+
+        Output      :   High-water mark value or None.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            watermark_column = self.data_ingestion_config.watermark_column
+
+            if watermark_column not in dataframe.columns or dataframe[watermark_column].isna().all():
+                return current
+
+            high_water_mark = dataframe[watermark_column].max()
+
+            # Keep the mark JSON serialisable (numpy scalars, dates, timestamps)
+            if isinstance(high_water_mark, np.number):
+                high_water_mark = high_water_mark.item()
+            elif isinstance(high_water_mark, pd.Timestamp) and high_water_mark == high_water_mark.normalize():
+                high_water_mark = high_water_mark.strftime("%Y-%m-%d")
+            elif not isinstance(high_water_mark, (int, float, str)):
+                high_water_mark = str(high_water_mark)
+
+            return high_water_mark if current is None or high_water_mark > current else current
+        
+        except Exception as e:
+            logging.error(f"Error in get_high_water_mark: {str(e)}")
+            raise HotelBookingException(f"Error in get_high_water_mark: {str(e)}", sys) from e
+
+
+
+    def get_row_keys(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Method Name :   get_row_keys
+        Description :   This method returns a hash of the non-sensitive values of every row. The values are
+                        brought to stable dtypes and text first, so a row fetched from MySQL and the same row
+                        read back from the data file get the same key.
+
+        Output      :   uint64 array with one key per row.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            dataframe = dataframe.drop(columns=self._schema_config.get("sensitive_columns", []), errors="ignore")
+            dataframe = coerce_stable_dtypes(dataframe, self._schema_config)
+
+            # Missing values get one marker whatever their type (NaN, None, NaT, pd.NA)
+            values = {column: dataframe[column].astype(str).where(dataframe[column].notna(), "\0")
+                      for column in sorted(dataframe.columns)}
+            return pd.util.hash_pandas_object(pd.DataFrame(values), index=False).to_numpy()
+
+        except Exception as e:
+            logging.error(f"Error in get_row_keys: {str(e)}")
+            raise HotelBookingException(f"Error in get_row_keys: {str(e)}", sys) from e
+
+
+
+    def is_at_watermark(self, dataframe: DataFrame, watermark: Any) -> np.ndarray:
+        """
+        Method Name :   is_at_watermark
+        Description :   This method returns which rows hold the high-water mark itself in the watermark column.
+
+        Output      :   Boolean array with one value per row.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            watermark_column = self.data_ingestion_config.watermark_column
+            if watermark_column not in dataframe.columns:
+                return np.zeros(len(dataframe), dtype=bool)
+
+            # The persisted mark is JSON (e.g. a date string), compare both in the dtype of the column
+            values = coerce_stable_dtypes(dataframe[[watermark_column]], self._schema_config)[watermark_column]
+            mark = coerce_stable_dtypes(pd.DataFrame({watermark_column: [watermark]}), self._schema_config)[watermark_column]
+            return (values == mark.iloc[0]).to_numpy()
+
+        except Exception as e:
+            logging.error(f"Error in is_at_watermark: {str(e)}")
+            raise HotelBookingException(f"Error in is_at_watermark: {str(e)}", sys) from e
+
+
+
+    def get_ingested_boundary_rows(self, watermark: Optional[Any]) -> Counter:
+        """
+        Method Name :   get_ingested_boundary_rows
+        Description :   This method counts the keys of the rows of the data file that hold the high-water mark.
+                        The incremental query selects the mark itself again, these are the rows of it that were
+                        already ingested.
+
+        Output      :   Counter of row keys (empty for a full load).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            ingested = Counter()
+            if watermark is None:
+                return ingested
+
+            for chunk in read_data_in_chunks(self.data_ingestion_config.data_file_path, self.data_ingestion_config.chunk_size):
+                boundary_rows = chunk[self.is_at_watermark(chunk, watermark)]
+                ingested.update(int(key) for key in self.get_row_keys(boundary_rows))
+
+            logging.info(f"Found {sum(ingested.values())} ingested rows at the high-water mark {watermark}")
+            return ingested
+
+        except Exception as e:
+            logging.error(f"Error in get_ingested_boundary_rows: {str(e)}")
+            raise HotelBookingException(f"Error in get_ingested_boundary_rows: {str(e)}", sys) from e
+
+
+
+    def drop_ingested_rows(self, dataframe: DataFrame, watermark: Optional[Any], ingested: Counter) -> DataFrame:
+        """
+        Method Name :   drop_ingested_rows
+        Description :   This method drops the fetched rows at the high-water mark that were ingested before.
+                        The table has no primary key, so rows are matched on their values, one ingested row
+                        per fetched row: identical bookings that arrived after the previous run are kept.
+                        The counter is consumed, pass the same one for all chunks of an export.
+
+        Output      :   DataFrame of the rows not ingested yet.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            if watermark is None or not ingested:
+                return dataframe
+
+            positions = np.flatnonzero(self.is_at_watermark(dataframe, watermark))
+            keep = np.ones(len(dataframe), dtype=bool)
+
+            for position, key in zip(positions, self.get_row_keys(dataframe.iloc[positions])):
+                if ingested[int(key)] > 0:
+                    ingested[int(key)] -= 1
+                    keep[position] = False
+
+            if not keep.all():
+                logging.info(f"Dropped {int((~keep).sum())} rows at the high-water mark that were ingested before")
+                dataframe = dataframe[keep]
+            return dataframe
+
+        except Exception as e:
+            logging.error(f"Error in drop_ingested_rows: {str(e)}")
+            raise HotelBookingException(f"Error in drop_ingested_rows: {str(e)}", sys) from e
+
+
+
+    def export_data_chunks(self, watermark: Optional[Any] = None) -> Iterator[DataFrame]:
+        """
+        Method Name :   export_data_chunks
+        Description :   This method returns the MySQL table as an iterator of DataFrames: range partitions
+                        of partition_column read in parallel when n_partitions > 1, otherwise chunks streamed
+                        through a server-side cursor.
+
+        Output      :   Iterator of DataFrame chunks in deterministic order.
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_ingestion_config
+            hotel_booking_data = HotelBookingData()
+            columns = self.get_columns_to_export()
+
+            if config.n_partitions > 1:
+                logging.info(f"Reading {config.n_partitions} range partitions of {config.partition_column} "
+                             f"with {config.max_workers or config.n_partitions} parallel connections")
+                return hotel_booking_data.export_data_in_partitions(dataset_name=self.dataset_name,
+                                                                    partition_column=config.partition_column,
+                                                                    n_partitions=config.n_partitions,
+                                                                    max_workers=config.max_workers,
+                                                                    columns=columns,
+                                                                    watermark_column=config.watermark_column,
+                                                                    watermark=watermark)
+
+            logging.info(f"Streaming data from MySQL Database in chunks of {config.chunk_size} rows")
+            return hotel_booking_data.export_data_in_chunks(dataset_name=self.dataset_name, 
+                                                            chunk_size=config.chunk_size,
+                                                            columns=columns,
+                                                            watermark_column=config.watermark_column,
+                                                            watermark=watermark)
+        
+        except Exception as e:
+            logging.error(f"Error in export_data_chunks: {str(e)}")
+            raise HotelBookingException(f"Error in export_data_chunks: {str(e)}", sys) from e
+
+
+
+    def export_data_into_artifact_data(self, watermark: Optional[Any] = None) -> DataFrame:
+        try:
+            logging.info("Exporting data from MySQL Database")
+            if self.data_ingestion_config.n_partitions > 1:
+                # Compact dtypes are applied after concatenation so category sets are shared by all partitions
+                dataframe = pd.concat(list(self.export_data_chunks(watermark)), ignore_index=True)
+                dataframe = apply_schema_dtypes(dataframe, self._schema_config, stage=f"export {self.dataset_name}")
+            else:
+                hotel_booking_data = HotelBookingData()
+                dataframe = hotel_booking_data.export_data_as_dataframe(dataset_name=self.dataset_name,
+                                                                        columns=self.get_columns_to_export(),
+                                                                        watermark_column=self.data_ingestion_config.watermark_column,
+                                                                        watermark=watermark,
+                                                                        schema_config=self._schema_config)
+            dataframe = self.drop_ingested_rows(dataframe, watermark, self.get_ingested_boundary_rows(watermark))
             logging.info(f"Shape of dataframe: {dataframe.shape}")
 
 
@@ -58,8 +390,12 @@ class DataIngestion:
             os.makedirs(dir_path, exist_ok=True)
 
 
-            logging.info(f"Saving exported data into artifact raw file path: {artifact_raw_file_path}")
-            save_data(dataframe, artifact_raw_file_path)
+            if watermark is None:
+                logging.info(f"Saving exported data into artifact raw file path: {artifact_raw_file_path}")
+                save_data(dataframe, artifact_raw_file_path)
+            else:
+                logging.info(f"Appending {len(dataframe)} new rows into artifact raw file path: {artifact_raw_file_path}")
+                append_data(dataframe, artifact_raw_file_path)
         
             return dataframe
         except Exception as e:
@@ -68,6 +404,131 @@ class DataIngestion:
 
 
 
+    def export_data_in_chunks_into_artifact_data(self, watermark: Optional[Any] = None) -> Optional[Any]:
+        """
+        Method Name :   export_data_in_chunks_into_artifact_data
+        Description :   This method streams the MySQL table chunk by chunk (or partition by partition), appending
+                        every raw chunk to the raw artifact file and its sanitised copy (sensitive columns dropped)
+                        to the data file, so peak memory is bounded by the chunk size instead of the table size.
+                        Chunks get stable dtypes first, so they share one schema in columnar (parquet/feather) files.
+                        When a watermark is given only the rows from the mark on are fetched, and the ones not
+                        ingested before are appended to the existing artifact files.
+
+        Output      :   High-water mark of the exported rows (None if nothing was exported).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered export_data_in_chunks_into_artifact_data method of DataIngestion class")
+
+        try:
+            artifact_raw_file_path = self.data_ingestion_config.raw_file_path
+            data_file_path = self.data_ingestion_config.data_file_path
+
+
+            high_water_mark = None
+
+            # The rows at the high-water mark are fetched again, the ones ingested before are dropped
+            ingested = self.get_ingested_boundary_rows(watermark)
+            chunks = (self.drop_ingested_rows(chunk, watermark, ingested) for chunk in self.export_data_chunks(watermark))
+            chunks = (chunk for chunk in chunks if len(chunk))
+
+            # A full load replaces stale artifacts, an incremental load appends to them
+            append = watermark is not None
+            with DataWriter(artifact_raw_file_path, append=append) as raw_writer, \
+                    DataWriter(data_file_path, append=append) as data_writer:
+
+                if self.data_ingestion_config.pipelined_export:
+                    high_water_mark = self.write_chunks_through_pipeline(chunks, raw_writer, data_writer)
+                else:
+                    for chunk in chunks:
+                        high_water_mark = self.get_high_water_mark(chunk, current=high_water_mark)
+                        chunk = coerce_stable_dtypes(chunk, self._schema_config)
+                        raw_writer.write(chunk)
+
+                        chunk = self.drop_sensitive_columns(chunk)
+                        data_writer.write(chunk)
+                        logging.info(f"Appended chunk of {len(chunk)} rows ({data_writer.n_rows} rows exported so far)")
+
+
+            logging.info(f"Saved {data_writer.n_rows} exported rows into {artifact_raw_file_path} and {data_file_path}")
+            logging.info("Exited export_data_in_chunks_into_artifact_data method of DataIngestion class")
+            return high_water_mark
+        
+        except Exception as e:
+            logging.error(f"Error in export_data_in_chunks_into_artifact_data: {str(e)}")
+            raise HotelBookingException(f"Error in export_data_in_chunks_into_artifact_data: {str(e)}", sys) from e
+
+
+
+    def write_chunks_through_pipeline(self, chunks: Iterator[DataFrame], raw_writer: DataWriter,
+                                      data_writer: DataWriter) -> Optional[Any]:
+        """
+        Method Name :   write_chunks_through_pipeline
+        Description :   This method overlaps fetching, sanitising and writing: the fetched chunks move through
+                        bounded queues to a raw writer thread and a sanitiser thread, which hands the chunks
+                        without sensitive columns to a data writer thread. The queues bound the chunks held in
+                        memory, and the wall time approaches the slowest stage instead of the sum of all stages.
+                        An error in any stage stops the others and is re-raised here.
+
+        Output      :   High-water mark of the exported rows (None if nothing was exported).
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            queue_size = self.data_ingestion_config.queue_size
+            stop_event = threading.Event()
+            raw_queue, sanitise_queue, data_queue = (queue.Queue(maxsize=queue_size) for _ in range(3))
+
+
+            def write_raw() -> None:
+                for chunk in iterate_queue(raw_queue, stop_event):
+                    raw_writer.write(chunk)
+
+            def sanitise() -> None:
+                for chunk in iterate_queue(sanitise_queue, stop_event):
+                    if not put_item(data_queue, self.drop_sensitive_columns(chunk), stop_event):
+                        return
+                put_item(data_queue, END_OF_QUEUE, stop_event)
+
+            def write_data() -> None:
+                for chunk in iterate_queue(data_queue, stop_event):
+                    data_writer.write(chunk)
+                    logging.info(f"Appended chunk of {len(chunk)} rows ({data_writer.n_rows} rows exported so far)")
+
+
+            stages = [StageThread(name, target, stop_event)
+                      for name, target in (("write_raw", write_raw), ("sanitise", sanitise), ("write_data", write_data))]
+            for stage in stages:
+                stage.start()
+
+
+            # The fetch stage runs in the calling thread
+            high_water_mark = None
+            try:
+                for chunk in chunks:
+                    high_water_mark = self.get_high_water_mark(chunk, current=high_water_mark)
+                    chunk = coerce_stable_dtypes(chunk, self._schema_config)
+                    if not (put_item(raw_queue, chunk, stop_event) and put_item(sanitise_queue, chunk, stop_event)):
+                        break
+
+                for item_queue in (raw_queue, sanitise_queue):
+                    put_item(item_queue, END_OF_QUEUE, stop_event)
+            except BaseException:
+                stop_event.set()
+                raise
+            finally:
+                for stage in stages:
+                    stage.join()
+
+            for stage in stages:
+                stage.raise_error()
+
+            return high_water_mark
+        
+        except Exception as e:
+            logging.error(f"Error in write_chunks_through_pipeline: {str(e)}")
+            raise HotelBookingException(f"Error in write_chunks_through_pipeline: {str(e)}", sys) from e
+
+
+
     def drop_sensitive_columns(self, dataframe: DataFrame) -> DataFrame:
         """
         Method Name :   drop_sensitive_columns
@@ -101,30 +562,80 @@ class DataIngestion:
         Method Name :   initiate_data_ingestion
         Description :   This method initiates the data ingestion components of training pipeline
 
-        Output      :   Ingested data is saved as a CSV file.
+        Output      :   Ingested data is saved as a data file (csv, parquet or feather, see DATA_ARTIFACT_FORMAT).
         On Failure  :   Write an exception log and then raise an exception
         """
         logging.info("Entered initiate_data_ingestion method of DataIngestion class")
 
         try:
-            dataframe = self.export_data_into_artifact_data()
-            logging.info("Got the data from MySQL Database")
+            data_file_path = self.data_ingestion_config.data_file_path
 
+            # Short-circuit to the existing artifact when the source table did not change
+            fingerprint = self.get_source_fingerprint()
+            if self.is_source_unchanged(fingerprint):
+                logging.info("Source table unchanged since the previous ingestion, skipped the export")
+                data_ingestion_artifact = DataIngestionArtifact(data_file_path=data_file_path)
+                logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
+                return data_ingestion_artifact
 
-            dataframe = self.drop_sensitive_columns(dataframe)
-            logging.info("Dropped sensitive columns from the dataframe")
+            # None means a complete reload of the table
+            watermark = self.read_watermark()
+            if watermark is not None and get_data_format(data_file_path) != "csv":
+                logging.info(f"{get_data_format(data_file_path)} artifact files are immutable, the new rows are appended "
+                             f"by rewriting them (DATA_ARTIFACT_FORMAT=csv appends in place)")
 
+            if self.data_ingestion_config.streaming_export:
+                # Chunks are sanitised and appended to the artifact files while streaming
+                high_water_mark = self.export_data_in_chunks_into_artifact_data(watermark)
+                logging.info("Streamed the data from MySQL Database into artifact files")
+
+            else:
+                dataframe = self.export_data_into_artifact_data(watermark)
+                high_water_mark = self.get_high_water_mark(dataframe)
+                logging.info("Got the data from MySQL Database")
 
-            data_file_path = self.data_ingestion_config.data_file_path
-            dir_path = os.path.dirname(data_file_path)
-            os.makedirs(dir_path, exist_ok=True)
 
+                dataframe = self.drop_sensitive_columns(dataframe)
+                logging.info("Dropped sensitive columns from the dataframe")
 
-            logging.info(f"Saving ingested data into file path: {data_file_path}")
-            save_data(dataframe, data_file_path)
+
+                dir_path = os.path.dirname(data_file_path)
+                os.makedirs(dir_path, exist_ok=True)
+
+
+                if watermark is None:
+                    logging.info(f"Saving ingested data into file path: {data_file_path}")
+                    save_data(dataframe, data_file_path)
+                else:
+                    logging.info(f"Merging {len(dataframe)} new rows into file path: {data_file_path}")
+                    append_data(dataframe, data_file_path)
+
+
+            # Pool usage of the export, to size the connection pool from data
+            pool_metrics = MySQLConnect().pool_metrics
+            if pool_metrics is not None:
+                logging.info(f"MySQL connection pool metrics: {pool_metrics.snapshot()}")
+
+
+            # Persist the new high-water mark for the next incremental run
+            if high_water_mark is not None:
+                watermark_data = {"column": self.data_ingestion_config.watermark_column, "value": high_water_mark}
+                write_json(self.data_ingestion_config.watermark_file_path, watermark_data, replace=True)
+                logging.info(f"Saved high-water mark: {watermark_data}")
+            else:
+                logging.info("No new rows found since the last ingestion")
+
+
+            # Persist the fingerprint of the exported source, the next run skips the export if it still matches
+            write_json(self.data_ingestion_config.fingerprint_file_path, fingerprint, replace=True)
 
             
             data_ingestion_artifact = DataIngestionArtifact(data_file_path=data_file_path)
+
+            # In-memory handoff of a full (non-streaming, non-incremental) export, the next stage skips reading the file
+            if self.data_ingestion_config.in_memory_handoff and not self.data_ingestion_config.streaming_export and watermark is None:
+                data_ingestion_artifact.dataframe = dataframe
+                logging.info("Attached the ingested dataframe to the data ingestion artifact")
             logging.info(f"Data ingestion artifact: {data_ingestion_artifact}")
         
         
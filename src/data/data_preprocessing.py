@@ -1,14 +1,16 @@
+import os
 import sys
+import tracemalloc
 
+import numpy as np
 import pandas as pd
 
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import FunctionTransformer, MinMaxScaler
-from sklearn.compose import ColumnTransformer
+from typing import Optional
 
 from src.core.logger import logging
 from src.core.exception import HotelBookingException
 
+from src.data.preprocessor import HotelBookingPreprocessor
 from src.core.entities.config_entity import DataPreprocessingConfig
 from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
                                                DataIngestionArtifact,
@@ -16,11 +18,24 @@ from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
 
 from src.core.utils.yaml_utils import read_yaml
 from src.core.utils.object_utils import save_object
-from src.core.utils.data_utils import (read_data, save_data)
+from src.core.utils.data_utils import (DataWriter,
+                                       read_data,
+                                       read_data_in_chunks,
+                                       save_data)
+from src.core.utils.dtype_utils import coerce_stable_dtypes
+from src.core.utils.sketch_utils import median_from_counts
+from src.core.utils.thread_utils import BackgroundWriter
+from src.core.utils.rules_utils import (compile_noise_rules,
+                                        evaluate_noise_rules,
+                                        resolve_eval_engine)
+from src.core.utils.cache_utils import (ArtifactCache,
+                                        cache_key,
+                                        code_fingerprint,
+                                        file_fingerprint)
 
-from src.core.constants.common_constant import (HOTEL_MAPPING, 
-                                                MONTH_ORDER,
-                                                SCHEMA_FILE_PATH)
+from src.core.constants.common_constant import SCHEMA_FILE_PATH
+from src.core.constants.data_constant import (DATA_PREPROCESSING_EVAL_ENGINE,
+                                              DATA_PREPROCESSING_SCHEMA_SECTIONS)
 
 
 
@@ -32,10 +47,12 @@ class DataPreprocessing:
     """
     def __init__(self, data_ingestion_artifact: DataIngestionArtifact,
                  data_validation_artifact: DataValidationArtifact,
-                 data_preprocessing_config: DataPreprocessingConfig):
+                 data_preprocessing_config: DataPreprocessingConfig,
+                 background_writer: Optional[BackgroundWriter] = None):
         """
         :param data_ingestion_artifact: Output reference of data ingestion artifact stage
         :param data_preprocessing_config: configuration for data preprocessing
+        :param background_writer: writes the outputs in the background in the in-memory handoff mode (synchronous if None)
         """
         try:
 
@@ -47,7 +64,10 @@ class DataPreprocessing:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_preprocessing_config = data_preprocessing_config
             self.data_validation_artifact = data_validation_artifact
+            self.background_writer = background_writer
             self._schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+            self._noise_rules = compile_noise_rules(self._schema_config)
+            self._eval_engine = resolve_eval_engine(DATA_PREPROCESSING_EVAL_ENGINE)
      
         except Exception as e:
             logging.error(f"Error in DataPreprocessing initialization: {str(e)}")
@@ -98,6 +118,11 @@ class DataPreprocessing:
                 # Log the columns with missing values
                 logging.info(f"Missing values found in columns: {missing_columns}")
                 
+                # Categorical columns (compact dtypes) need 0 as a category before it can be filled in
+                for column in missing_columns:
+                    if isinstance(df[column].dtype, pd.CategoricalDtype) and 0 not in df[column].cat.categories:
+                        df[column] = df[column].cat.add_categories([0])
+
                 # Fill missing values with 0
                 df[missing_columns] = df[missing_columns].fillna(0)
                 logging.info(f"Filled missing values in columns: {missing_columns} with 0")
@@ -111,66 +136,74 @@ class DataPreprocessing:
 
 
     # Function for Handling Noisy Data
-    def handle_noisy_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def handle_noisy_data(self, df: pd.DataFrame, medians: Optional[dict] = None) -> pd.DataFrame:
         """
         Method Name :   handle_noisy_data
-        Description :   Identifies and handles noisy data dynamically using schema.yaml configuration.
+        Description :   Identifies and handles noisy data with the noise_rules of schema.yaml. The conditions of
+                        the drop rules are combined into one row mask and the data is filtered once; the values
+                        of the replace_median rules are replaced with the median of the other values of their
+                        column in df, or with medians[column] when it is given (e.g. the median of the whole
+                        dataset in chunked preprocessing). The rows matched by every rule, the rows dropped and
+                        the peak memory traced while handling the noise are logged.
         
         Output      :   Returns a cleaned DataFrame with noisy data handled appropriately.
         """
         try:
-            logging.info("Fetching noisy value columns from schema.yaml")
-            noisy_columns = self._schema_config.get('noisy_values_columns', [])
-            logging.info(f"Noisy value columns identified: {noisy_columns}")
-
-            # Initialize a dictionary to track noisy data conditions and actions
-            noisy_conditions = {
-                'adr':      df['adr'] < 0,
-                'adults':   df['adults'] == 0,
-                'children': df['children'] == 10,
-                'babies':   df['babies'] == 10,
-            }
-
-            # Filter noisy_conditions to only include columns present in schema.yaml
-            noisy_conditions = {col: condition for col, condition in noisy_conditions.items() if col in noisy_columns}
-
-            # Log the counts of noisy data
-            noisy_data_count = {key: df[condition].shape[0] for key, condition in noisy_conditions.items()}
-            for feature, count in noisy_data_count.items():
-                if count > 0:
-                    logging.info(f"Found {count} noisy rows in '{feature}'")
-
-            # Handle noisy data based on schema definitions
-            if 'adr' in noisy_columns and noisy_data_count.get('adr', 0) > 0:
-                median_adr = df[df['adr'] >= 0]['adr'].median()
-                df.loc[df['adr'] < 0, 'adr'] = median_adr
-                logging.info(f"     Replaced negative ADR values with median: {median_adr}")
-
-            if 'adults' in noisy_columns and noisy_data_count.get('adults', 0) > 0:
-                df = df[df['adults'] > 0]
-                logging.info("     Removed rows where adults == 0")
-
-            if 'children' in noisy_columns and noisy_data_count.get('children', 0) > 0:
-                df = df[df['children'] != 10]
-                logging.info("     Removed rows where children == 10")
-
-            if 'babies' in noisy_columns and noisy_data_count.get('babies', 0) > 0:
-                df = df[df['babies'] != 10]
-                logging.info("     Removed rows where babies == 10")
-            
-            logging.info("Noisy data handling completed successfully")
+            tracing = not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+
+            # Evaluate every rule condition, the drop conditions are ORed into a single row mask
+            masks, drop_mask = evaluate_noise_rules(df, self._noise_rules, self._eval_engine)
+            for name, mask in masks.items():
+                logging.info(f"Noise rule '{name}' ({self._noise_rules[name]['condition']}, "
+                             f"{self._noise_rules[name]['action']}): {int(mask.sum())} rows")
+
+            for name, rule in self._noise_rules.items():
+                if rule["action"] != "replace_median" or not masks[name].any():
+                    continue
+                column = rule["column"]
+                if medians is not None and column in medians:
+                    median = medians[column]
+                else:
+                    median = df.loc[~masks[name], column].median()
+                df.loc[masks[name], column] = median
+                logging.info(f"     Replaced {int(masks[name].sum())} '{column}' values with median: {median}")
+
+            # Filter the rows once
+            n_dropped = int(drop_mask.sum())
+            if n_dropped > 0:
+                df = df[~drop_mask]
+            logging.info(f"     Removed {n_dropped} noisy rows, {len(df)} rows left")
+
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                logging.info(f"Noisy data handling completed successfully (peak traced memory: {peak / 2**20:.2f} MB)")
+            else:
+                logging.info("Noisy data handling completed successfully")
   
             return df
 
         except Exception as e:
+            if tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
             logging.error(f"Error in handle_noisy_data: {str(e)}")
             raise HotelBookingException(f"Error in handle_noisy_data: {str(e)}", sys) from e
 
 
 
-    # Function for Getting Data Preprocessing fucntions and saving preprocessing object (prerprocessing.pkl)
-    def get_preprocessing_functions(self) -> Pipeline: #tuple:
-        logging.info("Entered get_data_preprocessing_functions method of DataPreprocessing class")
+    # Function for Getting the Data Preprocessor (preprocessor.pkl) configured from schema.yaml
+    def get_preprocessor(self) -> HotelBookingPreprocessor:
+        """
+        Method Name :   get_preprocessor
+        Description :   Builds the (unfitted) preprocessor with the label encoding, one-hot encoding and scaling
+                        columns of the transformation section of schema.yaml.
+
+        Output      :   Returns the HotelBookingPreprocessor
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        logging.info("Entered get_preprocessor method of DataPreprocessing class")
         try:
             # Fetch schema config
             transformation_config = self._schema_config.get('transformation', {})
@@ -183,97 +216,39 @@ class DataPreprocessing:
             logging.info('Preprocessing columns fetched from schema.yaml')
 
 
-            # Define individual transformer functions
-            def label_encoding_function(data: pd.DataFrame) -> pd.DataFrame:
-                columns = label_encoding_columns if isinstance(label_encoding_columns, list) else [label_encoding_columns]
-                
-                for col in columns:
-                    if 'hotel' in col:
-                        # Handle label encoding for 'hotel' column
-                        data[col] = data[col].map(HOTEL_MAPPING)
-                        logging.info(f"Label encoding applied on column: hotel")
-
-                    if col != 'hotel':
-                        data[col] = data[col].apply(lambda x: MONTH_ORDER.index(x) + 1)
-                        logging.info(f"Label encoding applied on columns: {columns}")
-
-                return data
-
-            def onehot_encoding_function(data: pd.DataFrame) -> pd.DataFrame:
-                data = pd.get_dummies(data, columns=onehot_encoding_columns, drop_first=True)
-                logging.info(f"One-hot encoding applied on columns: {onehot_encoding_columns}")
-                return data
-
-            label_encoder = FunctionTransformer(label_encoding_function)
-            onehot_encoder = FunctionTransformer(onehot_encoding_function)
-            scaler = MinMaxScaler()
-
-            def scaling_function(data: pd.DataFrame) -> pd.DataFrame:
-                data[scaling_columns] = scaler.fit_transform(data[scaling_columns])
-                logging.info(f"Scaling applied on columns: {scaling_columns}")
-                return data
-
-            logging.info("Initialized MinMaxScaler, Custom One-hot Encoder, Label Encoder")
-
-
-            # Combine transformers in ColumnTransformer
-            transformers = []
-            if label_encoding_columns:
-                transformers.append(('label_encoder', label_encoder, label_encoding_columns))
-            if onehot_encoding_columns:
-                transformers.append(('onehot_encoder', onehot_encoder, onehot_encoding_columns))
-            if scaling_columns:
-                transformers.append(('scaler', scaler, scaling_columns))
-            
-            preprocessor = ColumnTransformer(transformers=transformers, remainder='passthrough')
-
-            # Create pipeline
-            data_pipeline = Pipeline(steps=[('preprocessor', preprocessor)])
-            logging.info("Pipeline created successfully.")
-
-
-            # Save the pipeline
-            save_object(self.data_preprocessing_config.preprocessed_object_file_path, data_pipeline)
-            logging.info("Preprocessing object (preprocessing.pkl) saved successfully.")
+            label_encoding_columns = label_encoding_columns if isinstance(label_encoding_columns, list) else [label_encoding_columns]
 
-            # return data_pipeline
-            return label_encoding_function, onehot_encoding_function, scaling_function
+            return HotelBookingPreprocessor(label_encoding_columns=label_encoding_columns,
+                                            onehot_encoding_columns=onehot_encoding_columns,
+                                            scaling_columns=scaling_columns)
 
         except Exception as e:
-            logging.error(f"Error in get_data_preprocessor_object: {str(e)}")
-            raise HotelBookingException(f"Error in get_data_preprocessor_object: {str(e)}", sys) from e
+            logging.error(f"Error in get_preprocessor: {str(e)}")
+            raise HotelBookingException(f"Error in get_preprocessor: {str(e)}", sys) from e
         
 
 
-    # Function for applying preprocessing methods on dataframe
+    # Function for fitting the preprocessor, applying it on dataframe and saving it (preprocessor.pkl)
     def apply_preprocessing_functions(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Method Name : apply_preprocessing_functions
-        Description : This function applies preprocessing methods fetched from get_preprocessing_functions on DataFrame. 
+        Description : This function fits the preprocessor of get_preprocessor on the DataFrame once (label mappings,
+                      one-hot vocabularies, scaler min/max), transforms the DataFrame with it and saves the fitted
+                      preprocessor, which then serves batch and single-record transforms without refitting.
 
         returns     : dataframe with preprocessing functions applied
         On Failure  : Write an exception log and raise the exception
         """
         try:
-            # Initialize preprocessing functions
-            logging.info("Start initializing data preprocessing functions")
-            label_enocder, onehot_enoder, scaler = self.get_preprocessing_functions() 
-            logging.info("Initialized data preprocessing functions")
-
-            # label encoding
-            logging.info("\tAppliying label_encoding") 
-            df = label_enocder(df)
-            logging.info("Applied label_encoding") 
-            
-            # onehot encoding
-            logging.info("\tAppliying onehot_encoding") 
-            df = onehot_enoder(df)
-            logging.info("Applied onehot_encoding")  
+            # Fit the preprocessor and transform the dataset
+            logging.info("\tFitting the preprocessor (label encoding, onehot encoding, scaler)")
+            preprocessor = self.get_preprocessor().fit(df)
+            df = preprocessor.transform(df)
+            logging.info("Applied label_encoding, onehot_encoding and scaler")
 
-            # scaler
-            logging.info("\tAppliying scaler") 
-            df = scaler(df)
-            logging.info("Applied scaler") 
+            # Save the fitted preprocessor
+            save_object(self.data_preprocessing_config.preprocessed_object_file_path, preprocessor)
+            logging.info("Preprocessing object (preprocessor.pkl) saved successfully.")
 
             # return the encoded and scaled dataframe
             return df
@@ -284,25 +259,214 @@ class DataPreprocessing:
 
 
 
+    # Function for reading and cleaning the dataset chunk by chunk
+    def read_clean_chunks(self, medians: Optional[dict] = None):
+        """
+        Method Name :   read_clean_chunks
+        Description :   Streams the dataset in chunks of chunk_size rows and runs the drop, missing value and
+                        noisy data steps on every chunk (replace_median values replaced with medians). The
+                        chunks get the stable dtypes of coerce_stable_dtypes, so they share one schema.
+
+        Output      :   Yields (raw chunk, cleaned chunk) pairs
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            for chunk in read_data_in_chunks(self.data_ingestion_artifact.data_file_path,
+                                             self.data_preprocessing_config.chunk_size):
+                chunk = self.handle_missing_values(self.drop_directly_related_features(coerce_stable_dtypes(chunk, self._schema_config)))
+                yield chunk, self.handle_noisy_data(chunk.copy(), medians=medians)
+
+        except Exception as e:
+            logging.error(f"Error in read_clean_chunks: {str(e)}")
+            raise HotelBookingException(f"Error in read_clean_chunks: {str(e)}", sys) from e
+
+
+
+    # Function for the first pass of chunked preprocessing: fitting the preprocessor chunk by chunk
+    def fit_preprocessor_in_chunks(self) -> tuple:
+        """
+        Method Name :   fit_preprocessor_in_chunks
+        Description :   First streaming pass of chunked preprocessing. Collects the fit statistics of the whole
+                        dataset one chunk at a time: the value counts of the values the replace_median noise rules
+                        keep (for the exact medians used by handle_noisy_data, e.g. of the non-negative ADR values)
+                        and, through partial_fit, the category vocabularies and the scaler min/max. Replaced values
+                        are left out of the min/max until the medians are known, they are then added if any of
+                        them survived the noisy row filters.
+
+        Output      :   Returns the fitted preprocessor and the medians (column -> median) of the replace_median rules
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            preprocessor = self.get_preprocessor()
+            replace_rules = {name: rule for name, rule in self._noise_rules.items() if rule["action"] == "replace_median"}
+            value_counts = {rule["column"]: pd.Series(dtype=np.int64) for rule in replace_rules.values()}
+            replaced_rows = dict.fromkeys(value_counts, 0)
+
+            for chunk, cleaned in self.read_clean_chunks(medians=dict.fromkeys(value_counts, np.nan)):
+                masks, _ = evaluate_noise_rules(chunk, replace_rules, self._eval_engine)
+                for name, rule in replace_rules.items():
+                    column = rule["column"]
+                    value_counts[column] = value_counts[column].add(chunk.loc[~masks[name], column].value_counts(), fill_value=0)
+                    replaced_rows[column] += int(cleaned[column].isna().sum())
+                preprocessor.partial_fit(cleaned)
+
+            if getattr(preprocessor, "input_columns_", None) is None:
+                raise ValueError(f"No rows to preprocess in {self.data_ingestion_artifact.data_file_path}")
+
+            medians = {column: median_from_counts(counts) for column, counts in value_counts.items()}
+            replaced_medians = {column: [median] for column, median in medians.items() if replaced_rows[column] > 0}
+            if replaced_medians:
+                preprocessor.partial_fit(pd.DataFrame(replaced_medians))
+            logging.info(f"Fitted the preprocessor in chunks (medians: {medians}, values to replace: {replaced_rows})")
+
+            return preprocessor, medians
+
+        except Exception as e:
+            logging.error(f"Error in fit_preprocessor_in_chunks: {str(e)}")
+            raise HotelBookingException(f"Error in fit_preprocessor_in_chunks: {str(e)}", sys) from e
+
+
+
+    # Function for chunked preprocessing: fit pass, then transform and write pass
+    def preprocess_in_chunks(self) -> int:
+        """
+        Method Name :   preprocess_in_chunks
+        Description :   Out-of-core preprocessing in two streaming passes over the dataset: the first fits the
+                        preprocessor (fit_preprocessor_in_chunks), the second cleans, transforms and appends every
+                        chunk to the processed data file.
+                        Peak memory is bounded by the chunk size, and the output has the same values as the
+                        in-memory path.
+
+        Output      :   Returns the number of rows written, the fitted preprocessor (preprocessor.pkl) is saved
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            logging.info("\tPass 1: fitting the preprocessor (noise rule medians, vocabularies, scaler min/max) in chunks")
+            preprocessor, medians = self.fit_preprocessor_in_chunks()
+
+            logging.info("\tPass 2: cleaning, transforming and writing the dataset in chunks")
+            with DataWriter(self.data_preprocessing_config.processed_data_file_path) as writer:
+                for _, cleaned in self.read_clean_chunks(medians=medians):
+                    writer.write(preprocessor.transform(cleaned))
+            n_rows = writer.n_rows
+
+            save_object(self.data_preprocessing_config.preprocessed_object_file_path, preprocessor)
+            logging.info(f"Preprocessed {n_rows} rows in chunks of {self.data_preprocessing_config.chunk_size}, "
+                         "preprocessing object (preprocessor.pkl) saved successfully.")
+
+            return n_rows
+
+        except Exception as e:
+            logging.error(f"Error in preprocess_in_chunks: {str(e)}")
+            raise HotelBookingException(f"Error in preprocess_in_chunks: {str(e)}", sys) from e
+
+
+
+    # Function for writing an output, in the background when a background writer is given
+    def persist(self, function, *args) -> None:
+        if self.background_writer is not None:
+            self.background_writer.submit(function, *args)
+        else:
+            function(*args)
+
+
+
+    # Function for the cache key of the preprocessing outputs
+    def get_cache_key(self) -> str:
+        """
+        Method Name :   get_cache_key
+        Description :   Content-addressed key of the preprocessing outputs: hash of the input data file, of the
+                        schema.yaml sections the stage reads, of the output options and of the code version (source
+                        files of the preprocessing modules, noise rules and constants, pandas / numpy / scikit-learn
+                        versions).
+
+        Output      :   Returns the hexadecimal key
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            import sklearn
+            from src.core.utils import data_utils, dtype_utils, encoding_utils, rules_utils, sketch_utils
+            from src.core.constants import common_constant
+            from src.data import preprocessor
+
+            config = self.data_preprocessing_config
+            # The noise rules are compiled by rules_utils, the fixed label mappings and the target come from common_constant
+            code_version = {
+                "source": code_fingerprint([sys.modules[__name__], preprocessor, encoding_utils, dtype_utils, data_utils,
+                                            sketch_utils, rules_utils, common_constant]),
+                "libraries": {"pandas": pd.__version__, "numpy": np.__version__, "sklearn": sklearn.__version__},
+            }
+            options = {
+                "chunked_preprocessing": config.chunked_preprocessing,
+                "processed_data_file": os.path.basename(config.processed_data_file_path),
+            }
+
+            return cache_key(file_fingerprint(self.data_ingestion_artifact.data_file_path),
+                             {section: self._schema_config.get(section) for section in DATA_PREPROCESSING_SCHEMA_SECTIONS},
+                             options,
+                             code_version)
+
+        except Exception as e:
+            logging.error(f"Error in get_cache_key: {str(e)}")
+            raise HotelBookingException(f"Error in get_cache_key: {str(e)}", sys) from e
+
+
+
+    # Function for the output files of the stage, by their name in the cache
+    def get_output_files(self) -> dict:
+        processed_data_file_path = self.data_preprocessing_config.processed_data_file_path
+        return {os.path.basename(processed_data_file_path): processed_data_file_path,
+                os.path.basename(self.data_preprocessing_config.preprocessed_object_file_path):
+                    self.data_preprocessing_config.preprocessed_object_file_path}
+
+
+
     # Putting all together and initializing the data preprocessing function
     def initiate_data_preprocessing(self) -> DataPreprocessingArtifact:
         """
         Method Name :   initiate_data_preprocessing
-        Description :   This method initiates the data preprocessing component for the pipeline 
+        Description :   This method initiates the data preprocessing component for the pipeline. With use_cache
+                        the outputs are stored under a content-addressed key (get_cache_key), and a later run with
+                        the same data, schema sections and code restores them instead of recomputing.
         
         Output      :   data preprocessing steps are performed and preprocessor object is created  
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            if self.data_validation_artifact.validation_status:
+            data_preprocessing_artifact = DataPreprocessingArtifact(
+                preprocessed_object_file_path=self.data_preprocessing_config.preprocessed_object_file_path,
+                processed_data_file_path=self.data_preprocessing_config.processed_data_file_path
+            )
+
+            cache, key = None, None
+            if self.data_validation_artifact.validation_status and self.data_preprocessing_config.use_cache:
+                cache = ArtifactCache(self.data_preprocessing_config.cache_dir, self.data_preprocessing_config.cache_max_bytes)
+                key = self.get_cache_key()
+
+                if cache.get(key, self.get_output_files()):
+                    # Same data, schema sections and code as a previous run, its outputs are restored
+                    logging.info(f"Preprocessing cache hit ({key[:12]}), restored the preprocessed dataset and preprocessor")
+                    return data_preprocessing_artifact
 
-                # Fetching dataset
+            if self.data_validation_artifact.validation_status and self.data_preprocessing_config.chunked_preprocessing:
+
+                # Two streaming passes over the dataset, one chunk in memory at a time
+                logging.info("Start chunked preprocessing of dataset")
+                self.preprocess_in_chunks()
+                logging.info("Preprocessed and saved dataset in chunks")
+
+            elif self.data_validation_artifact.validation_status:
+
+                # Fetching dataset (handed over in memory by data validation, if it was)
                 logging.info("Start Fetching dataset")
-                df = read_data(file_path=self.data_ingestion_artifact.data_file_path)
+                if self.data_validation_artifact.dataframe is not None:
+                    df = self.data_validation_artifact.dataframe
+                else:
+                    df = read_data(file_path=self.data_ingestion_artifact.data_file_path, schema_config=self._schema_config)
                 logging.info("Fetched dataset")
 
 
-                # Drop directly related features
+                # Drop directly related features (returns a copy, the handed over dataframe is never modified)
                 logging.info("Start Dropping directly related features from dataset")
                 df = self.drop_directly_related_features(df)
                 logging.info("Dropped directly related features from dataset")
@@ -324,25 +488,29 @@ class DataPreprocessing:
                 logging.info("Start Appliying Data Preprocessing fucntions on Dataset")
                 df = self.apply_preprocessing_functions(df)
                 logging.info("Applied Data Preprocessing fucntions on Dataset")
-                
+
 
                 # Saving preprocessed train dataset
                 logging.info("Start Saving preprocessed dataset")
-                save_data(df, self.data_preprocessing_config.processed_data_file_path)
+                self.persist(save_data, df, self.data_preprocessing_config.processed_data_file_path)
                 logging.info("Saved preprocessed dataset")
 
+                # In-memory handoff of the processed data, data split skips reading the file
+                if self.data_preprocessing_config.in_memory_handoff:
+                    data_preprocessing_artifact.data = df
 
-                logging.info("Exited initiate_data_preprocessor method of DataPreprocessor class")
+            else:
+                raise Exception(self.data_validation_artifact.message)
 
-                data_preprocessing_artifact = DataPreprocessingArtifact(
-                    preprocessed_object_file_path=self.data_preprocessing_config.preprocessed_object_file_path,
-                    processed_data_file_path=self.data_preprocessing_config.processed_data_file_path
-                )
+            if cache is not None:
+                # Queued after the writes of the outputs when they run in the background
+                self.persist(cache.put, key, self.get_output_files())
+                logging.info(f"Stored the preprocessing outputs in the cache ({key[:12]})")
 
-                return data_preprocessing_artifact
 
-            else:
-                raise Exception(self.data_validation_artifact.message)
+            logging.info("Exited initiate_data_preprocessor method of DataPreprocessor class")
+
+            return data_preprocessing_artifact
 
         except Exception as e:
             logging.error(f"Error in initialize_data_preprocessing: {str(e)}")
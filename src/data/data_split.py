@@ -3,6 +3,10 @@
 import os
 import sys
 
+from typing import Optional
+
+import numpy as np
+
 from src.core.logger import logging
 from src.core.exception import HotelBookingException
 
@@ -11,9 +15,14 @@ from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
                                                DataSplitArtifact)
 
 from src.core.utils.data_utils import (read_data, save_data)
-from src.core.utils.train_test_split_utils import split_into_train_test_val
+from src.core.utils.train_test_split_utils import (split_into_train_test_val,
+                                                   split_indices,
+                                                   take_rows)
+from src.core.utils.thread_utils import BackgroundWriter
 
-from src.core.constants.common_constant import TEST_SET_SPLIT_RATIO
+from src.core.constants.common_constant import (TEST_SET_SPLIT_RATIO,
+                                                TARGET_COLUMN)
+from src.core.constants.data_constant import DATA_SPLIT_INDEX_FILE
 
 
 
@@ -25,13 +34,15 @@ class DataSplit:
 
     def __init__(self, 
                  data_preprocessing_artifact: DataPreprocessingArtifact,
-                 data_split_config: DataSplitConfig):
+                 data_split_config: DataSplitConfig,
+                 background_writer: Optional[BackgroundWriter] = None):
         """
         Initialize DataSplit class with configuration and ingestion artifacts.
 
         Parameters:
         - data_split_config: DataSplitConfig
         - data_preprocessing_artifact: DataPreprocessingArtifact
+        - background_writer: BackgroundWriter writing the splits in the in-memory handoff mode (synchronous if None)
         """
         try:
             logging.info("")
@@ -40,12 +51,78 @@ class DataSplit:
 
             self.data_split_config = data_split_config
             self.data_preprocessing_artifact = data_preprocessing_artifact
+            self.background_writer = background_writer
 
         except Exception as e:
             logging.error(f"Error in DataSplit initialization: {str(e)}")
             raise HotelBookingException(f"Error during DataSplit initialization: {str(e)}", sys) from e
 
 
+    def persist(self, function, *args) -> None:
+        """
+        Run a write function, in the background when a background writer is given.
+        """
+        if self.background_writer is not None:
+            self.background_writer.submit(function, *args)
+        else:
+            function(*args)
+
+
+    def get_index_file_path(self, scheme: str, subset: str) -> str:
+        """
+        Return the row index file of a split scheme and subset ('train' or 'test').
+        """
+        return os.path.join(self.data_split_config.splitted_data_dir, DATA_SPLIT_INDEX_FILE.format(scheme=scheme, subset=subset))
+
+
+    def split_into_indices(self) -> DataSplitArtifact:
+        """
+        Index split mode: save the train and test row indices of every scheme of split_schemes as .npy files next
+        to the single processed dataset, instead of copies of its rows. The artifact points to the index files of
+        split_scheme and to the processed dataset; the model stages take the rows from it when they read them.
+
+        Returns:
+        - DataSplitArtifact
+        """
+        try:
+            data_path = self.data_preprocessing_artifact.processed_data_file_path
+            data = self.data_preprocessing_artifact.data
+            if data is None:
+                logging.info(f"Loading dataset from {data_path}.")
+                data = read_data(data_path)
+
+            # Class labels of the rows, for the stratified scheme
+            n_rows, labels = len(data), data[TARGET_COLUMN].to_numpy()
+
+            # The scheme of the artifact is always saved
+            schemes = dict.fromkeys((*self.data_split_config.split_schemes, self.data_split_config.split_scheme))
+
+            os.makedirs(self.data_split_config.splitted_data_dir, exist_ok=True)
+            split_rows = {}
+            for scheme in schemes:
+                split_rows[scheme] = split_indices(n_rows, TEST_SET_SPLIT_RATIO, scheme, stratify=labels)
+                for subset, rows in zip(("train", "test"), split_rows[scheme]):
+                    self.persist(np.save, self.get_index_file_path(scheme, subset), rows)
+                logging.info(f"\t{scheme} split: {len(split_rows[scheme][0])} train rows, {len(split_rows[scheme][1])} test rows")
+
+            scheme = self.data_split_config.split_scheme
+            data_split_artifact = DataSplitArtifact(
+                train_data_file_path=self.get_index_file_path(scheme, "train"),
+                test_data_file_path=self.get_index_file_path(scheme, "test"),
+                data_file_path=data_path
+            )
+            if self.data_split_config.in_memory_handoff:
+                train_rows, test_rows = split_rows[scheme]
+                data_split_artifact.train_data = take_rows(data, train_rows)
+                data_split_artifact.test_data = take_rows(data, test_rows)
+            logging.info(f"Data Split artifact: {data_split_artifact}")
+
+            return data_split_artifact
+
+        except Exception as e:
+            raise HotelBookingException(f"Error occurred in split_into_indices method of DataSplit class: {str(e)}", sys) from e
+
+
     def initiate_data_split(self) -> DataSplitArtifact:
         """
         Split the data into train, test, and validation sets and save them to respective paths.
@@ -55,10 +132,17 @@ class DataSplit:
         """
         logging.info("Entered the initiate_data_split method of DataSplit class.")
         try:
-            # Load the dataset
-            data_path = self.data_preprocessing_artifact.processed_data_file_path
-            logging.info(f"Loading dataset from {data_path}.")
-            data = read_data(data_path)
+            if self.data_split_config.index_split:
+                return self.split_into_indices()
+
+            # Load the dataset (handed over in memory by data preprocessing, if it was)
+            if self.data_preprocessing_artifact.data is not None:
+                logging.info("Using the dataset handed over by data preprocessing.")
+                data = self.data_preprocessing_artifact.data
+            else:
+                data_path = self.data_preprocessing_artifact.processed_data_file_path
+                logging.info(f"Loading dataset from {data_path}.")
+                data = read_data(data_path)
 
 
             # Perform train-test-validation split using utility
@@ -77,10 +161,10 @@ class DataSplit:
             os.makedirs(os.path.dirname(self.data_split_config.test_data_file_path), exist_ok=True)
 
 
-            save_data(train_data, self.data_split_config.train_data_file_path)
+            self.persist(save_data, train_data, self.data_split_config.train_data_file_path)
             logging.info(f"Training data saved at {self.data_split_config.train_data_file_path}.")
 
-            save_data(test_data, self.data_split_config.test_data_file_path)
+            self.persist(save_data, test_data, self.data_split_config.test_data_file_path)
             logging.info(f"Testing data saved at {self.data_split_config.test_data_file_path}.")
 
 
@@ -89,6 +173,9 @@ class DataSplit:
                 train_data_file_path=self.data_split_config.train_data_file_path,
                 test_data_file_path=self.data_split_config.test_data_file_path
             )
+            if self.data_split_config.in_memory_handoff:
+                data_split_artifact.train_data = train_data
+                data_split_artifact.test_data = test_data
             logging.info(f"Data Split artifact: {data_split_artifact}")
 
 
@@ -1,11 +1,14 @@
+import os
 import sys
 import json
+import hashlib
 
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Optional
 from pandas import DataFrame
 
-from evidently.model_profile import Profile
-from evidently.model_profile.sections import DataDriftProfileSection
-
 from src.core.logger import logging
 from src.core.exception import HotelBookingException
 
@@ -13,8 +16,26 @@ from src.core.entities.config_entity import DataValidationConfig
 from src.core.entities.artifact_entity import (DataIngestionArtifact,
                                                DataValidationArtifact)
 
-from src.core.utils.data_utils import read_data
+from src.core.utils.data_utils import (read_data,
+                                       read_data_in_chunks,
+                                       save_data)
+from src.core.utils.json_utils import (read_json, write_json, write_jsonl)
 from src.core.utils.yaml_utils import (read_yaml, write_yaml)
+from src.core.utils.drift_utils import (detect_dataset_drift,
+                                        detect_dataset_drift_from_sketches,
+                                        detect_dataset_drift_parallel,
+                                        flatten_drift_report,
+                                        get_drift_columns)
+from src.core.utils.dtype_utils import (apply_schema_dtypes,
+                                        coerce_stable_dtypes)
+from src.core.utils.rules_utils import (ValidationRules,
+                                        compile_validation_rules)
+from src.core.utils.sketch_utils import (make_sketch,
+                                         sketch_from_dict)
+from src.core.utils.sampling_utils import (BottomKSampler,
+                                           dkw_epsilon,
+                                           dkw_sample_size,
+                                           sample_distance_bounds)
 from src.core.utils.train_test_split_utils import train_test_split_for_data_validation
 
 from src.core.constants.common_constant import (SCHEMA_FILE_PATH,
@@ -39,127 +60,500 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
             self._schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+            self._validation_rules = compile_validation_rules(self._schema_config)
         
         except Exception as e:
             logging.error(f"Error in DataValidation initialization: {str(e)}")
             raise HotelBookingException(f"Error during DataValidation initialization: {str(e)}", sys) from e
 
 
-    def validate_number_of_columns(self, dataframe: DataFrame) -> bool:
+    def check_data_quality(self, dataframe: DataFrame, validation_rules: ValidationRules) -> ValidationRules:
         """
-        Validates if the number of required columns (excluding sensitive columns) in the DataFrame 
-        matches the schema configuration. Logs missing columns for better traceability.
+        Method Name :   check_data_quality
+        Description :   This method evaluates the data quality rules of schema.yaml (column presence, dtype, min/max,
+                        allowed categories, nullability, uniqueness) over an in-memory DataFrame, one vectorised
+                        pass per chunk of chunk_size rows (the chunks are slices, not copies).
+                        The streaming passes update the rules while sketching instead.
+        
+        Output      :   Returns the rules engine holding the violations
+        On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            # Retrieve schema and sensitive columns from the configuration
-            numerical_columns = self._schema_config.get("numerical_columns", [])
-            categorical_columns = self._schema_config.get("categorical_columns", [])
-            sensitive_columns = self._schema_config.get("sensitive_columns", [])
-            
-            
-            # Combine numerical and categorical columns into required columns
-            required_columns = numerical_columns + categorical_columns
-            required_columns = [col for col in required_columns if col not in sensitive_columns]
-
-            
-            # Identify any missing columns
-            missing_columns = [col for col in required_columns if col not in dataframe.columns]
-            
-
-            # Validation status
-            status = len(missing_columns) == 0
-
-
-            # Logging the validation result and details
-            if status:
-                logging.info("All required columns are present (excluding sensitive columns).")
-            
-            else:
-                logging.error(f"Missing required columns: {missing_columns}")
-                logging.info(f"Columns in DataFrame: {list(dataframe.columns)}")
-                logging.info(f"Expected required columns: {required_columns}")
-            
-            
-            return status
+            chunk_size = self.data_validation_config.chunk_size
+
+            validation_rules.check_columns(dataframe.columns)
+            for start_row in range(0, len(dataframe), chunk_size):
+                validation_rules.update(dataframe.iloc[start_row: start_row + chunk_size], start_row=start_row)
+
+            return validation_rules
+
+        except Exception as e:
+            logging.error(f"Error in check_data_quality: {str(e)}")
+            raise HotelBookingException(f"Error in check_data_quality: {str(e)}", sys) from e
+
+
+
+    def save_data_quality_report(self, validation_rules: ValidationRules) -> bool:
+        """
+        Method Name :   save_data_quality_report
+        Description :   This method writes the data quality report (violation counts and sample row positions per
+                        rule) and logs the missing columns and violated rules
         
+        Output      :   Returns True if every rule passed
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            report = validation_rules.report()
+            write_json(self.data_validation_config.quality_report_file_path, report, replace=True)
+
+
+            if report["missing_columns"]:
+                logging.error(f"Missing required columns: {report['missing_columns']}")
+
+            for violation in report["violations"]:
+                logging.error(f"Column '{violation['column']}' violates its {violation['rule']} rule "
+                              f"({violation['value']}) in {violation['count']} rows, e.g. rows {violation['sample_rows']}")
+
+
+            logging.info(f"Checked the data quality rules over {report['n_rows']} rows: "
+                         f"{len(report['violations'])} rules violated.")
+            return report["status"]
+
         except Exception as e:
-            logging.error(f"Error in validate_number_of_columns: {str(e)}")
-            raise HotelBookingException(f"Error in validate_number_of_columns: {str(e)}", sys) from e
+            logging.error(f"Error in save_data_quality_report: {str(e)}")
+            raise HotelBookingException(f"Error in save_data_quality_report: {str(e)}", sys) from e
 
 
 
-    def is_column_exist(self, df: DataFrame) -> bool:
+    def detect_dataset_drift(self, reference_df: DataFrame, current_df: DataFrame, sampling: Optional[dict] = None) -> bool:
         """
-        Method Name :   is_column_exist
-        Description :   This method validates the existence of a numerical and categorical columns
+        Method Name :   detect_dataset_drift
+        Description :   This method validates if drift is detected, with the native NumPy/SciPy drift engine
+                        (KS test for numerical, chi-square or PSI for categorical columns of schema.yaml)
+                        or with Evidently, depending on the drift_backend of the configuration.
+                        The sampling details (sizes and distance bounds), if given, are added to the report.
         
         Output      :   Returns bool value based on validation results
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            dataframe_columns = df.columns
-            missing_numerical_columns = []
-            missing_categorical_columns = []
-            
-            
-            for column in self._schema_config.get("numerical_columns",[]):
-                if column not in dataframe_columns:
-                    missing_numerical_columns.append(column)
+            config = self.data_validation_config
+
+            if config.drift_backend == "evidently":
+                engine = "evidently"
+                json_report = self.get_evidently_drift_report(reference_df, current_df)
+            elif config.drift_backend == "native" and config.n_jobs != 1:
+                engine = "native-parallel"
+                logging.info(f"Running the column drift tests in {config.n_jobs if config.n_jobs > 0 else os.cpu_count()} worker processes")
+                json_report = detect_dataset_drift_parallel(reference_df, current_df, self._schema_config,
+                                                            n_jobs=config.n_jobs,
+                                                            categorical_stattest=config.categorical_stattest,
+                                                            stattest_threshold=config.stattest_threshold,
+                                                            psi_threshold=config.psi_threshold,
+                                                            drift_share=config.drift_share)
+            elif config.drift_backend == "native":
+                engine = "native"
+                json_report = detect_dataset_drift(reference_df, current_df, self._schema_config,
+                                                   categorical_stattest=config.categorical_stattest,
+                                                   stattest_threshold=config.stattest_threshold,
+                                                   psi_threshold=config.psi_threshold,
+                                                   drift_share=config.drift_share)
+            else:
+                raise ValueError(f"Unknown drift backend '{config.drift_backend}', expected 'native' or 'evidently'")
 
-            
-            if len(missing_numerical_columns)>0:
-                logging.info(f"Missing numerical column: {missing_numerical_columns}")
+            # The samples of the sampling mode are tested by the backend, the report records the mode
+            if sampling is not None:
+                engine = "sample"
+                json_report["sampling"] = sampling
 
 
-            for column in self._schema_config.get("categorical_columns", []):
-                if column not in dataframe_columns:
-                    missing_categorical_columns.append(column)
+            return self.save_drift_report(json_report, engine)
 
+        except Exception as e:
+            logging.error(f"Error in detect_data_drift: {str(e)}")
+            raise HotelBookingException(f"Error in detect_data_drift: {str(e)}", sys) from e
 
-            if len(missing_categorical_columns)>0:
-                logging.info(f"Missing categorical column: {missing_categorical_columns}")
 
 
-            return False if len(missing_categorical_columns)>0 or len(missing_numerical_columns)>0 else True
+    def build_drift_sketches(self,
+                             current_share: float = VALIDATION_REPORT_SPLIT_RATIO,
+                             start_row: int = 0,
+                             validation_rules: Optional[ValidationRules] = None,
+                             row_digest: Optional["hashlib._Hash"] = None) -> tuple:
+        """
+        Method Name :   build_drift_sketches
+        Description :   This method makes one chunked pass over the ingested data file (from start_row on). Every row
+                        is assigned to the reference or the current sample by a seeded Bernoulli draw (current_share
+                        of the rows go to current, 0 and 1 put every row in one sample), and added to mergeable
+                        per-column sketches of its sample: histograms for numerical, frequency tables for
+                        categorical and boolean columns.
+                        The data quality rules, if given, are evaluated on the same chunks, and the row digest,
+                        if given, is updated with the rows read (see update_row_digest).
+                        Memory is bounded by the chunk size and the sketch sizes, whatever the number of rows.
+        
+        Output      :   Returns (empty DataFrame with the columns of the file, columns checked for drift,
+                        reference sketches, current sketches, number of rows read)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_validation_config
+            data_file_path = self.data_ingestion_artifact.data_file_path
+            rng = np.random.default_rng(config.split_seed)
+
+            # The columns are taken from the first row of the file, so they are known even without new rows
+            header = next(read_data_in_chunks(data_file_path, chunk_size=1)).head(0)
+            columns = get_drift_columns(header, header, self._schema_config)
+            reference_sketches = {column: make_sketch(column_type, config.sketch_bins) for column, column_type in columns.items()}
+            current_sketches = {column: make_sketch(column_type, config.sketch_bins) for column, column_type in columns.items()}
+            n_rows = 0
+            if validation_rules is not None:
+                validation_rules.check_columns(header.columns)
+
+            for chunk in read_data_in_chunks(data_file_path, config.chunk_size, start_row=start_row):
+                if validation_rules is not None:
+                    validation_rules.update(chunk, start_row=start_row + n_rows)
+                if row_digest is not None:
+                    self.update_row_digest(row_digest, chunk)
+
+                is_current = rng.random(len(chunk)) < current_share
+                for column in columns:
+                    values = chunk[column].to_numpy()
+                    reference_sketches[column].update(values[~is_current])
+                    current_sketches[column].update(values[is_current])
+
+                n_rows += len(chunk)
+
+            logging.info(f"Built drift sketches of {len(columns)} columns over {n_rows} rows (from row {start_row})")
+            return header, columns, reference_sketches, current_sketches, n_rows
 
         except Exception as e:
-            logging.error(f"Error in is_column_exist: {str(e)}")
-            raise HotelBookingException(f"Error in is_column_exist: {str(e)}", sys) from e        
+            logging.error(f"Error in build_drift_sketches: {str(e)}")
+            raise HotelBookingException(f"Error in build_drift_sketches: {str(e)}", sys) from e
 
 
 
-    def detect_dataset_drift(self, reference_df: DataFrame, current_df: DataFrame, ) -> bool:
+    def update_row_digest(self, row_digest: "hashlib._Hash", dataframe: DataFrame) -> None:
         """
-        Method Name :   detect_dataset_drift
-        Description :   This method validates if drift is detected
+        Method Name :   update_row_digest
+        Description :   This method adds the hash of every row of the dataframe to a SHA-256 digest. The values get
+                        stable dtypes first, so the digest of the same rows does not depend on how the file is
+                        split into chunks (e.g. an integer column read as float in a chunk with missing values).
+
+        Output      :   None, the digest is updated in place
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            dataframe = coerce_stable_dtypes(dataframe, self._schema_config)
+            row_digest.update(pd.util.hash_pandas_object(dataframe, index=False).to_numpy().tobytes())
+
+        except Exception as e:
+            logging.error(f"Error in update_row_digest: {str(e)}")
+            raise HotelBookingException(f"Error in update_row_digest: {str(e)}", sys) from e
+
+
+
+    def refresh_reference_profile(self) -> str:
+        """
+        Method Name :   refresh_reference_profile
+        Description :   This method stores the profile of the ingested data as the new reference: per-column summaries,
+                        histograms and category frequencies, built in one chunked pass. It is called when a model
+                        trained on this data is accepted, later validations compare only the new rows with it.
+                        The digest of the profiled rows is stored with it, to tell appended rows from a data
+                        file that was rewritten since (e.g. by a full refresh of the ingestion).
+        
+        Output      :   Returns the file path of the reference profile
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            row_digest = hashlib.sha256()
+            _, columns, reference_sketches, _, n_rows = self.build_drift_sketches(current_share=0.0, row_digest=row_digest)
+
+            reference_profile = {
+                "data_file_path": self.data_ingestion_artifact.data_file_path,
+                "n_rows": n_rows,
+                "rows_fingerprint": row_digest.hexdigest(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "columns": {column: {"type": column_type, "sketch": reference_sketches[column].to_dict()}
+                            for column, column_type in columns.items()},
+            }
+
+            reference_profile_file_path = self.data_validation_config.reference_profile_file_path
+            write_json(reference_profile_file_path, reference_profile, replace=True)
+            logging.info(f"Saved reference profile of {n_rows} rows into {reference_profile_file_path}")
+
+            return reference_profile_file_path
+
+        except Exception as e:
+            logging.error(f"Error in refresh_reference_profile: {str(e)}")
+            raise HotelBookingException(f"Error in refresh_reference_profile: {str(e)}", sys) from e
+
+
+
+    def build_sketches_against_reference_profile(self, validation_rules: Optional[ValidationRules] = None) -> Optional[tuple]:
+        """
+        Method Name :   build_sketches_against_reference_profile
+        Description :   This method loads the stored reference profile and compares the rows ingested after it with
+                        it. One chunked pass sketches the rows the profile covers and the rows after them apart,
+                        and hashes the former: if their digest still matches the profile, the data file only got
+                        new rows appended and only these are compared; otherwise (e.g. a full refresh replaced the
+                        file) both sketches are merged and every row is compared with the profile. The data
+                        quality rules, if given, are evaluated on every row. The profile is not used in the
+                        sampling mode (sampling_validation); with the profile, the sketch tests run in this process
+                        whatever the drift_backend and n_jobs of the configuration.
+        
+        Output      :   Returns (empty DataFrame with the columns of the file, columns checked for drift,
+                        reference sketches, current sketches, number of rows compared), or None without a profile
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_validation_config
+            if not (config.use_reference_profile and os.path.exists(config.reference_profile_file_path)):
+                return None
+
+            # The sampling mode is an explicit opt-in, it takes precedence over the (default) reference profile
+            if config.sampling_validation:
+                logging.warning("sampling_validation is enabled, the reference profile is not used: "
+                                "the drift is tested on samples of the whole data file")
+                return None
+
+            # The profile holds sketches, not rows: neither Evidently nor the column workers can test them
+            if config.drift_backend != "native" or config.n_jobs != 1:
+                logging.warning(f"The reference profile is compared with sketches in this process: drift_backend="
+                                f"'{config.drift_backend}' and n_jobs={config.n_jobs} are not used, disable "
+                                f"use_reference_profile to apply them")
+
+            reference_profile = read_json(config.reference_profile_file_path)
+            profiled_rows = reference_profile["n_rows"]
+            logging.info(f"Loaded reference profile of {profiled_rows} rows "
+                         f"created at {reference_profile['created_at']}")
+
+            data_file_path = self.data_ingestion_artifact.data_file_path
+            header = next(read_data_in_chunks(data_file_path, chunk_size=1)).head(0)
+            columns = get_drift_columns(header, header, self._schema_config)
+            profiled_sketches = {column: make_sketch(column_type, config.sketch_bins) for column, column_type in columns.items()}
+            current_sketches = {column: make_sketch(column_type, config.sketch_bins) for column, column_type in columns.items()}
+            row_digest = hashlib.sha256()
+            n_rows = 0
+            if validation_rules is not None:
+                validation_rules.check_columns(header.columns)
+
+            for chunk in read_data_in_chunks(data_file_path, config.chunk_size):
+                if validation_rules is not None:
+                    validation_rules.update(chunk, start_row=n_rows)
+
+                # Rows covered by the profile come first, the appended rows after them
+                n_profiled = min(max(profiled_rows - n_rows, 0), len(chunk))
+                if n_profiled:
+                    self.update_row_digest(row_digest, chunk.iloc[:n_profiled])
+                for column in columns:
+                    values = chunk[column].to_numpy()
+                    profiled_sketches[column].update(values[:n_profiled])
+                    current_sketches[column].update(values[n_profiled:])
+
+                n_rows += len(chunk)
+
+            if n_rows >= profiled_rows and row_digest.hexdigest() == reference_profile.get("rows_fingerprint"):
+                n_compared = n_rows - profiled_rows
+            else:
+                logging.info("Data file was rewritten since the reference profile (e.g. full refresh), comparing all of its rows")
+                for column in columns:
+                    current_sketches[column].merge(profiled_sketches[column])
+                n_compared = n_rows
+            logging.info(f"Built drift sketches of {len(columns)} columns over {n_compared} rows compared with the reference profile")
+
+            # Only the columns profiled with the same type can be compared
+            profile_columns = reference_profile["columns"]
+            columns = {column: column_type for column, column_type in columns.items()
+                       if profile_columns.get(column, {}).get("type") == column_type}
+            reference_sketches = {column: sketch_from_dict(profile_columns[column]["sketch"]) for column in columns}
+
+            return header, columns, reference_sketches, current_sketches, n_compared
+
+        except Exception as e:
+            logging.error(f"Error in build_sketches_against_reference_profile: {str(e)}")
+            raise HotelBookingException(f"Error in build_sketches_against_reference_profile: {str(e)}", sys) from e
+
+
+
+    def build_drift_samples(self, validation_rules: Optional[ValidationRules] = None) -> tuple:
+        """
+        Method Name :   build_drift_samples
+        Description :   This method makes one chunked pass over the ingested data file, assigns every row to the
+                        reference or the current side like build_drift_sketches, and keeps a fixed-size uniform
+                        (bottom-k) sample of each side, stratified on sample_strata_column if set. The sample size
+                        is sample_size, or the DKW size for sample_confidence and sample_tolerance, so the drift
+                        tests cost the same whatever the number of rows. The data quality rules, if given, are
+                        evaluated on the same chunks.
+        
+        Output      :   Returns (empty DataFrame with the columns of the file, columns checked for drift,
+                        reference sample, current sample, number of rows read)
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_validation_config
+            data_file_path = self.data_ingestion_artifact.data_file_path
+            rng = np.random.default_rng(config.split_seed)
+            sample_size = config.sample_size or dkw_sample_size(config.sample_confidence, config.sample_tolerance)
+
+            header = next(read_data_in_chunks(data_file_path, chunk_size=1)).head(0)
+            columns = get_drift_columns(header, header, self._schema_config)
+            reference_sampler, current_sampler = (BottomKSampler(sample_size, seed=config.split_seed + side,
+                                                                 strata_column=config.sample_strata_column)
+                                                  for side in (1, 2))
+            n_rows = 0
+            if validation_rules is not None:
+                validation_rules.check_columns(header.columns)
+
+            for chunk in read_data_in_chunks(data_file_path, config.chunk_size):
+                if validation_rules is not None:
+                    validation_rules.update(chunk, start_row=n_rows)
+
+                is_current = rng.random(len(chunk)) < VALIDATION_REPORT_SPLIT_RATIO
+                reference_sampler.update(chunk[~is_current])
+                current_sampler.update(chunk[is_current])
+                n_rows += len(chunk)
+
+            reference_df = apply_schema_dtypes(reference_sampler.sample(), self._schema_config, stage="reference sample")
+            current_df = apply_schema_dtypes(current_sampler.sample(), self._schema_config, stage="current sample")
+            logging.info(f"Sampled {len(reference_df)} reference and {len(current_df)} current rows out of {n_rows} rows")
+
+            return header, columns, reference_df, current_df, n_rows
+
+        except Exception as e:
+            logging.error(f"Error in build_drift_samples: {str(e)}")
+            raise HotelBookingException(f"Error in build_drift_samples: {str(e)}", sys) from e
+
+
+
+    def detect_dataset_drift_from_samples(self, columns: dict, reference_df: DataFrame, current_df: DataFrame, n_rows: int) -> bool:
+        """
+        Method Name :   detect_dataset_drift_from_samples
+        Description :   This method runs the drift tests on the samples of build_drift_samples and reports, with the
+                        verdict, the interval that holds the distance of the full data of every column at
+                        sample_confidence (KS distance for numerical, total variation for categorical columns)
         
         Output      :   Returns bool value based on validation results
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            data_drift_profile = Profile(sections=[DataDriftProfileSection()])
-            data_drift_profile.calculate(reference_df, current_df)
+            config = self.data_validation_config
+
+            bounds = sample_distance_bounds(reference_df, current_df, columns, config.sample_confidence)
+            sampling = {
+                "n_rows": n_rows,
+                "reference_sample_size": len(reference_df),
+                "current_sample_size": len(current_df),
+                "strata_column": config.sample_strata_column,
+                "confidence": config.sample_confidence,
+                "cdf_tolerance": max(dkw_epsilon(len(reference_df), config.sample_confidence),
+                                     dkw_epsilon(len(current_df), config.sample_confidence)),
+                "columns": bounds,
+            }
+
+            n_distant = sum(column_bounds["lower"] > 0 for column_bounds in bounds.values())
+            logging.info(f"{n_distant}/{len(bounds)} columns differ on the full data at {config.sample_confidence:.0%} "
+                         f"confidence (distance lower bound above 0)")
+
+            return self.detect_dataset_drift(reference_df, current_df, sampling=sampling)
+
+        except Exception as e:
+            logging.error(f"Error in detect_dataset_drift_from_samples: {str(e)}")
+            raise HotelBookingException(f"Error in detect_dataset_drift_from_samples: {str(e)}", sys) from e
 
 
-            report = data_drift_profile.json()
-            json_report = json.loads(report)
 
+    def detect_dataset_drift_from_sketches(self, columns: dict, reference_sketches: dict, current_sketches: dict) -> bool:
+        """
+        Method Name :   detect_dataset_drift_from_sketches
+        Description :   This method validates if drift is detected, from the sketches of a streaming pass
+        
+        Output      :   Returns bool value based on validation results
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_validation_config
 
-            write_yaml(file_path=self.data_validation_config.validation_report_file_path, data=json_report)
+            json_report = detect_dataset_drift_from_sketches(reference_sketches, current_sketches, columns,
+                                                             categorical_stattest=config.categorical_stattest,
+                                                             stattest_threshold=config.stattest_threshold,
+                                                             psi_threshold=config.psi_threshold,
+                                                             drift_share=config.drift_share)
 
+            return self.save_drift_report(json_report, "sketch")
 
-            n_features = json_report["data_drift"]["data"]["metrics"]["n_features"]
-            n_drifted_features = json_report["data_drift"]["data"]["metrics"]["n_drifted_features"]
+        except Exception as e:
+            logging.error(f"Error in detect_dataset_drift_from_sketches: {str(e)}")
+            raise HotelBookingException(f"Error in detect_dataset_drift_from_sketches: {str(e)}", sys) from e
 
 
-            logging.info(f"{n_drifted_features}/{n_features} drift detected.")
-            drift_status = json_report["data_drift"]["data"]["metrics"]["dataset_drift"]
+
+    def save_drift_report(self, json_report: dict, engine: str) -> bool:
+        """
+        Method Name :   save_drift_report
+        Description :   This method writes the compact drift report: a flat per-column table (statistic, p-value,
+                        drifted flag) as JSON Lines or Parquet and the summary metrics as JSON. The full report
+                        is only dumped to YAML when save_full_report is enabled. The summary records the drift
+                        engine that ran ('native', 'native-parallel', 'evidently', 'sketch' or 'sample'), which
+                        is not always the configured drift_backend.
+        
+        Output      :   Returns the dataset drift status
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.data_validation_config
+            rows, summary = flatten_drift_report(json_report)
+            summary["drift_engine"] = engine
+
+
+            if config.drift_table_file_path.endswith(".parquet"):
+                save_data(DataFrame(rows), config.drift_table_file_path)
+            else:
+                write_jsonl(config.drift_table_file_path, rows, replace=True)
+            write_json(config.drift_summary_file_path, summary, replace=True)
+
+            if config.save_full_report:
+                write_yaml(file_path=config.validation_report_file_path, data=json_report, replace=True)
+
+
+            logging.info(f"{summary['n_drifted_features']}/{summary['n_features']} drift detected.")
+            drift_status = summary["dataset_drift"]
 
             return drift_status
 
         except Exception as e:
-            logging.error(f"Error in detect_data_drift: {str(e)}")
-            raise HotelBookingException(f"Error in detect_data_drift: {str(e)}", sys) from e
+            logging.error(f"Error in save_drift_report: {str(e)}")
+            raise HotelBookingException(f"Error in save_drift_report: {str(e)}", sys) from e
+
+
+
+    def get_evidently_drift_report(self, reference_df: DataFrame, current_df: DataFrame) -> dict:
+        """
+        Method Name :   get_evidently_drift_report
+        Description :   This method builds the drift report with an Evidently Profile (optional dependency,
+                        only imported when the 'evidently' drift backend is selected).
+        
+        Output      :   Returns the Evidently report as a dictionary
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            try:
+                from evidently.model_profile import Profile
+                from evidently.model_profile.sections import DataDriftProfileSection
+            except ImportError as e:
+                raise ImportError("The 'evidently' drift backend requires the evidently package, "
+                                  "install it or use the 'native' drift backend") from e
+
+
+            data_drift_profile = Profile(sections=[DataDriftProfileSection()])
+            data_drift_profile.calculate(reference_df, current_df)
+
+
+            report = data_drift_profile.json()
+            return json.loads(report)
+
+        except Exception as e:
+            logging.error(f"Error in get_evidently_drift_report: {str(e)}")
+            raise HotelBookingException(f"Error in get_evidently_drift_report: {str(e)}", sys) from e
 
 
 
@@ -176,36 +570,60 @@ class DataValidation:
             logging.info("Starting data validation process.")
 
 
-            # Reading dataset
-            df = read_data(file_path=self.data_ingestion_artifact.data_file_path)
-            logging.info("Training and testing datasets loaded successfully.")
-
-
-            # Step 1: Validate number of columns in training and testing datasets
-            status = self.validate_number_of_columns(dataframe=df)
-            logging.info(f"All required columns present in dataframe: {status}")
-            if not status:
-                validation_error_msg += "Required columns are missing in dataframe.\n"
+            samples = None
+            validation_rules = ValidationRules(self._validation_rules, self.data_validation_config.rule_samples)
+
+
+            # Reading dataset (or sketching / sampling it in one chunked pass, which also checks the data quality rules)
+            sketches = self.build_sketches_against_reference_profile(validation_rules=validation_rules)
+            if sketches is not None:
+                df, drift_columns, reference_sketches, current_sketches, n_new_rows = sketches
+                logging.info(f"{n_new_rows} rows sketched against the reference profile.")
+            elif self.data_validation_config.sampling_validation:
+                samples = self.build_drift_samples(validation_rules=validation_rules)
+                df, drift_columns = samples[:2]
+                logging.info("Dataset sampled successfully.")
+            elif self.data_validation_config.streaming_validation:
+                df, drift_columns, reference_sketches, current_sketches, _ = self.build_drift_sketches(validation_rules=validation_rules)
+                logging.info("Dataset sketched successfully.")
+            elif self.data_ingestion_artifact.dataframe is not None:
+                df = self.data_ingestion_artifact.dataframe
+                logging.info("Using the dataset handed over in memory by data ingestion.")
+                self.check_data_quality(dataframe=df, validation_rules=validation_rules)
+            else:
+                df = read_data(file_path=self.data_ingestion_artifact.data_file_path, schema_config=self._schema_config)
+                logging.info("Training and testing datasets loaded successfully.")
+                self.check_data_quality(dataframe=df, validation_rules=validation_rules)
 
 
-            # Step 2: Validate column existence in training and testing datasets
-            status = self.is_column_exist(df=df)
-            logging.info(f"Validation of column existence in dataframe: {status}")
-            if not status:
-                validation_error_msg += "Required or sensitive columns validation failed for dataframe.\n"
+            # Step 1: Validate the data quality rules (required columns, dtypes, ranges, categories, missing values)
+            status = self.save_data_quality_report(validation_rules)
+            logging.info(f"Validation of the data quality rules: {status}")
+            if validation_rules.missing_columns:
+                validation_error_msg += f"Required columns are missing in dataframe: {validation_rules.missing_columns}.\n"
+            if validation_rules.violations:
+                validation_error_msg += (f"Data quality rules violated: "
+                                         f"{sorted(f'{column}.{rule}' for column, rule in validation_rules.violations)}.\n")
 
 
             # Consolidate validation status
             validation_status = len(validation_error_msg) == 0
 
 
-            # Step 3: Split dataset into training and testing datasets
-            train_df, test_df = train_test_split_for_data_validation(dataframe=df, test_size=VALIDATION_REPORT_SPLIT_RATIO)
+            # Step 2: Split dataset into training and testing datasets (rows are split while sketching or sampling)
+            in_memory = sketches is None and samples is None and not self.data_validation_config.streaming_validation
+            if in_memory:
+                train_df, test_df = train_test_split_for_data_validation(dataframe=df, test_size=VALIDATION_REPORT_SPLIT_RATIO)
 
 
-            # Step 4: Detect dataset drift if validation passes
+            # Step 3: Detect dataset drift if validation passes
             if validation_status:
-                drift_status = self.detect_dataset_drift(train_df, test_df)
+                if samples is not None:
+                    drift_status = self.detect_dataset_drift_from_samples(*samples[1:])
+                elif not in_memory:
+                    drift_status = self.detect_dataset_drift_from_sketches(drift_columns, reference_sketches, current_sketches)
+                else:
+                    drift_status = self.detect_dataset_drift(train_df, test_df)
 
                 if drift_status:
                     logging.warning("Drift detected between training and testing datasets.")
@@ -222,8 +640,12 @@ class DataValidation:
             data_validation_artifact = DataValidationArtifact(
                 validation_status=validation_status,
                 message=validation_error_msg.strip(),
-                validation_report_file_path=self.data_validation_config.validation_report_file_path,
+                validation_report_file_path=self.data_validation_config.drift_summary_file_path,
             )
+
+            # In-memory handoff of the full dataset, data preprocessing skips reading the file
+            if self.data_validation_config.in_memory_handoff and in_memory:
+                data_validation_artifact.dataframe = df
             logging.info(f"Data validation artifact: {data_validation_artifact}")
 
 
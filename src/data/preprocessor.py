@@ -0,0 +1,248 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from typing import Optional
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+from src.core.logger import logging
+from src.core.exception import HotelBookingException
+from src.core.utils.encoding_utils import (label_encode,
+                                           onehot_encode)
+
+from src.core.constants.common_constant import (HOTEL_MAPPING,
+                                                MONTH_ORDER,
+                                                TARGET_COLUMN)
+
+
+
+class HotelBookingPreprocessor(BaseEstimator, TransformerMixin):
+    """
+    Class Name: HotelBookingPreprocessor
+    Description: Fitted preprocessing of the hotel booking data (preprocessor.pkl). fit (or partial_fit, chunk by
+                 chunk) learns the label mappings (hotel, arrival month, sorted categories otherwise), the one-hot
+                 vocabularies (first category dropped, like pd.get_dummies(drop_first=True)), the min/max of the
+                 scaled columns and the output column layout. transform and transform_record then apply them
+                 without refitting, to a batch or to a single booking.
+    """
+    def __init__(self,
+                 label_encoding_columns: Optional[list] = None,
+                 onehot_encoding_columns: Optional[list] = None,
+                 scaling_columns: Optional[list] = None,
+                 target_column: str = TARGET_COLUMN):
+        """
+        :param label_encoding_columns: columns replaced by an integer code
+        :param onehot_encoding_columns: columns replaced by one indicator column per category (but the first)
+        :param scaling_columns: columns min-max scaled to [0, 1]
+        :param target_column: column passed through, and optional at transform time
+        """
+        self.label_encoding_columns = label_encoding_columns
+        self.onehot_encoding_columns = onehot_encoding_columns
+        self.scaling_columns = scaling_columns
+        self.target_column = target_column
+
+
+    @staticmethod
+    def _fixed_label_mapping(column: str) -> Optional[dict]:
+        # Hotel and month keep their fixed (ordered) codes, other columns get the codes of their sorted categories
+        if 'hotel' in column:
+            return dict(HOTEL_MAPPING)
+        if 'month' in column:
+            return {month: code for code, month in enumerate(MONTH_ORDER, start=1)}
+        return None
+
+
+    @staticmethod
+    def _sorted(categories) -> list:
+        try:
+            return sorted(categories)
+        except TypeError:
+            return list(categories)
+
+
+    def _encode_labels(self, X: pd.DataFrame) -> dict:
+        return {column: label_encode(X[column], mapping) for column, mapping in self.label_mappings_.items()
+                if column in X.columns}
+
+
+    def _reset(self) -> None:
+        self.input_columns_ = None
+        # Values seen in every encoded column, and the declared categories of the 'category' label columns
+        self._categories = {column: {} for column in list(self.label_encoding_columns or []) + list(self.onehot_encoding_columns or [])}
+        self._dtype_categories = {column: {} for column in self.label_encoding_columns or []}
+        self._data_min = {}
+        self._data_max = {}
+
+
+    def fit(self, X: pd.DataFrame, y=None) -> "HotelBookingPreprocessor":
+        """
+        Method Name :   fit
+        Description :   Learns the label mappings, one-hot vocabularies, scaler min/max and output layout from X
+
+        Output      :   Returns the fitted preprocessor
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        self._reset()
+        self.partial_fit(X)
+        logging.info(f"Fitted preprocessor: {len(self.input_columns_)} input columns, "
+                     f"{len(self.feature_names_out_)} output columns")
+        return self
+
+
+    def partial_fit(self, X: pd.DataFrame, y=None) -> "HotelBookingPreprocessor":
+        """
+        Method Name :   partial_fit
+        Description :   Updates the fit statistics with one chunk (categories seen, min/max of the scaled columns),
+                        so the preprocessor can be fitted on a dataset that does not fit in memory. Columns absent
+                        from the chunk keep their statistics. The output layout is taken from the first chunk, and
+                        the result matches fit on the concatenated chunks.
+
+        Output      :   Returns the fitted preprocessor
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            if getattr(self, "input_columns_", None) is None:
+                self._reset()
+                self.input_columns_ = list(X.columns)
+
+            for column, categories in self._categories.items():
+                if column in X.columns:
+                    categories.update(dict.fromkeys(X[column].dropna().unique()))
+                    if column in self._dtype_categories and isinstance(X[column].dtype, pd.CategoricalDtype):
+                        self._dtype_categories[column].update(dict.fromkeys(X[column].cat.categories))
+
+            # Label encoded columns are scaled on their codes, known once every value has been seen
+            for column in self.scaling_columns or []:
+                if column in X.columns and column not in self._categories:
+                    values = pd.to_numeric(X[column]).to_numpy(dtype=float)
+                    if not np.isnan(values).all():
+                        self._data_min[column] = np.fmin(self._data_min.get(column, np.nan), np.nanmin(values))
+                        self._data_max[column] = np.fmax(self._data_max.get(column, np.nan), np.nanmax(values))
+
+            self._set_layout()
+            return self
+
+        except Exception as e:
+            logging.error(f"Error in HotelBookingPreprocessor.partial_fit: {str(e)}")
+            raise HotelBookingException(f"Error in HotelBookingPreprocessor.partial_fit: {str(e)}", sys) from e
+
+
+    def _set_layout(self) -> None:
+        # Derive the mappings, vocabularies, scaling factors and output layout from the fit statistics
+        self.label_mappings_ = {}
+        for column in self.label_encoding_columns or []:
+            mapping = self._fixed_label_mapping(column)
+            self.label_mappings_[column] = mapping if mapping is not None else \
+                {category: code for code, category in
+                 enumerate(self._sorted({**self._dtype_categories[column], **self._categories[column]}))}
+        self.onehot_vocabularies_ = {column: self._sorted(self._categories[column]) for column in self.onehot_encoding_columns or []}
+
+        # Same factors as MinMaxScaler, label encoded columns on the codes of their values seen:
+        # scale = 1 / (max - min) (1 for constant columns), min = -data_min * scale
+        self.scale_, self.min_ = {}, {}
+        for column in self.scaling_columns or []:
+            if column in self.label_mappings_:
+                codes = [code for category, code in self.label_mappings_[column].items() if category in self._categories[column]]
+                data_min, data_max = (float(min(codes)), float(max(codes))) if codes else (np.nan, np.nan)
+            else:
+                data_min, data_max = self._data_min.get(column, np.nan), self._data_max.get(column, np.nan)
+            data_range = data_max - data_min
+            self.scale_[column] = 1.0 / (data_range if data_range >= 10 * np.finfo(float).eps else 1.0)
+            self.min_[column] = 0 - data_min * self.scale_[column]
+
+        self.onehot_feature_names_ = {column: [f"{column}_{category}" for category in vocabulary[1:]]
+                                      for column, vocabulary in self.onehot_vocabularies_.items()}
+        self.feature_names_out_ = ([column for column in self.input_columns_ if column not in self.onehot_vocabularies_]
+                                   + [name for names in self.onehot_feature_names_.values() for name in names])
+
+        # Layout of a single record (features only) and the position of every one-hot category in it
+        self.record_feature_names_ = [name for name in self.feature_names_out_ if name != self.target_column]
+        positions = {name: position for position, name in enumerate(self.record_feature_names_)}
+        self.record_onehot_positions_ = {column: {category: positions[name]
+                                                  for category, name in zip(vocabulary[1:], self.onehot_feature_names_[column])}
+                                         for column, vocabulary in self.onehot_vocabularies_.items()}
+        self.record_value_positions_ = [(column, positions[column]) for column in self.input_columns_
+                                        if column in positions]
+
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Method Name :   transform
+        Description :   Applies the fitted encodings and scaling to a batch. The output has the fitted column layout
+                        (feature_names_out_, without the target column if X has none), categories unseen at fit
+                        time get all-zero indicator columns.
+
+        Output      :   Returns the transformed DataFrame
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            check_is_fitted(self, "feature_names_out_")
+
+            missing_columns = [column for column in self.input_columns_
+                               if column not in X.columns and column != self.target_column]
+            if missing_columns:
+                raise ValueError(f"Columns missing from the data to transform: {missing_columns}")
+
+            encoded = self._encode_labels(X)
+            data = {}
+            for column in self.input_columns_:
+                if column in self.onehot_vocabularies_ or column not in X.columns:
+                    continue
+
+                values = encoded.get(column, X[column])
+                if column in self.scale_:
+                    values = pd.Series(values.to_numpy(dtype=float) * self.scale_[column] + self.min_[column], index=X.index)
+                data[column] = values
+
+            for column, names in self.onehot_feature_names_.items():
+                indicators = onehot_encode(X[column], self.onehot_vocabularies_[column], drop_first=True)
+                data.update(zip(names, indicators.T))
+
+            return pd.DataFrame(data, index=X.index)
+
+        except Exception as e:
+            logging.error(f"Error in HotelBookingPreprocessor.transform: {str(e)}")
+            raise HotelBookingException(f"Error in HotelBookingPreprocessor.transform: {str(e)}", sys) from e
+
+
+    def transform_record(self, record: dict) -> np.ndarray:
+        """
+        Method Name :   transform_record
+        Description :   Transforms a single booking (column -> raw value) without building a DataFrame, for
+                        online predictions. Extra keys (e.g. dropped or target columns) are ignored, unseen
+                        labels and categories are encoded like transform does (NaN code, all-zero indicators).
+
+        Output      :   Returns a (1, n_features) float array in the order of record_feature_names_
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            check_is_fitted(self, "feature_names_out_")
+
+            row = np.zeros((1, len(self.record_feature_names_)))
+            for column, position in self.record_value_positions_:
+                value = record[column]
+                if column in self.label_mappings_:
+                    # Unseen labels become NaN, like label_encode in transform
+                    value = self.label_mappings_[column].get(value, np.nan)
+                value = float(value)
+                if column in self.scale_:
+                    value = value * self.scale_[column] + self.min_[column]
+                row[0, position] = value
+
+            for column, category_positions in self.record_onehot_positions_.items():
+                position = category_positions.get(record[column])
+                if position is not None:
+                    row[0, position] = 1.0
+
+            return row
+
+        except Exception as e:
+            logging.error(f"Error in HotelBookingPreprocessor.transform_record: {str(e)}")
+            raise HotelBookingException(f"Error in HotelBookingPreprocessor.transform_record: {str(e)}", sys) from e
+
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        check_is_fitted(self, "feature_names_out_")
+        return np.asarray(self.feature_names_out_, dtype=object)
@@ -15,10 +15,9 @@ from src.core.entities.artifact_entity import (ModelTrainerArtifact,
                                                DataSplitArtifact,
                                                ModelEvaluationArtifact)
 
-from src.core.utils.data_utils import read_data
 from src.core.utils.json_utils import write_json 
 from src.core.utils.object_utils import load_object
-from src.core.utils.train_test_split_utils import separate_features_and_target 
+from src.core.utils.train_test_split_utils import read_features_and_target
 
 from src.core.constants.common_constant import TARGET_COLUMN
 
@@ -61,15 +60,12 @@ class ModelEvaluation:
         Output: A dictionary containing evaluation metrics.
         """
         try:
-            # Load preprocessed data
-            logging.info("Loading preprocessed data.")
-            df = read_data(self.data_split_artifact.test_data_file_path)
-            logging.info("Successfully loaded preprocessed data.")
-
-            # Separate training data into X and y
-            logging.info("Seperating training data into X and y.")
-            X, y = separate_features_and_target(df, TARGET_COLUMN)
-            logging.info("Successfully separated training data into X and y.")
+            # Load preprocessed data and separate it into X and y
+            logging.info("Loading preprocessed data and seperating it into X and y.")
+            X, y = read_features_and_target(self.data_split_artifact.test_data_file_path, TARGET_COLUMN,
+                                            data=self.data_split_artifact.test_data,
+                                            data_file_path=self.data_split_artifact.data_file_path)
+            logging.info("Successfully loaded preprocessed data and separated it into X and y.")
 
             # Load trained model
             logging.info("Loading the trained model.")
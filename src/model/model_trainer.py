@@ -3,6 +3,7 @@ import sys
 import importlib
 import pandas as pd
 
+from sklearn.base import clone
 from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import (accuracy_score, 
                              f1_score, 
@@ -20,12 +21,14 @@ from src.core.entities.artifact_entity import (DataPreprocessingArtifact,
                                                DataSplitArtifact,
                                                ModelTrainerArtifact)
 
-from src.core.utils.data_utils import read_data 
 from src.core.utils.yaml_utils import read_yaml
 from src.core.utils.object_utils import save_object
 from src.core.utils.json_utils import (read_json, write_json)
 from src.core.utils.train_test_split_utils import (train_test_split_for_tuning,
-                                                   separate_features_and_target)
+                                                   read_features_and_target,
+                                                   read_processed_dataset)
+from src.core.utils.cv_utils import (get_fold_plan,
+                                     create_shared_matrix)
 
 from src.core.constants.common_constant import (TARGET_COLUMN,
                                                 MODEL_PARAMS_FILE_PATH)
@@ -96,17 +99,34 @@ class ModelTrainer:
         logging.info("Starting hyperparameter tuning...")
         try:
 
-            # Use 30% of the dataset for hyperparameter tuning
-            X_tune, y_tune = train_test_split_for_tuning(X_train, y_train, test_size=0.7)
+            # Use 30% of the dataset for hyperparameter tuning (a fixed subset, so the fold plan is reused across runs)
+            X_tune, y_tune = train_test_split_for_tuning(X_train, y_train,
+                                                         test_size=0.7,
+                                                         random_state=self.model_trainer_config.tuning_random_state)
             logging.info(f"Tuning dataset size: {X_tune.shape}, {y_tune.shape}")
 
 
             # Load model parameters
             models = self.model_config['model_selection']
-            grid_search_params = self.model_config['grid_search']['params']
+            grid_search_params = dict(self.model_config['grid_search']['params'])
             logging.info("Model parameters and hyperparameter grids loaded successfully")
 
 
+            # Stratified folds computed once for every search (and read back on a later run with the same tuning data)
+            n_splits = grid_search_params.pop('cv', None) or 5
+            fold_plan, reused = get_fold_plan(X_tune, y_tune, n_splits, self.model_trainer_config.fold_plan_file_path)
+            logging.info(f"{'Loaded' if reused else 'Computed'} the {n_splits}-fold plan of the tuning data "
+                         f"({self.model_trainer_config.fold_plan_file_path})")
+
+
+            # One read-only memory map of the tuning matrix, shared by the workers of every search
+            X_search = X_tune
+            if self.model_trainer_config.shared_tuning_data and isinstance(X_tune, pd.DataFrame):
+                X_search = create_shared_matrix(X_tune, self.model_trainer_config.tuning_data_file_path)
+                grid_search_params['refit'] = False
+                logging.info(f"Tuning matrix shared read-only from {self.model_trainer_config.tuning_data_file_path}")
+
+
             # Dictionary to store best models after tuning
             best_models = {}
             best_params_dict = {}
@@ -124,16 +144,23 @@ class ModelTrainer:
                 search = GridSearchCV(
                     model,
                     params,
+                    cv=fold_plan,
                     **grid_search_params
                 )
                 logging.info(f"GridSearchCV initialized for {model_name} with parameters: {params}")
 
                 # Fit the model using the subset of data
-                search.fit(X_tune, y_tune)
+                search.fit(X_search, y_tune)
                 logging.info(f"Hyperparameter tuning completed for {model_name}")
 
+                # Refit of the best parameters on the tuning DataFrame (not the shared matrix), so the model keeps its feature names
+                if X_search is X_tune:
+                    best_estimator = search.best_estimator_
+                else:
+                    best_estimator = clone(model).set_params(**search.best_params_).fit(X_tune, y_tune)
+
                 # Save the best model
-                best_models[model_name] = search.best_estimator_
+                best_models[model_name] = best_estimator
                 best_params_dict[model_name] = search.best_params_
 
                 # Print best parameters and best score
@@ -154,24 +181,29 @@ class ModelTrainer:
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         logging.info("Starting model training process...")
         try:
-            # Load training data
-            train_df = read_data(self.data_split_artifact.train_data_file_path)
+            # The index split mode takes the train and test rows from one read of the processed dataset
+            dataset = None
+            if self.data_split_artifact.train_data is None and self.data_split_artifact.train_data_file_path.endswith(".npy"):
+                dataset = read_processed_dataset(self.data_split_artifact.data_file_path)
+                logging.info(f"Loaded processed dataset from: {self.data_split_artifact.data_file_path}")
+
+            # Load training data and separate it into X and y
+            X_train, y_train = read_features_and_target(self.data_split_artifact.train_data_file_path, TARGET_COLUMN,
+                                                        data=self.data_split_artifact.train_data,
+                                                        data_file_path=self.data_split_artifact.data_file_path,
+                                                        dataset=dataset)
             logging.info(f"Loaded preprocessed training data from: {self.data_split_artifact.train_data_file_path}")
-            logging.info(f"Training Data shape: {train_df.shape}")
-
-            # Separate training data into X and y
-            X_train, y_train = separate_features_and_target(train_df, TARGET_COLUMN)
             logging.info("Seperate Training data into X and y completed successfully")
             logging.info(f"X_train set size: {X_train.shape}, y_train set size: {y_train.shape}")
 
 
-            # Load test data
-            test_df = read_data(self.data_split_artifact.test_data_file_path)
+            # Load test data and separate it into X and y
+            X_test, y_test = read_features_and_target(self.data_split_artifact.test_data_file_path, TARGET_COLUMN,
+                                                      data=self.data_split_artifact.test_data,
+                                                      data_file_path=self.data_split_artifact.data_file_path,
+                                                      dataset=dataset)
+            del dataset
             logging.info(f"Loaded preprocessed Test data from: {self.data_split_artifact.test_data_file_path}")
-            logging.info(f"Test Data shape: {test_df.shape}")
-
-            # Separate test data into X and y
-            X_test, y_test = separate_features_and_target(test_df, TARGET_COLUMN)
             logging.info("Seperate Validaton data into X and y completed successfully")
             logging.info(f"X_test set size: {X_test.shape}, y_test set size: {y_test.shape}")
 
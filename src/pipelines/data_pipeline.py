@@ -19,6 +19,8 @@ from src.data.data_validation import DataValidation
 from src.data.data_preprocessing import DataPreprocessing
 from src.data.data_split import DataSplit
 
+from src.core.utils.thread_utils import BackgroundWriter
+
 
 
 # Constructing a DataPipeline
@@ -28,16 +30,22 @@ class DataPipeline:
     Description: this class is used to create a pipeline for data scripts (src/data/<scripts>).
     """
 
-    def __init__(self):
+    def __init__(self, full_refresh: bool = False, in_memory_handoff: bool = False):
+        """
+        :param full_refresh: If True, ignore the persisted high-water mark and re-ingest the whole table.
+        :param in_memory_handoff: If True, the stages hand their DataFrames to the next stage in memory and the
+                                  preprocessing and split outputs are written in the background (see wait_for_pending_writes).
+        """
 
         logging.info("* "*50)
         logging.info("- - - - - Started DataPipeline - - - - -")
         logging.info("* "*50)
         
-        self.data_ingestion_config = DataIngestionConfig()
-        self.data_validation_config = DataValidationConfig()
-        self.data_preprocessing_config = DataPreprocessingConfig()
-        self.data_split_config = DataSplitConfig()
+        self.data_ingestion_config = DataIngestionConfig(full_refresh=full_refresh, in_memory_handoff=in_memory_handoff)
+        self.data_validation_config = DataValidationConfig(in_memory_handoff=in_memory_handoff)
+        self.data_preprocessing_config = DataPreprocessingConfig(in_memory_handoff=in_memory_handoff)
+        self.data_split_config = DataSplitConfig(in_memory_handoff=in_memory_handoff)
+        self.background_writer = BackgroundWriter() if in_memory_handoff else None
 
 
     def start_data_ingestion(self) -> DataIngestionArtifact:
@@ -105,7 +113,8 @@ class DataPipeline:
 
             data_preprocessing = DataPreprocessing(data_ingestion_artifact,
                                                    data_validation_artifact,
-                                                   self.data_preprocessing_config)
+                                                   self.data_preprocessing_config,
+                                                   background_writer=self.background_writer)
             data_preprocessing_artifact = data_preprocessing.initiate_data_preprocessing()
             logging.info("- "*50)
             logging.info("- - - Data Preprocessed Successfully! - - -")
@@ -132,7 +141,8 @@ class DataPipeline:
             logging.info("! ! ! Entered start_data_split method of DataPipeline Class:")
             
             data_split = DataSplit(data_preprocessing_artifact,
-                                   self.data_split_config)
+                                   self.data_split_config,
+                                   background_writer=self.background_writer)
             data_split_artifact = data_split.initiate_data_split()
             logging.info("- "*50)
             logging.info("- - - Data Splitted Successfully! - - -")
@@ -145,4 +155,51 @@ class DataPipeline:
         
         except Exception as e:
             logging.error(f"Error in start_data_split: {str(e)}")
-            raise HotelBookingException(f"Error in start_data_split: {str(e)}",sys) from e
\ No newline at end of file
+            raise HotelBookingException(f"Error in start_data_split: {str(e)}",sys) from e
+        
+
+    def start_reference_profile_refresh(self, 
+                                        data_ingestion_artifact: DataIngestionArtifact) -> str:
+        """
+        This method of DataPipeline class is responsible for refreshing the reference profile of data validation,
+        it is called once a model trained on the ingested data has been accepted
+        """
+        try:
+            logging.info("_"*100)
+            logging.info("")
+            logging.info("! ! ! Entered start_reference_profile_refresh method of DataPipeline Class:")
+            
+            data_validation = DataValidation(data_ingestion_artifact,
+                                             self.data_validation_config)
+            reference_profile_file_path = data_validation.refresh_reference_profile()
+            logging.info("- "*50)
+            logging.info("- - - Reference Profile Refreshed Successfully! - - -")
+
+            logging.info("")
+            logging.info("! ! ! Exited the start_reference_profile_refresh method of DataPipeline class:")
+            logging.info("_"*100)
+
+            return reference_profile_file_path
+        
+        except Exception as e:
+            logging.error(f"Error in start_reference_profile_refresh: {str(e)}")
+            raise HotelBookingException(f"Error in start_reference_profile_refresh: {str(e)}",sys) from e
+
+
+    def wait_for_pending_writes(self) -> int:
+        """
+        This method of DataPipeline class waits for the artifact files written in the background in the
+        in-memory handoff mode, and raises if one of the writes failed
+        """
+        try:
+            if self.background_writer is None:
+                return 0
+
+            n_writes = self.background_writer.wait()
+            logging.info(f"Waited for {n_writes} background artifact writes")
+
+            return n_writes
+
+        except Exception as e:
+            logging.error(f"Error in wait_for_pending_writes: {str(e)}")
+            raise HotelBookingException(f"Error in wait_for_pending_writes: {str(e)}",sys) from e
@@ -8,12 +8,16 @@ from src.pipelines.model_pipeline import ModelPipeline
 
 
 
-def run_pipe() -> None:
+def run_pipe(full_refresh: bool = False, in_memory_handoff: bool = False) -> None:
     """
     This method of run_pipe.py script is responsible for running the entire pipeline
+
+    :param full_refresh: If True, data ingestion reloads the whole table instead of only new rows.
+    :param in_memory_handoff: If True, the data stages pass their DataFrames along in memory and write their files in the background.
     """
+    data_pipeline = None
     try:
-        data_pipeline = DataPipeline()
+        data_pipeline = DataPipeline(full_refresh=full_refresh, in_memory_handoff=in_memory_handoff)
         model_pipeline = ModelPipeline()
         logging.info("_"*100)
         logging.info("")
@@ -32,6 +36,13 @@ def run_pipe() -> None:
         model_evaluation_artifact = model_pipeline.start_model_evaluation(data_split_artifact=data_split_artifact,
                                                                           model_trainer_artifact=model_trainer_artifact)
         model_validation_artifact = model_pipeline.start_model_validation(model_evaluation_artifact=model_evaluation_artifact)
+
+        # the data of an accepted model becomes the reference of the next drift checks
+        if model_validation_artifact.validation_status:
+            data_pipeline.start_reference_profile_refresh(data_ingestion_artifact=data_ingestion_artifact)
+
+        # the artifact files written in the background must all be on disk before the run ends
+        data_pipeline.wait_for_pending_writes()
         
         logging.info("")
         logging.info("$ Exited run_pipe method of run_pipe.py script:")
@@ -39,4 +50,9 @@ def run_pipe() -> None:
     
     except Exception as e:
         logging.error(f"Error in run_pipe method: {str(e)}")
-        raise HotelBookingException(f"Error in run_pipe method: {str(e)}",sys) from e
\ No newline at end of file
+        raise HotelBookingException(f"Error in run_pipe method: {str(e)}",sys) from e
+
+    finally:
+        # never leave the background writer thread running, even when a stage failed
+        if data_pipeline is not None and data_pipeline.background_writer is not None:
+            data_pipeline.background_writer.close()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from src.core.utils.cv_utils import (create_shared_matrix,
+                                     get_fold_plan)
+
+
+def make_tuning_data(n_rows: int = 300) -> tuple:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"lead_time": rng.random(n_rows), "adults": rng.integers(0, 4, n_rows).astype(float)})
+    y = pd.Series(rng.integers(0, 2, n_rows), name="is_canceled")
+    return X, y
+
+
+def test_fold_plan_is_reused_for_the_same_data_only(tmp_path):
+    X, y = make_tuning_data()
+    file_path = str(tmp_path / "fold_plan.npz")
+
+    plan, loaded = get_fold_plan(X, y, 5, file_path)
+    assert not loaded
+    expected = StratifiedKFold(n_splits=5).split(np.zeros(len(y)), y)
+    assert all(np.array_equal(train, expected_train) and np.array_equal(test, expected_test)
+               for (train, test), (expected_train, expected_test) in zip(plan, expected))
+
+    reused_plan, loaded = get_fold_plan(X, y, 5, file_path)
+    assert loaded
+    assert all(np.array_equal(train, reused_train) and np.array_equal(test, reused_test)
+               for (train, test), (reused_train, reused_test) in zip(plan, reused_plan))
+
+    # Changed values, reordered rows or another number of folds: the plan is rebuilt
+    changed_X = X.copy()
+    changed_X.iloc[0, 0] += 1
+    for data, n_splits in (((changed_X, y), 5), ((X.iloc[::-1], y.iloc[::-1]), 5), ((X, y), 3)):
+        plan, loaded = get_fold_plan(*data, n_splits, file_path)
+        assert not loaded and len(plan) == n_splits
+
+
+def test_shared_matrix_is_a_read_only_copy_of_the_features(tmp_path):
+    X, _ = make_tuning_data()
+
+    matrix = create_shared_matrix(X, str(tmp_path / "tuning_data.npy"))
+
+    assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert matrix.dtype == np.float32
+    assert np.array_equal(matrix, X.to_numpy(dtype=np.float32))
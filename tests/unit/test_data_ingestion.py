@@ -0,0 +1,43 @@
+import pandas as pd
+
+from src.core.utils.data_utils import save_data
+from src.core.entities.config_entity import DataIngestionConfig
+from src.data.data_ingestion import DataIngestion
+
+from benchmarks.sqlite_standin import make_hotel_booking_frame
+
+
+def make_ingestion(tmp_path, data_format: str) -> DataIngestion:
+    config = DataIngestionConfig(data_file_path=str(tmp_path / f"data.{data_format}"), chunk_size=100)
+    return DataIngestion(config)
+
+
+def test_ingested_boundary_rows_are_dropped_once(tmp_path):
+    for data_format in ("csv", "parquet"):
+        data_ingestion = make_ingestion(tmp_path, data_format)
+
+        source = make_hotel_booking_frame(500)
+        watermark = source["reservation_status_date"].max()
+        boundary = source[source["reservation_status_date"] == watermark]
+
+        # The data file holds the previous export without the sensitive columns
+        save_data(data_ingestion.drop_sensitive_columns(source), data_ingestion.data_ingestion_config.data_file_path)
+
+        # Fetched again: the boundary rows, one identical copy of them and a new booking on the same date
+        new_row = make_hotel_booking_frame(1, seed=7).assign(reservation_status_date=watermark)
+        fetched = pd.concat([boundary, boundary.head(1), new_row], ignore_index=True)
+
+        ingested = data_ingestion.get_ingested_boundary_rows(watermark)
+        assert sum(ingested.values()) == len(boundary)
+
+        kept = data_ingestion.drop_ingested_rows(fetched, watermark, ingested)
+        assert len(kept) == 2
+        assert kept["name"].tolist() == [boundary["name"].iloc[0], new_row["name"].iloc[0]]
+
+
+def test_full_load_keeps_all_rows(tmp_path):
+    data_ingestion = make_ingestion(tmp_path, "csv")
+    fetched = make_hotel_booking_frame(50)
+
+    ingested = data_ingestion.get_ingested_boundary_rows(None)
+    assert len(data_ingestion.drop_ingested_rows(fetched, None, ingested)) == len(fetched)
@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.core.exception import HotelBookingException
+from src.core.utils.data_utils import (DataWriter,
+                                       append_data,
+                                       read_data,
+                                       save_data)
+
+
+DATA_FORMATS = ["parquet", "feather"]
+
+
+def existing_file(tmp_path, data_format: str) -> tuple:
+    dataframe = pd.DataFrame({"adults": [1, 2, 3],
+                              "hotel": pd.Categorical(["City Hotel", "City Hotel", "City Hotel"])})
+    file_path = str(tmp_path / f"data.{data_format}")
+    save_data(dataframe, file_path)
+    return dataframe, file_path
+
+
+@pytest.mark.parametrize("data_format", DATA_FORMATS)
+def test_append_widens_an_int_column_that_became_float(tmp_path, data_format):
+    dataframe, file_path = existing_file(tmp_path, data_format)
+
+    append_data(pd.DataFrame({"adults": [2.5], "hotel": pd.Categorical(["City Hotel"])}), file_path)
+
+    data = read_data(file_path)
+    assert data["adults"].dtype == "float64"
+    assert data["adults"].tolist() == [1.0, 2.0, 3.0, 2.5]
+    assert not os.path.exists(f"{file_path}.previous")
+
+
+@pytest.mark.parametrize("data_format", DATA_FORMATS)
+def test_append_keeps_a_new_category(tmp_path, data_format):
+    dataframe, file_path = existing_file(tmp_path, data_format)
+
+    append_data(pd.DataFrame({"adults": [4], "hotel": pd.Categorical(["Resort Hotel"])}), file_path)
+
+    data = read_data(file_path)
+    assert data["hotel"].astype(str).tolist() == ["City Hotel"] * 3 + ["Resort Hotel"]
+    assert data["adults"].tolist() == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("data_format", DATA_FORMATS)
+def test_failed_append_keeps_the_existing_rows(tmp_path, data_format):
+    dataframe, file_path = existing_file(tmp_path, data_format)
+
+    # The chunk cannot be written, close() puts the existing file back
+    with pytest.raises(HotelBookingException):
+        append_data(pd.DataFrame({"adults": ["two"], "hotel": pd.Categorical(["City Hotel"])}), file_path)
+
+    # The caller fails before the first chunk
+    with pytest.raises(RuntimeError):
+        with DataWriter(file_path, append=True):
+            raise RuntimeError("interrupted")
+
+    data = read_data(file_path)
+    assert data["adults"].tolist() == dataframe["adults"].tolist()
+    assert data["hotel"].astype(str).tolist() == dataframe["hotel"].astype(str).tolist()
+    assert not os.path.exists(f"{file_path}.previous")
+
+    # A chunk fails after the existing rows were streamed into the new file, they are still there
+    with pytest.raises(HotelBookingException):
+        with DataWriter(file_path, append=True) as writer:
+            writer.write(pd.DataFrame({"adults": [4], "hotel": pd.Categorical(["City Hotel"])}))
+            writer.write(pd.DataFrame({"adults": [5]}))
+
+    assert read_data(file_path)["adults"].tolist() == [1, 2, 3, 4]
+    assert not os.path.exists(f"{file_path}.previous")
@@ -0,0 +1,106 @@
+import logging
+
+from src.core.utils.data_utils import (append_data,
+                                       save_data)
+from src.core.utils.yaml_utils import read_yaml
+from src.core.utils.json_utils import read_json
+from src.core.utils.dtype_utils import apply_schema_dtypes
+from src.core.utils.train_test_split_utils import train_test_split_for_data_validation
+from src.core.entities.config_entity import DataValidationConfig
+from src.core.entities.artifact_entity import DataIngestionArtifact
+from src.core.constants.common_constant import SCHEMA_FILE_PATH
+from src.data.data_validation import DataValidation
+
+from benchmarks.sqlite_standin import make_hotel_booking_frame
+
+
+schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+
+
+def ingested_frame(n_rows: int, seed: int):
+    return make_hotel_booking_frame(n_rows, seed=seed).drop(columns=schema_config["sensitive_columns"])
+
+
+def rows_compared_with_profile(config: DataValidationConfig, data_file_path: str) -> int:
+    data_validation = DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config)
+    return data_validation.build_sketches_against_reference_profile()[4]
+
+
+def test_reference_profile_compares_appended_rows_only(tmp_path):
+    for data_format in ("csv", "parquet"):
+        data_file_path = str(tmp_path / f"data.{data_format}")
+        config = DataValidationConfig(reference_profile_file_path=str(tmp_path / f"profile_{data_format}.json"), chunk_size=700)
+
+        save_data(ingested_frame(5000, seed=0), data_file_path)
+        DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config).refresh_reference_profile()
+        assert rows_compared_with_profile(config, data_file_path) == 0
+
+        append_data(ingested_frame(1000, seed=5), data_file_path)
+        assert rows_compared_with_profile(config, data_file_path) == 1000
+
+
+def test_reference_profile_compares_all_rows_after_full_refresh(tmp_path):
+    data_file_path = str(tmp_path / "data.parquet")
+    config = DataValidationConfig(reference_profile_file_path=str(tmp_path / "profile.json"), chunk_size=700)
+
+    save_data(ingested_frame(5000, seed=0), data_file_path)
+    DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config).refresh_reference_profile()
+
+    # A full refresh rewrites the file: longer or shorter than the profile, every row is compared
+    for n_rows in (6000, 3000):
+        save_data(ingested_frame(n_rows, seed=7), data_file_path)
+        assert rows_compared_with_profile(config, data_file_path) == n_rows
+
+
+def test_sampling_mode_does_not_use_reference_profile(tmp_path):
+    data_file_path = str(tmp_path / "data.parquet")
+    config = DataValidationConfig(reference_profile_file_path=str(tmp_path / "profile.json"))
+
+    save_data(ingested_frame(1000, seed=0), data_file_path)
+    DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config).refresh_reference_profile()
+
+    config.sampling_validation = True
+    data_validation = DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config)
+    assert data_validation.build_sketches_against_reference_profile() is None
+
+
+def test_reference_profile_warns_that_drift_backend_and_n_jobs_are_not_used(tmp_path, caplog):
+    data_file_path = str(tmp_path / "data.parquet")
+    config = DataValidationConfig(reference_profile_file_path=str(tmp_path / "profile.json"))
+
+    save_data(ingested_frame(1000, seed=0), data_file_path)
+    DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config).refresh_reference_profile()
+
+    with caplog.at_level(logging.WARNING):
+        assert rows_compared_with_profile(config, data_file_path) == 0
+    assert not caplog.records
+
+    for drift_backend, n_jobs in (("evidently", 1), ("native", 2)):
+        config.drift_backend, config.n_jobs = drift_backend, n_jobs
+        caplog.clear()
+        with caplog.at_level(logging.WARNING):
+            assert rows_compared_with_profile(config, data_file_path) == 0
+        assert "use_reference_profile" in caplog.text
+
+
+def test_drift_summary_records_the_engine_that_ran(tmp_path):
+    data_file_path = str(tmp_path / "data.parquet")
+    config = DataValidationConfig(reference_profile_file_path=str(tmp_path / "profile.json"),
+                                  drift_table_file_path=str(tmp_path / "drift_report.jsonl"),
+                                  drift_summary_file_path=str(tmp_path / "drift_summary.json"))
+    dataframe = ingested_frame(2000, seed=0)
+    save_data(dataframe, data_file_path)
+    data_validation = DataValidation(DataIngestionArtifact(data_file_path=data_file_path), config)
+
+    reference_df, current_df = train_test_split_for_data_validation(
+        dataframe=apply_schema_dtypes(dataframe, schema_config, stage="test"), test_size=0.5)
+    for n_jobs, engine in ((1, "native"), (2, "native-parallel")):
+        config.n_jobs = n_jobs
+        data_validation.detect_dataset_drift(reference_df, current_df)
+        assert read_json(config.drift_summary_file_path)["drift_engine"] == engine
+
+    # With a reference profile the sketches are tested, whatever n_jobs is
+    data_validation.refresh_reference_profile()
+    _, columns, reference_sketches, current_sketches, _ = data_validation.build_sketches_against_reference_profile()
+    data_validation.detect_dataset_drift_from_sketches(columns, reference_sketches, current_sketches)
+    assert read_json(config.drift_summary_file_path)["drift_engine"] == "sketch"
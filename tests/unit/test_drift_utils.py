@@ -0,0 +1,128 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.core.exception import HotelBookingException
+from src.core.utils.yaml_utils import read_yaml
+from src.core.utils.dtype_utils import apply_schema_dtypes
+from src.core.utils.drift_utils import (category_counts,
+                                        chi_square_test,
+                                        detect_column_drift,
+                                        detect_dataset_drift,
+                                        detect_dataset_drift_parallel,
+                                        ks_test,
+                                        population_stability_index)
+from src.core.constants.common_constant import SCHEMA_FILE_PATH
+
+from benchmarks.sqlite_standin import make_hotel_booking_frame
+
+
+schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+
+
+def drift_samples(n_rows: int = 2000) -> tuple:
+    dataframe = make_hotel_booking_frame(n_rows).drop(columns=schema_config["sensitive_columns"])
+    dataframe = apply_schema_dtypes(dataframe, schema_config, stage="test")
+    return dataframe.iloc[:n_rows // 2], dataframe.iloc[n_rows // 2:]
+
+
+def record_shared_memory_blocks(monkeypatch) -> list:
+    # Names of the blocks the parent creates, the worker processes (forked) record in their own copy
+    names = []
+
+    class RecordingSharedMemory(shared_memory.SharedMemory):
+        def __init__(self, *args, create=False, **kwargs):
+            super().__init__(*args, create=create, **kwargs)
+            if create:
+                names.append(self.name)
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", RecordingSharedMemory)
+    return names
+
+
+def assert_unlinked(names: list) -> None:
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_ks_test_matches_scipy_without_missing_values():
+    rng = np.random.default_rng(0)
+    reference, current = rng.normal(0, 1, 500), rng.normal(0.2, 1, 400)
+    current[::10] = np.nan
+
+    expected = stats.ks_2samp(reference, current[~np.isnan(current)])
+    assert ks_test(reference, current) == (float(expected.statistic), float(expected.pvalue))
+
+
+def test_chi_square_test_counts_a_category_of_one_sample_only():
+    reference = pd.Series(["a"] * 50 + ["b"] * 50)
+    current = pd.Series(["a"] * 40 + ["b"] * 40 + ["c"] * 20)
+
+    reference_counts, current_counts = category_counts(reference, current)
+    assert reference_counts.tolist() == [50, 50, 0]
+    assert current_counts.tolist() == [40, 40, 20]
+
+    statistic, p_value = chi_square_test(reference_counts, current_counts)
+    expected_statistic, expected_p_value, _, _ = stats.chi2_contingency([[50, 50, 0], [40, 40, 20]], correction=False)
+    assert np.isclose(statistic, expected_statistic) and np.isclose(p_value, expected_p_value)
+    assert detect_column_drift(reference, current, "categorical")["drift_detected"]
+
+    # A category seen in neither sample does not change the test
+    assert chi_square_test(np.append(reference_counts, 0), np.append(current_counts, 0)) == (statistic, p_value)
+
+
+def test_psi_of_identical_tables_is_zero():
+    counts = np.array([120, 30, 0, 50])
+
+    assert population_stability_index(counts, counts) == 0.0
+    assert np.isclose(population_stability_index(counts, counts * 3), 0.0)
+    assert population_stability_index(counts, counts[::-1]) > 0
+
+
+def test_empty_and_all_missing_samples_report_no_drift():
+    empty, missing = np.array([]), np.full(10, np.nan)
+    values = np.arange(10, dtype=float)
+
+    for reference, current in ((empty, values), (values, empty), (missing, values), (missing, missing)):
+        assert ks_test(reference, current) == (0.0, 1.0)
+
+    assert chi_square_test(np.array([]), np.array([])) == (0.0, 1.0)
+    assert chi_square_test(np.array([0, 0]), np.array([5, 5])) == (0.0, 1.0)
+    assert population_stability_index(np.array([0, 0]), np.array([0, 0])) == 0.0
+
+    for column_type, reference in (("numerical", pd.Series(missing)), ("categorical", pd.Series([None] * 10, dtype=object))):
+        for stattest in ("chi2", "psi"):
+            result = detect_column_drift(reference, reference.iloc[:0], column_type, categorical_stattest=stattest)
+            assert not result["drift_detected"]
+
+
+@pytest.mark.parametrize("categorical_stattest", ["chi2", "psi"])
+def test_parallel_drift_matches_serial_drift_and_unlinks_shared_memory(monkeypatch, categorical_stattest):
+    reference_df, current_df = drift_samples()
+    names = record_shared_memory_blocks(monkeypatch)
+
+    parallel = detect_dataset_drift_parallel(reference_df, current_df, schema_config, n_jobs=2,
+                                             categorical_stattest=categorical_stattest)
+    serial = detect_dataset_drift(reference_df, current_df, schema_config, categorical_stattest=categorical_stattest)
+
+    assert parallel == serial
+    assert len(names) == 4
+    monkeypatch.undo()
+    assert_unlinked(names)
+
+
+def test_parallel_drift_unlinks_shared_memory_on_worker_error(monkeypatch):
+    reference_df, current_df = drift_samples(200)
+    names = record_shared_memory_blocks(monkeypatch)
+
+    # The threshold is only compared in the workers, every numerical column test fails there
+    with pytest.raises(HotelBookingException, match="detect_dataset_drift_parallel"):
+        detect_dataset_drift_parallel(reference_df, current_df, schema_config, n_jobs=2, stattest_threshold=None)
+
+    assert len(names) == 4
+    monkeypatch.undo()
+    assert_unlinked(names)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from src.core.entities.config_entity import ModelTrainerConfig
+from src.model.model_trainer import ModelTrainer
+
+
+def make_trainer(tmp_path, shared_tuning_data: bool) -> ModelTrainer:
+    config = ModelTrainerConfig()
+    config.fold_plan_file_path = str(tmp_path / "fold_plan.npz")
+    config.tuning_data_file_path = str(tmp_path / "tuning_data.npy")
+    config.shared_tuning_data = shared_tuning_data
+
+    model_trainer = ModelTrainer(None, None, config)
+    model_trainer.model_config = {
+        "grid_search": {"params": {"cv": 3, "scoring": "accuracy", "n_jobs": 1}},
+        "model_selection": {"dtc": {"module": "sklearn.tree", "class": "DecisionTreeClassifier",
+                                    "params": {"random_state": 0},
+                                    "search_param_grid": {"max_depth": [3, 6, None], "min_samples_split": [2, 20]}}},
+    }
+    return model_trainer
+
+
+def test_refit_on_the_shared_matrix_matches_grid_search_refit(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"lead_time": rng.random(1000), "adults": rng.integers(0, 4, 1000).astype(float),
+                      "adr": rng.normal(100, 30, 1000)})
+    y = pd.Series((X["lead_time"] + rng.random(1000) * 0.5 > 0.8).astype(int), name="is_canceled")
+
+    # Search on the read-only matrix with refit=False, then clone(...).fit on the tuning DataFrame
+    shared_models, shared_params = make_trainer(tmp_path, shared_tuning_data=True).tune_hyperparameters(X, y)
+    # GridSearchCV(refit=True) on the DataFrame
+    models, params = make_trainer(tmp_path, shared_tuning_data=False).tune_hyperparameters(X, y)
+
+    assert shared_params == params
+    shared_model, model = shared_models["dtc"], models["dtc"]
+    assert shared_model.get_params() == model.get_params()
+    assert list(shared_model.feature_names_in_) == list(X.columns)
+    assert np.array_equal(shared_model.tree_.feature, model.tree_.feature)
+    assert np.array_equal(shared_model.tree_.threshold, model.tree_.threshold)
+    assert np.array_equal(shared_model.predict_proba(X), model.predict_proba(X))
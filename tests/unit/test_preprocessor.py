@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.data.preprocessor import HotelBookingPreprocessor
+from src.core.utils.yaml_utils import read_yaml
+from src.core.constants.common_constant import (SCHEMA_FILE_PATH,
+                                                TARGET_COLUMN)
+
+from benchmarks.sqlite_standin import make_hotel_booking_frame
+
+
+schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+
+
+def fitted_preprocessor(n_rows: int = 2000):
+    transformation = schema_config["transformation"]
+    dataframe = make_hotel_booking_frame(n_rows)
+    dataframe = dataframe.drop(columns=schema_config["sensitive_columns"] + schema_config["drop_columns"], errors="ignore").fillna(0)
+    X = dataframe.drop(columns=[TARGET_COLUMN])
+
+    preprocessor = HotelBookingPreprocessor(label_encoding_columns=transformation["label_encoding"],
+                                            onehot_encoding_columns=transformation["onehot_encoding"],
+                                            scaling_columns=transformation["scaling"]).fit(X)
+    return preprocessor, X
+
+
+def test_transform_record_encodes_unseen_labels_like_transform():
+    preprocessor, X = fitted_preprocessor()
+    X = X.head(1).copy()
+    for column in schema_config["transformation"]["label_encoding"] + schema_config["transformation"]["onehot_encoding"]:
+        X[column] = X[column].astype(object)
+        X.iloc[0, X.columns.get_loc(column)] = "unseen"
+
+    expected = preprocessor.transform(X)[preprocessor.record_feature_names_].to_numpy(dtype=float)
+    row = preprocessor.transform_record(X.iloc[0].to_dict())
+
+    assert np.isnan(row).any()
+    assert np.array_equal(row, expected, equal_nan=True)
@@ -0,0 +1,43 @@
+from src.core.utils.yaml_utils import read_yaml
+from src.core.utils.rules_utils import (compile_validation_rules,
+                                        ValidationRules)
+from src.core.entities.config_entity import DataIngestionConfig
+from src.core.constants.common_constant import SCHEMA_FILE_PATH
+from src.data.data_ingestion import DataIngestion
+
+from benchmarks.sqlite_standin import make_hotel_booking_frame
+
+
+schema_config = read_yaml(file_path=SCHEMA_FILE_PATH)
+
+
+def exported_frame(incremental: bool):
+    # The columns the ingestion SELECT list holds, on rows shaped like the source table
+    columns = DataIngestion(DataIngestionConfig(incremental=incremental)).get_columns_to_export()
+    return make_hotel_booking_frame(1000)[columns]
+
+
+def test_drop_columns_are_not_required():
+    rules = compile_validation_rules(schema_config)
+
+    for column in schema_config["drop_columns"]:
+        assert not rules[column]["required"]
+    assert all(rules[column]["required"] for column in rules if column not in schema_config["drop_columns"])
+
+
+def test_rules_pass_on_exported_frame():
+    for incremental in (False, True):
+        dataframe = exported_frame(incremental)
+
+        validation_rules = ValidationRules(compile_validation_rules(schema_config))
+        assert validation_rules.check_columns(dataframe.columns) == []
+        validation_rules.update(dataframe)
+
+        assert validation_rules.status, validation_rules.report()
+
+
+def test_missing_exported_column_is_reported():
+    dataframe = exported_frame(incremental=False).drop(columns=["hotel"])
+
+    validation_rules = ValidationRules(compile_validation_rules(schema_config))
+    assert validation_rules.check_columns(dataframe.columns) == ["hotel"]
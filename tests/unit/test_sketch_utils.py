@@ -0,0 +1,51 @@
+import numpy as np
+from scipy import stats
+
+from src.core.utils.sketch_utils import (NumericSketch,
+                                         ks_test_from_sketches)
+
+
+def sketch_of(chunks, max_bins=1024):
+    sketch = NumericSketch(max_bins)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch
+
+
+def test_constant_chunks_stay_on_a_bounded_grid():
+    # e.g. arrival_date_year, one year per chunk
+    sketch = sketch_of([np.full(100, year) for year in (2015, 2016, 2017)])
+
+    assert len(sketch.counts) <= sketch.max_bins
+    assert sketch.count == 300
+    assert sorted(sketch.counts[sketch.counts > 0].tolist()) == [100, 100, 100]
+    assert sketch.summary()["min"] == 2015 and sketch.summary()["max"] == 2017
+
+
+def test_near_constant_and_zero_chunks():
+    rng = np.random.default_rng(0)
+    near_constant = sketch_of([2015 + rng.normal(0, 1e-9, 100), rng.normal(2016, 1, 100)])
+    assert len(near_constant.counts) <= near_constant.max_bins
+    assert near_constant.count == 200
+
+    # A constant zero chunk, then values spread over [0, 1)
+    zero_first = sketch_of([np.zeros(100), rng.random(1000)])
+    assert len(zero_first.counts) <= zero_first.max_bins
+    assert zero_first.count == 1100
+
+
+def test_ks_test_on_constant_chunks_matches_scipy():
+    reference_values = [np.full(100, year) for year in (2015, 2016, 2017)]
+    current_values = [np.full(50, 2016), np.full(150, 2017)]
+
+    statistic, p_value = ks_test_from_sketches(sketch_of(reference_values), sketch_of(current_values))
+    expected = stats.ks_2samp(np.concatenate(reference_values), np.concatenate(current_values))
+
+    assert np.isclose(statistic, expected.statistic)
+    assert 0.0 <= p_value <= 1.0
+
+
+def test_ks_test_on_distant_ranges_is_bounded():
+    # Two narrow ranges far apart: the common grid is coarsened to 2 * max_bins bins
+    statistic, _ = ks_test_from_sketches(sketch_of([np.linspace(0, 1, 100)]), sketch_of([np.linspace(1e9, 1e9 + 1, 100)]))
+    assert statistic == 1.0
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from src.core.utils.data_utils import save_data
+from src.core.utils.train_test_split_utils import (read_features_and_target,
+                                                   read_processed_dataset)
+
+
+def make_processed_frame(n_rows: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"lead_time": rng.random(n_rows), "adults": rng.integers(0, 4, n_rows).astype(float),
+                         "is_canceled": rng.integers(0, 2, n_rows)})
+
+
+def test_index_files_take_rows_from_one_read_of_the_dataset(tmp_path):
+    dataframe = make_processed_frame()
+    data_file_path = str(tmp_path / "processed.parquet")
+    save_data(dataframe, data_file_path)
+
+    dataset = read_processed_dataset(data_file_path)
+    for subset, rows in (("train", np.arange(0, 100, 2)), ("test", np.arange(1, 100, 2))):
+        index_file_path = str(tmp_path / f"random_{subset}_index.npy")
+        np.save(index_file_path, rows)
+
+        X, y = read_features_and_target(index_file_path, "is_canceled", data_file_path=data_file_path)
+        # The dataset already read is used, the data file is not read again
+        X_read_once, y_read_once = read_features_and_target(index_file_path, "is_canceled",
+                                                            data_file_path=str(tmp_path / "missing.parquet"),
+                                                            dataset=dataset)
+
+        assert X.equals(X_read_once)
+        assert np.array_equal(y.to_numpy(), y_read_once.to_numpy())
+        assert np.array_equal(y.to_numpy(), dataframe["is_canceled"].to_numpy()[rows])